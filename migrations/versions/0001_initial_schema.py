@@ -0,0 +1,155 @@
+"""initial schema
+
+The schema as ``init_db`` used to create it, plus the SQLite search index. A database
+created by ``init_db`` before migrations existed is brought under Alembic with
+``alembic stamp 0001`` followed by ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 13:14:46.935629
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The SQLite search index as of this revision; its rowid is ``id * 4 + kind``
+_SEARCH_ROW_INSERT = (
+    "INSERT INTO search_index (rowid, kind, item_id, course_id, lesson_type, title, body) "
+)
+_COURSE_ROW = "SELECT new.id * 4 + 1, 'course', new.id, new.id, NULL, new.title, new.description"
+_MODULE_ROW = (
+    "SELECT new.id * 4 + 2, 'module', new.id, new.course_id, NULL, new.title, new.description"
+)
+_LESSON_ROW = (
+    "SELECT new.id * 4 + 3, 'lesson', new.id, "
+    "(SELECT course_id FROM modules WHERE modules.id = new.module_id), "
+    "new.type, new.title, new.content"
+)
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, item_id UNINDEXED, course_id UNINDEXED, lesson_type UNINDEXED, "
+    "title, body, tokenize = 'porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS courses_search_insert AFTER INSERT ON courses "
+    f"BEGIN {_SEARCH_ROW_INSERT}{_COURSE_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS courses_search_update AFTER UPDATE OF title, description "
+    "ON courses BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 1; "
+    f"{_SEARCH_ROW_INSERT}{_COURSE_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS courses_search_delete AFTER DELETE ON courses "
+    "BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS modules_search_insert AFTER INSERT ON modules "
+    f"BEGIN {_SEARCH_ROW_INSERT}{_MODULE_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS modules_search_update "
+    "AFTER UPDATE OF title, description, course_id "
+    "ON modules BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 2; "
+    f"{_SEARCH_ROW_INSERT}{_MODULE_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS modules_search_delete AFTER DELETE ON modules "
+    "BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 2; END",
+    "CREATE TRIGGER IF NOT EXISTS lessons_search_insert AFTER INSERT ON lessons "
+    f"BEGIN {_SEARCH_ROW_INSERT}{_LESSON_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS lessons_search_update "
+    "AFTER UPDATE OF title, content, type, module_id "
+    "ON lessons BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 3; "
+    f"{_SEARCH_ROW_INSERT}{_LESSON_ROW}; END",
+    "CREATE TRIGGER IF NOT EXISTS lessons_search_delete AFTER DELETE ON lessons "
+    "BEGIN DELETE FROM search_index WHERE rowid = old.id * 4 + 3; END",
+    "CREATE TRIGGER IF NOT EXISTS modules_search_move AFTER UPDATE OF course_id ON modules "
+    "BEGIN UPDATE search_index SET course_id = new.course_id "
+    "WHERE rowid IN (SELECT id * 4 + 3 FROM lessons WHERE module_id = new.id); END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "courses",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_courses_title"), "courses", ["title"], unique=False)
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("username", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("full_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "role", sa.Enum("ADMIN", "INSTRUCTOR", "STUDENT", name="userrole"), nullable=False
+        ),
+        sa.Column("hashed_password", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "modules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("course_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["course_id"],
+            ["courses.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_modules_title"), "modules", ["title"], unique=False)
+    op.create_table(
+        "lessons",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "type",
+            sa.Enum("VIDEO", "TEXT", "QUIZ", "ASSIGNMENT", name="lessontype"),
+            nullable=False,
+        ),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("module_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["module_id"],
+            ["modules.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_lessons_title"), "lessons", ["title"], unique=False)
+    # ### end Alembic commands ###
+    # The tables are new, so the index starts out empty and needs no backfill
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SEARCH_INDEX_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS search_index")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f("ix_lessons_title"), table_name="lessons")
+    op.drop_table("lessons")
+    op.drop_index(op.f("ix_modules_title"), table_name="modules")
+    op.drop_table("modules")
+    op.drop_table("users")
+    op.drop_index(op.f("ix_courses_title"), table_name="courses")
+    op.drop_table("courses")
+    # ### end Alembic commands ###
@@ -1,20 +1,89 @@
-"""Entry point for the application."""
+"""Entry point for the application.
+
+Both modes serve the installed ``vibe_courseware`` package. By default a single
+auto-reloading development server is started, on a schema made by ``init_db``.
+``--mode production`` (or ``SERVER_MODE=production``) serves it from prefork workers
+instead, see ``vibe_courseware.server``, and never creates tables: the schema is
+managed by Alembic, and ``--migrate`` upgrades it before the workers start.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from vibe_courseware.config import get_settings
+
+ROOT = Path(__file__).parent
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line, with defaults from the settings."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode", choices=("development", "production"), default=settings.SERVER_MODE
+    )
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers", type=int, default=settings.SERVER_WORKERS, help="0 starts one per CPU"
+    )
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=settings.SERVER_KEEP_ALIVE,
+        help="seconds an idle connection stays open",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.SERVER_GRACEFUL_TIMEOUT,
+        help="seconds in-flight requests get on shutdown",
+    )
+    parser.add_argument(
+        "--migrate",
+        action=argparse.BooleanOptionalAction,
+        default=settings.SERVER_MIGRATE,
+        help="run alembic upgrade head first (production)",
+    )
+    return parser.parse_args()
+
+
+def migrate() -> None:
+    """Upgrade the database to the latest migration."""
+    # A separate process, as the migrations import the models by their source path
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, check=True)
 
-import uvicorn
-from src.vibe_courseware.db.session import init_db
 
 def main() -> None:
     """Run the application."""
-    # Initialize the database
-    init_db()
-    
-    # Run the application
-    uvicorn.run(
-        "src.vibe_courseware.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+    args = parse_args()
+    if args.mode == "development":
+        import uvicorn
+
+        from vibe_courseware.db.session import init_db
+
+        init_db()
+        uvicorn.run("vibe_courseware.main:app", host=args.host, port=args.port, reload=True)
+        return
+
+    if args.migrate:
+        migrate()
+    from vibe_courseware.server import serve
+
+    sys.exit(
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            backlog=args.backlog,
+            keep_alive=args.keep_alive,
+            graceful_timeout=args.graceful_timeout,
+        )
     )
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,162 @@
+"""Compare the sync and async database paths under concurrent load.
+
+Seeds a temporary SQLite catalog, then drives the catalog read endpoints through
+the ASGI app once with DATABASE_ASYNC=false and once with DATABASE_ASYNC=true. Each
+path runs in its own process because settings are read at import time. The response
+cache is disabled so every request reaches the database.
+
+    python scripts/benchmark_db_paths.py --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def seed(database_url: str, *, courses: int, modules: int, lessons: int) -> None:
+    """Create a catalog of ``courses`` x ``modules`` x ``lessons``."""
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from src.vibe_courseware.models.course import Course
+    from src.vibe_courseware.models.lesson import Lesson
+    from src.vibe_courseware.models.module import Module
+
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for c in range(courses):
+            course = Course(title=f"Course {c}", description="Benchmark course")
+            session.add(course)
+            session.flush()
+            for m in range(modules):
+                module = Module(
+                    title=f"Module {c}.{m}", description="", order=m, course_id=course.id
+                )
+                session.add(module)
+                session.flush()
+                session.add_all(
+                    Lesson(
+                        title=f"Lesson {c}.{m}.{n}",
+                        content="x" * 2000,
+                        order=n,
+                        module_id=module.id,
+                    )
+                    for n in range(lessons)
+                )
+        session.commit()
+
+
+async def drive(*, requests: int, concurrency: int, courses: int, modules: int) -> dict:
+    """Send ``requests`` catalog reads with ``concurrency`` in flight."""
+    import httpx
+
+    from src.vibe_courseware.config import get_settings
+    from src.vibe_courseware.db.session import dispose_async_engine
+    from src.vibe_courseware.main import app
+
+    prefix = get_settings().API_V1_STR
+    paths = []
+    for i in range(requests):
+        course_id = i % courses + 1
+        module_id = i % (courses * modules) + 1
+        paths.append(
+            [
+                f"{prefix}/courses/?limit=50",
+                f"{prefix}/courses/{course_id}",
+                f"{prefix}/modules/?course_id={course_id}",
+                f"{prefix}/lessons/?module_id={module_id}&limit=50",
+                f"{prefix}/courses/{course_id}/outline?include_content=false",
+            ][i % 5]
+        )
+
+    latencies = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            while not queue.empty():
+                path = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    await dispose_async_engine()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--lessons", type=int, default=20)
+    parser.add_argument("--mode", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        result = asyncio.run(
+            drive(
+                requests=args.requests,
+                concurrency=args.concurrency,
+                courses=args.courses,
+                modules=args.modules,
+            )
+        )
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{Path(directory) / 'benchmark.db'}"
+        seed(database_url, courses=args.courses, modules=args.modules, lessons=args.lessons)
+
+        results = {}
+        for mode in ("sync", "async"):
+            env = {
+                **os.environ,
+                "DATABASE_URL": database_url,
+                "DATABASE_ASYNC": str(mode == "async").lower(),
+                "RESPONSE_CACHE_ENABLED": "false",
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, *sys.argv[1:]],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Load test the ASGI app with a concurrent mixed workload.
+
+Requests are drawn from weighted workloads and sent through the real app (all
+middleware, dependencies and the configured database) with ``--concurrency`` in
+flight:
+
+- ``browse``: course, module and lesson listings and course details
+- ``outline``: course outlines without lesson bodies
+- ``search``: full-text search for a catalog word
+- ``login``: password logins of generated users
+- ``write``: lesson creates and title updates
+
+Latency percentiles and throughput are reported per route as JSON, along with the
+dataset, the settings and the git revision, so two runs can be diffed. Point it at a
+catalog made by ``scripts/generate_catalog.py``, or leave out ``--database-url`` to
+benchmark a small catalog generated in a temporary directory. Writes change the
+catalog, so reuse a generated database only for runs that are compared with each
+other.
+
+    python scripts/generate_catalog.py --database-url sqlite:///./load.db
+    python scripts/benchmark_load.py --database-url sqlite:///./load.db \\
+        --requests 5000 --concurrency 64 --mix browse=60,outline=20,login=5,write=15 \\
+        --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Route label, method, URL and httpx keyword arguments of one request
+Request = Tuple[str, str, str, Dict[str, Any]]
+
+DEFAULT_MIX = "browse=60,outline=15,search=5,login=5,write=15"
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    """Get the nearest-rank ``p`` percentile of sorted ``latencies`` in milliseconds."""
+    return round(latencies[max(math.ceil(len(latencies) * p / 100) - 1, 0)] * 1000, 2)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Summarize the latencies of one route, or of all requests."""
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse ``name=weight,...`` into workload weights."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in WORKLOADS:
+            raise ValueError(f"Unknown workload: {name.strip()}")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+class Catalog:
+    """Id ranges of the catalog under test and a search vocabulary."""
+
+    def __init__(self, database_url: str, prefix: str):
+        """Read the catalog size from ``database_url``."""
+        from sqlmodel import Session, create_engine, func, select
+
+        from src.vibe_courseware.models.course import Course
+        from src.vibe_courseware.models.lesson import Lesson
+        from src.vibe_courseware.models.module import Module
+        from src.vibe_courseware.models.user import User
+
+        engine = create_engine(database_url)
+        with Session(engine) as session:
+            self.sizes = {
+                model.__tablename__: session.exec(select(func.max(model.id))).one() or 0
+                for model in (Course, Module, Lesson, User)
+            }
+            titles = session.exec(select(Course.title).limit(200)).all()
+        engine.dispose()
+        # Generated course titles are three catalog words and a number
+        self.words = sorted({word.lower() for title in titles for word in title.split()[:-1]})
+        self.prefix = prefix
+
+    def pick(self, rng: random.Random, table: str) -> int:
+        """Pick a random id of ``table``."""
+        return rng.randint(1, self.sizes[table])
+
+
+def browse(rng: random.Random, catalog: Catalog, password: str) -> Request:
+    """Read one listing or detail page."""
+    p = catalog.prefix
+    course_id = catalog.pick(rng, "courses")
+    return rng.choice(
+        [
+            (f"GET {p}/courses/", "GET", f"{p}/courses/?limit=50", {}),
+            (f"GET {p}/courses/{{course_id}}", "GET", f"{p}/courses/{course_id}", {}),
+            (f"GET {p}/modules/", "GET", f"{p}/modules/?course_id={course_id}", {}),
+            (
+                f"GET {p}/lessons/",
+                "GET",
+                f"{p}/lessons/?module_id={catalog.pick(rng, 'modules')}&limit=50"
+                "&fields=id,title,type,order,module_id",
+                {},
+            ),
+        ]
+    )
+
+
+def outline(rng: random.Random, catalog: Catalog, password: str) -> Request:
+    """Read a course outline."""
+    p = catalog.prefix
+    course_id = catalog.pick(rng, "courses")
+    url = f"{p}/courses/{course_id}/outline?include_content=false"
+    return (f"GET {p}/courses/{{course_id}}/outline", "GET", url, {})
+
+
+def search(rng: random.Random, catalog: Catalog, password: str) -> Request:
+    """Search the catalog for one of its words."""
+    p = catalog.prefix
+    q = rng.choice(catalog.words) if catalog.words else "course"
+    return (f"GET {p}/search/", "GET", f"{p}/search/?q={q}&limit=20", {})
+
+
+def login(rng: random.Random, catalog: Catalog, password: str) -> Request:
+    """Log in as a generated user."""
+    p = catalog.prefix
+    form = {
+        "username": f"user{rng.randrange(catalog.sizes['users'])}@example.com",
+        "password": password,
+    }
+    return (f"POST {p}/auth/login", "POST", f"{p}/auth/login", {"data": form})
+
+
+def write(rng: random.Random, catalog: Catalog, password: str) -> Request:
+    """Create a lesson or retitle one."""
+    p = catalog.prefix
+    if rng.random() < 0.5:
+        lesson = {
+            "title": f"Benchmark lesson {rng.randrange(10**9)}",
+            "content": "x" * rng.randint(200, 4000),
+            "order": rng.randint(0, 50),
+            "module_id": catalog.pick(rng, "modules"),
+        }
+        return (f"POST {p}/lessons/", "POST", f"{p}/lessons/", {"json": lesson})
+    lesson_id = catalog.pick(rng, "lessons")
+    update = {"json": {"title": f"Retitled lesson {rng.randrange(10**9)}"}}
+    return (f"PUT {p}/lessons/{{lesson_id}}", "PUT", f"{p}/lessons/{lesson_id}", update)
+
+
+WORKLOADS: Dict[str, Callable[[random.Random, Catalog, str], Request]] = {
+    "browse": browse,
+    "outline": outline,
+    "search": search,
+    "login": login,
+    "write": write,
+}
+
+
+def plan(
+    catalog: Catalog, *, requests: int, mix: Dict[str, int], seed: int, password: str
+) -> List[Request]:
+    """Draw ``requests`` requests from the weighted workloads."""
+    rng = random.Random(seed)
+    names = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    return [WORKLOADS[name](rng, catalog, password) for name in names]
+
+
+async def drive(requests: List[Request], *, concurrency: int) -> Dict[str, Any]:
+    """Send ``requests`` through the app with ``concurrency`` in flight."""
+    import httpx
+
+    from src.vibe_courseware.db.session import dispose_async_engine
+    from src.vibe_courseware.main import app
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            while not queue.empty():
+                route, method, url, kwargs = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                latencies[route].append(time.perf_counter() - started)
+                statuses[route][response.status_code] += 1
+                if response.status_code >= 400:
+                    errors[route] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    await dispose_async_engine()
+
+    every = [latency for route_latencies in latencies.values() for latency in route_latencies]
+    routes = {}
+    for route in sorted(latencies):
+        routes[route] = summarize(latencies[route], errors[route], elapsed)
+        routes[route]["statuses"] = {str(code): n for code, n in sorted(statuses[route].items())}
+    return {
+        "seconds": round(elapsed, 3),
+        "total": summarize(every, sum(errors.values()), elapsed),
+        "routes": routes,
+    }
+
+
+def revision() -> Optional[str]:
+    """Get the git revision of the working tree, marked ``-dirty`` if it has changes."""
+    try:
+        output = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).parent,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.strip()
+
+
+def run(args: argparse.Namespace, mix: Dict[str, int]) -> Dict[str, Any]:
+    """Benchmark the app against the configured database."""
+    from src.vibe_courseware.config import get_settings
+
+    settings = get_settings()
+    catalog = Catalog(settings.DATABASE_URL, settings.API_V1_STR)
+    if args.warmup:
+        warmup = plan(
+            catalog, requests=args.warmup, mix=mix, seed=args.seed + 1, password=args.password
+        )
+        asyncio.run(drive(warmup, concurrency=args.concurrency))
+    requests = plan(
+        catalog, requests=args.requests, mix=mix, seed=args.seed, password=args.password
+    )
+    result = asyncio.run(drive(requests, concurrency=args.concurrency))
+    return {
+        "revision": revision(),
+        "config": {
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "seed": args.seed,
+            "database": settings.DATABASE_URL.split(":", 1)[0],
+            "database_async": settings.DATABASE_ASYNC,
+            "response_cache": settings.RESPONSE_CACHE_ENABLED,
+        },
+        "dataset": catalog.sizes,
+        **result,
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="catalog made by generate_catalog.py")
+    parser.add_argument("--password", default="benchmark", help="password of generated users")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weights of " + ", ".join(WORKLOADS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--no-cache", dest="cache", action="store_false")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+    # Settings are read once, so configure the app before anything imports it
+    os.environ["DATABASE_ASYNC"] = str(args.use_async).lower()
+    os.environ["RESPONSE_CACHE_ENABLED"] = str(args.cache).lower()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        report = run(args, mix)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            database_url = f"sqlite:///{Path(directory) / 'benchmark.db'}"
+            os.environ["DATABASE_URL"] = database_url
+            from sqlmodel import create_engine
+
+            from scripts.generate_catalog import generate
+
+            engine = create_engine(database_url)
+            generate(
+                engine, courses=50, modules=500, lessons=10000, users=1000, password=args.password
+            )
+            engine.dispose()
+            report = run(args, mix)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Compare list serialization before and after the row encoding fast path.
+
+Builds a page of lessons in an in-memory SQLite database and times three ways of
+turning it into a JSON body:
+
+- ``response_model``: ORM objects validated against ``List[LessonRead]`` and
+  rendered by ``JSONResponse``, which is how list endpoints used to respond
+- ``validated_rows``: column rows validated into ``LessonRead`` and dumped by pydantic
+- ``row_adapter``: column rows dumped by the precompiled row adapter, as list
+  endpoints now do
+
+Query time is included in every case, so the numbers are per request page.
+
+    python scripts/benchmark_serialization.py --limit 100 --content-size 2000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Coroutine, List
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def finish(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine that never suspends, without the cost of an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Coroutine suspended")
+
+
+def measure(function: Callable[[], bytes], *, repeat: int) -> dict:
+    """Time ``function`` and report the median and best run in microseconds."""
+    function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "best_us": round(min(timings) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from pydantic import TypeAdapter
+    from sqlmodel import Session, SQLModel, create_engine
+    from sqlmodel.pool import StaticPool
+
+    from src.vibe_courseware.models.course import Course
+    from src.vibe_courseware.models.lesson import Lesson, LessonRead
+    from src.vibe_courseware.models.module import Module
+    from src.vibe_courseware.services.lesson_service import LessonService
+    from src.vibe_courseware.utils.serialization import encode_rows
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        course = Course(title="Course", description="")
+        session.add(course)
+        session.flush()
+        module = Module(title="Module", description="", course_id=course.id)
+        session.add(module)
+        session.flush()
+        session.add_all(
+            Lesson(
+                title=f"Lesson {n}",
+                content="x" * args.content_size,
+                order=n,
+                module_id=module.id,
+            )
+            for n in range(args.limit)
+        )
+        session.commit()
+        module_id = module.id
+
+    service = LessonService()
+    statement = service.select_by_module_id(module_id=module_id).limit(args.limit)
+    field = create_model_field(name="Response", type_=List[LessonRead], mode="serialization")
+    validated = TypeAdapter(List[LessonRead])
+
+    def response_model() -> bytes:
+        with Session(engine) as session:
+            lessons = session.exec(statement).all()
+            content = finish(serialize_response(field=field, response_content=lessons))
+            return JSONResponse(content).body
+
+    def validated_rows() -> bytes:
+        with Session(engine) as session:
+            rows = service.get_fields(session, statement)
+            return validated.dump_json(validated.validate_python([row._asdict() for row in rows]))
+
+    def row_adapter() -> bytes:
+        with Session(engine) as session:
+            return encode_rows(service.get_fields(session, statement), read_model=LessonRead)
+
+    assert json.loads(response_model()) == json.loads(row_adapter())
+    results = {
+        name: measure(function, repeat=args.repeat)
+        for name, function in (
+            ("response_model", response_model),
+            ("validated_rows", validated_rows),
+            ("row_adapter", row_adapter),
+        )
+    }
+    baseline = results["response_model"]["median_us"]
+    for result in results.values():
+        result["speedup"] = round(baseline / result["median_us"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
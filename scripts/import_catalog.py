@@ -0,0 +1,49 @@
+"""Import course trees from NDJSON or JSON files.
+
+Each document is a course with nested ``modules`` and their ``lessons``; rows are
+matched by title within their parent, so importing the same file twice is safe:
+
+    python scripts/import_catalog.py catalog.ndjson --batch-rows 5000
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+
+from src.vibe_courseware.config import get_settings
+from src.vibe_courseware.db.session import engine, init_db
+from src.vibe_courseware.services.catalog_importer import (
+    CatalogImporter,
+    CatalogImportError,
+    iter_courses,
+    iter_documents,
+)
+
+
+def main() -> None:
+    """Import the catalog files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--batch-rows", type=int, default=get_settings().IMPORT_BATCH_ROWS)
+    args = parser.parse_args()
+
+    init_db()
+    importer = CatalogImporter(batch_rows=args.batch_rows)
+    with Session(engine) as session:
+        for path in args.paths:
+            with path.open("rb") as stream:
+                try:
+                    report = importer.run(session, iter_courses(iter_documents(stream)))
+                except CatalogImportError as exc:
+                    sys.exit(f"{path}: {exc}")
+            print(json.dumps({"path": str(path), **report.model_dump()}))
+
+
+if __name__ == "__main__":
+    main()
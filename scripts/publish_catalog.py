@@ -0,0 +1,40 @@
+"""Publish static catalog snapshots.
+
+Renders every active course to JSON and gzip files, e.g. at deploy time or after
+authoring outside the API:
+
+    python scripts/publish_catalog.py --directory ./catalog
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+
+from src.vibe_courseware.config import get_settings
+from src.vibe_courseware.db.session import engine
+from src.vibe_courseware.services.catalog_publisher import CatalogPublisher
+
+
+def main() -> None:
+    """Publish the catalog."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--directory", default=get_settings().CATALOG_SNAPSHOT_DIR)
+    args = parser.parse_args()
+    if not args.directory:
+        parser.error("--directory is required when CATALOG_SNAPSHOT_DIR is not set")
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        published = CatalogPublisher(args.directory, engine).publish_all(session)
+    elapsed = time.perf_counter() - started
+    print(f"Published {published} courses to {args.directory} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,18 @@
 from fastapi import APIRouter
 
 from ..config import get_settings
-from .endpoints import auth, courses, lessons, modules, users
+from .endpoints import (
+    auth,
+    catalog,
+    courses,
+    imports,
+    lessons,
+    modules,
+    profiles,
+    search,
+    stats,
+    users,
+)
 
 settings = get_settings()
 
@@ -12,6 +23,17 @@ api_router = APIRouter(prefix=settings.API_V1_STR)
 # Include routers from endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+if settings.DATABASE_ASYNC:
+    # Routes match in registration order, so these shadow the sync catalog reads
+    api_router.include_router(courses.async_router, prefix="/courses", tags=["courses"])
+    api_router.include_router(modules.async_router, prefix="/modules", tags=["modules"])
+    api_router.include_router(lessons.async_router, prefix="/lessons", tags=["lessons"])
+    api_router.include_router(search.async_router, prefix="/search", tags=["search"])
 api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
 api_router.include_router(modules.router, prefix="/modules", tags=["modules"])
-api_router.include_router(lessons.router, prefix="/lessons", tags=["lessons"])
\ No newline at end of file
+api_router.include_router(lessons.router, prefix="/lessons", tags=["lessons"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(imports.router, prefix="/import", tags=["import"])
+api_router.include_router(catalog.router, prefix="/catalog", tags=["catalog"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
\ No newline at end of file
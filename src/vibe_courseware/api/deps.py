@@ -1,17 +1,19 @@
 """API dependencies."""
 
-from typing import Generator, Optional
+from typing import Any, Dict
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import ValidationError
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session
 
 from ..config import get_settings
-from ..db.session import get_session
+from ..db.session import engine, get_session
 from ..models.user import TokenPayload, User, UserRole
 from ..services.user_service import UserService
+from ..utils.principal_cache import principal_cache
 from ..utils.security import ALGORITHM
 
 settings = get_settings()
@@ -24,7 +26,16 @@ user_service = UserService()
 def get_current_user(
     db: Session = Depends(get_session), token: str = Depends(oauth2_scheme)
 ) -> User:
-    """Get current user."""
+    """Get current user.
+
+    Repeated tokens are served from ``principal_cache`` without decoding the JWT or
+    querying the user.
+    """
+    values = principal_cache.get(token)
+    if values is not None:
+        return _attach_user(db, values)
+
+    generation = principal_cache.generation
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         token_data = TokenPayload(**payload)
@@ -36,9 +47,19 @@ def get_current_user(
     user = user_service.get(db, id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.set(
+        token, user.model_dump(), expires=payload.get("exp"), generation=generation
+    )
     return user
 
 
+def _attach_user(db: Session, values: Dict[str, Any]) -> User:
+    """Bind cached user values to the request session without a query."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user."""
     if not user_service.is_active(current_user):
@@ -61,4 +82,13 @@ def get_current_instructor_user(current_user: User = Depends(get_current_active_
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def is_admin_token(token: str) -> bool:
+    """Whether ``token`` belongs to an active admin, for checks outside a route."""
+    with Session(engine) as db:
+        try:
+            user = get_current_user(db, token)
+        except HTTPException:
+            return False
+        return user_service.is_active(user) and user_service.is_admin(user)
@@ -19,11 +19,14 @@ user_service = UserService()
 
 
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_session), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
-    """OAuth2 compatible token login, get an access token for future requests."""
-    user = user_service.authenticate(
+    """OAuth2 compatible token login, get an access token for future requests.
+
+    Async, so a login waiting for bcrypt holds no request thread.
+    """
+    user = await user_service.aauthenticate(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
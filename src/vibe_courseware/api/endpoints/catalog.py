@@ -0,0 +1,77 @@
+"""Catalog snapshot API endpoints."""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from ...services.catalog_publisher import CatalogPublisher, catalog_publisher, gzip_path
+
+router = APIRouter()
+
+
+def get_catalog_publisher() -> Optional[CatalogPublisher]:
+    """Get the configured catalog publisher, if snapshots are enabled."""
+    return catalog_publisher
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows gzip, honouring its q-values."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def snapshot_response(request: Request, path: Path) -> FileResponse:
+    """Serve a snapshot file, preferring its gzip twin when the client accepts it.
+
+    ``FileResponse`` hands the file to the server through the ASGI pathsend
+    extension where available, so the body is sent without passing through Python.
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        compressed = gzip_path(path)
+        if compressed.is_file():
+            headers["Content-Encoding"] = "gzip"
+            return FileResponse(compressed, media_type="application/json", headers=headers)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return FileResponse(path, media_type="application/json", headers=headers)
+
+
+@router.get("/courses")
+async def read_catalog_courses(
+    *,
+    request: Request,
+    publisher: Optional[CatalogPublisher] = Depends(get_catalog_publisher),
+) -> Any:
+    """Get the published active courses."""
+    if publisher is None:
+        raise HTTPException(status_code=404, detail="Catalog snapshots are disabled")
+    return snapshot_response(request, publisher.index_path())
+
+
+@router.get("/courses/{course_id}")
+async def read_catalog_course(
+    *,
+    request: Request,
+    course_id: int,
+    publisher: Optional[CatalogPublisher] = Depends(get_catalog_publisher),
+) -> Any:
+    """Get the published outline of an active course."""
+    if publisher is None:
+        raise HTTPException(status_code=404, detail="Catalog snapshots are disabled")
+    return snapshot_response(request, publisher.course_path(course_id))
@@ -1,34 +1,89 @@
 """Courses API endpoints."""
 
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ...db.session import get_session
-from ...models.course import Course, CourseCreate, CourseRead, CourseUpdate
+from ...db.session import get_async_session, get_session
+from ...models.course import (
+    Course,
+    CourseCreate,
+    CourseRead,
+    CourseReadWithModules,
+    CourseUpdate,
+)
+from ...models.module import ModuleRead
 from ...models.user import User
+from ...services.base_service import ReorderError
 from ...services.course_service import CourseService
+from ...services.module_service import ModuleService
+from ...utils.cache import tag_response
+from ...utils.fields import parse_fields
+from ...utils.pagination import (
+    TOTAL_COUNT_HEADER,
+    acount_rows,
+    apply_keyset,
+    count_rows,
+    decode_cursor,
+    set_next_cursor,
+    set_total_count,
+)
+from ...utils.serialization import rows_response
+from ...utils.streaming import StreamFormat, astream_rows, stream_rows
 from ..deps import get_current_active_user, get_current_instructor_user
 
 router = APIRouter()
+# Async variants of the read endpoints, mounted in place of the sync ones by DATABASE_ASYNC
+async_router = APIRouter()
 course_service = CourseService()
+module_service = ModuleService()
 
 
 @router.get("/", response_model=List[CourseRead])
 def read_courses(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = Query(False),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
 ) -> Any:
-    """Get courses."""
+    """Get courses.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one,
+    and ``stream`` to receive the rows as NDJSON or a JSON array while they are read.
+    ``fields`` limits the items to a comma separated list of fields, e.g.
+    ``fields=id,title``, and only those columns are read.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, CourseRead)
     if active_only:
-        courses = course_service.get_active_courses(db=db, skip=skip, limit=limit)
+        statement = course_service.select_active_courses()
     else:
-        courses = course_service.get_multi(db=db, skip=skip, limit=limit)
-    return courses
+        statement = course_service.select_multi()
+    total = count_rows(db, statement, cached=True)
+    page = apply_keyset(statement, (Course.id,), after).offset(skip).limit(limit)
+    if stream:
+        return stream_rows(
+            db,
+            page,
+            model=Course,
+            read_model=CourseRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    courses = course_service.get_fields(db, page, fields=names + ("id",) if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, courses, ("id",), limit=limit)
+    tag_response(response, "courses")
+    return rows_response(courses, read_model=CourseRead, fields=names, response=response)
 
 
 @router.post("/", response_model=CourseRead)
@@ -38,13 +93,7 @@ def create_course(
     course_in: CourseCreate,
     current_user: User = Depends(get_current_instructor_user),
 ) -> Any:
-    """Create course."""
-    course = course_service.get_by_title(db=db, title=course_in.title)
-    if course:
-        raise HTTPException(
-            status_code=400,
-            detail="Course with this title already exists.",
-        )
+    """Create course; a taken title is rejected by the database."""
     return course_service.create(db=db, obj_in=course_in)
 
 
@@ -52,15 +101,39 @@ def create_course(
 def read_course(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     course_id: int,
 ) -> Any:
     """Get course by ID."""
     course = course_service.get(db=db, id=course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
+    tag_response(response, f"course:{course_id}")
     return course
 
 
+@router.get(
+    "/{course_id}/outline",
+    response_model=CourseReadWithModules,
+    response_model_exclude_none=True,
+)
+def read_course_outline(
+    *,
+    db: Session = Depends(get_session),
+    response: Response,
+    course_id: int,
+    include_content: bool = Query(True),
+) -> Any:
+    """Get course with its ordered modules and lessons."""
+    outline = course_service.get_outline(
+        db=db, course_id=course_id, include_content=include_content
+    )
+    if not outline:
+        raise HTTPException(status_code=404, detail="Course not found")
+    tag_response(response, f"outline:{course_id}")
+    return outline
+
+
 @router.put("/{course_id}", response_model=CourseRead)
 def update_course(
     *,
@@ -76,6 +149,27 @@ def update_course(
     return course_service.update(db=db, db_obj=course, obj_in=course_in)
 
 
+@router.put("/{course_id}/module-order", response_model=List[ModuleRead])
+def update_module_order(
+    *,
+    db: Session = Depends(get_session),
+    course_id: int,
+    module_ids: List[int] = Body(...),
+    current_user: User = Depends(get_current_instructor_user),
+) -> Any:
+    """Reorder all modules of a course at once.
+
+    ``module_ids`` lists every module of the course in its new order.
+    """
+    course = course_service.get(db=db, id=course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    try:
+        return module_service.reorder(db=db, parent_id=course_id, ids=module_ids)
+    except ReorderError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.delete("/{course_id}", response_model=CourseRead)
 def delete_course(
     *,
@@ -87,4 +181,80 @@ def delete_course(
     course = course_service.get(db=db, id=course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course_service.remove(db=db, id=course_id)
\ No newline at end of file
+    return course_service.remove(db=db, id=course_id)
+
+
+@async_router.get("/", response_model=List[CourseRead])
+async def read_courses_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = Query(False),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
+) -> Any:
+    """Get courses."""
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, CourseRead)
+    if active_only:
+        statement = course_service.select_active_courses()
+    else:
+        statement = course_service.select_multi()
+    total = await acount_rows(db, statement, cached=True)
+    page = apply_keyset(statement, (Course.id,), after).offset(skip).limit(limit)
+    if stream:
+        return astream_rows(
+            db,
+            page,
+            model=Course,
+            read_model=CourseRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    courses = await course_service.aget_fields(db, page, fields=names + ("id",) if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, courses, ("id",), limit=limit)
+    tag_response(response, "courses")
+    return rows_response(courses, read_model=CourseRead, fields=names, response=response)
+
+
+@async_router.get("/{course_id}", response_model=CourseRead)
+async def read_course_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    course_id: int,
+) -> Any:
+    """Get course by ID."""
+    course = await course_service.aget(db=db, id=course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    tag_response(response, f"course:{course_id}")
+    return course
+
+
+@async_router.get(
+    "/{course_id}/outline",
+    response_model=CourseReadWithModules,
+    response_model_exclude_none=True,
+)
+async def read_course_outline_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    course_id: int,
+    include_content: bool = Query(True),
+) -> Any:
+    """Get course with its ordered modules and lessons."""
+    outline = await course_service.aget_outline(
+        db=db, course_id=course_id, include_content=include_content
+    )
+    if not outline:
+        raise HTTPException(status_code=404, detail="Course not found")
+    tag_response(response, f"outline:{course_id}")
+    return outline
@@ -0,0 +1,51 @@
+"""Catalog import API endpoints."""
+
+import tempfile
+from typing import IO, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+
+from ...config import get_settings
+from ...db.session import get_session
+from ...models.catalog_import import ImportReport
+from ...models.user import User
+from ...services.catalog_importer import (
+    CatalogImportError,
+    catalog_importer,
+    iter_courses,
+    iter_documents,
+)
+from ..deps import get_current_instructor_user
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+def _import(db: Session, upload: IO[bytes]) -> ImportReport:
+    """Run the importer over a spooled upload."""
+    try:
+        return catalog_importer.run(db, iter_courses(iter_documents(upload)))
+    except CatalogImportError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/", response_model=ImportReport)
+async def import_catalog(
+    *,
+    request: Request,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_instructor_user),
+) -> Any:
+    """Import course trees sent as NDJSON or a JSON array.
+
+    Courses, modules and lessons are matched by title within their parent and
+    updated in place, so sending the same document twice is safe.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_BYTES) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        return await run_in_threadpool(_import, db, upload)
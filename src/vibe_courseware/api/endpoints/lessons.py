@@ -1,16 +1,43 @@
 """Lessons API endpoints."""
 
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ...db.session import get_session
-from ...models.lesson import Lesson, LessonCreate, LessonRead, LessonType, LessonUpdate
+from ...config import get_settings
+from ...db.session import get_async_session, get_session
+from ...models.base import BulkItemError
+from ...models.lesson import (
+    Lesson,
+    LessonBulkResult,
+    LessonCreate,
+    LessonRead,
+    LessonType,
+    LessonUpdate,
+)
 from ...services.lesson_service import LessonService
 from ...services.module_service import ModuleService
+from ...utils.cache import tag_response
+from ...utils.fields import parse_fields
+from ...utils.pagination import (
+    TOTAL_COUNT_HEADER,
+    acount_rows,
+    apply_keyset,
+    count_rows,
+    decode_cursor,
+    set_next_cursor,
+    set_total_count,
+)
+from ...utils.serialization import rows_response
+from ...utils.streaming import StreamFormat, astream_rows, stream_rows
+
+settings = get_settings()
 
 router = APIRouter()
+# Async variants of the read endpoints, mounted in place of the sync ones by DATABASE_ASYNC
+async_router = APIRouter()
 lesson_service = LessonService()
 module_service = ModuleService()
 
@@ -19,29 +46,53 @@ module_service = ModuleService()
 def read_lessons(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     module_id: int = Query(None),
     lesson_type: LessonType = Query(None),
     skip: int = 0,
     limit: int = 100,
     ordered: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
 ) -> Any:
-    """Get lessons."""
+    """Get lessons.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one,
+    and ``stream`` to receive the rows as NDJSON or a JSON array while they are read.
+    ``fields`` limits the items to a comma separated list of fields, e.g.
+    ``fields=id,title,order``, and only those columns are read.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, LessonRead)
+    keys = ("id",)
     if module_id:
+        statement = lesson_service.select_by_module_id(module_id=module_id)
         if ordered:
-            lessons = lesson_service.get_by_module_id_ordered(
-                db=db, module_id=module_id, skip=skip, limit=limit
-            )
-        else:
-            lessons = lesson_service.get_by_module_id(
-                db=db, module_id=module_id, skip=skip, limit=limit
-            )
+            keys = ("order", "id")
     elif lesson_type:
-        lessons = lesson_service.get_by_type(
-            db=db, lesson_type=lesson_type, skip=skip, limit=limit
-        )
+        statement = lesson_service.select_by_type(lesson_type=lesson_type)
     else:
-        lessons = lesson_service.get_multi(db=db, skip=skip, limit=limit)
-    return lessons
+        statement = lesson_service.select_multi()
+    total = count_rows(db, statement, cached=True)
+    page = apply_keyset(statement, [getattr(Lesson, key) for key in keys], after)
+    page = page.offset(skip).limit(limit)
+    if stream:
+        return stream_rows(
+            db,
+            page,
+            model=Lesson,
+            read_model=LessonRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    lessons = lesson_service.get_fields(db, page, fields=names + keys if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, lessons, keys, limit=limit)
+    tag_response(response, f"lessons:module:{module_id}" if module_id else "lessons")
+    return rows_response(lessons, read_model=LessonRead, fields=names, response=response)
 
 
 @router.post("/", response_model=LessonRead)
@@ -60,16 +111,36 @@ def create_lesson(
     return lesson_service.create(db=db, obj_in=lesson_in)
 
 
+@router.post("/bulk", response_model=LessonBulkResult)
+def create_lessons_bulk(
+    *,
+    db: Session = Depends(get_session),
+    lessons_in: List[LessonCreate] = Body(..., max_length=settings.BULK_CREATE_MAX_ITEMS),
+) -> Any:
+    """Create lessons in one transaction.
+
+    Items that cannot be created are listed in ``errors`` by their position in the
+    request; the others are created.
+    """
+    created, errors = lesson_service.create_many(db=db, objs_in=lessons_in)
+    return LessonBulkResult(
+        created=created,
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in errors.items()],
+    )
+
+
 @router.get("/{lesson_id}", response_model=LessonRead)
 def read_lesson(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     lesson_id: int,
 ) -> Any:
     """Get lesson by ID."""
     lesson = lesson_service.get(db=db, id=lesson_id)
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
+    tag_response(response, f"lesson:{lesson_id}")
     return lesson
 
 
@@ -97,4 +168,66 @@ def delete_lesson(
     lesson = lesson_service.get(db=db, id=lesson_id)
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    return lesson_service.remove(db=db, id=lesson_id)
\ No newline at end of file
+    return lesson_service.remove(db=db, id=lesson_id)
+
+
+@async_router.get("/", response_model=List[LessonRead])
+async def read_lessons_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    module_id: int = Query(None),
+    lesson_type: LessonType = Query(None),
+    skip: int = 0,
+    limit: int = 100,
+    ordered: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
+) -> Any:
+    """Get lessons."""
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, LessonRead)
+    keys = ("id",)
+    if module_id:
+        statement = lesson_service.select_by_module_id(module_id=module_id)
+        if ordered:
+            keys = ("order", "id")
+    elif lesson_type:
+        statement = lesson_service.select_by_type(lesson_type=lesson_type)
+    else:
+        statement = lesson_service.select_multi()
+    total = await acount_rows(db, statement, cached=True)
+    page = apply_keyset(statement, [getattr(Lesson, key) for key in keys], after)
+    page = page.offset(skip).limit(limit)
+    if stream:
+        return astream_rows(
+            db,
+            page,
+            model=Lesson,
+            read_model=LessonRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    lessons = await lesson_service.aget_fields(db, page, fields=names + keys if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, lessons, keys, limit=limit)
+    tag_response(response, f"lessons:module:{module_id}" if module_id else "lessons")
+    return rows_response(lessons, read_model=LessonRead, fields=names, response=response)
+
+
+@async_router.get("/{lesson_id}", response_model=LessonRead)
+async def read_lesson_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    lesson_id: int,
+) -> Any:
+    """Get lesson by ID."""
+    lesson = await lesson_service.aget(db=db, id=lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    tag_response(response, f"lesson:{lesson_id}")
+    return lesson
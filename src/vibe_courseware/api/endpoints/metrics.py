@@ -0,0 +1,15 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ...utils.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics() -> Response:
+    """Get request, threadpool, database pool, hashing and cache metrics."""
+    # Async so the threadpool it reports on is not one thread busier for the scrape
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
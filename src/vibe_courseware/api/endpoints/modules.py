@@ -1,42 +1,92 @@
 """Modules API endpoints."""
 
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ...db.session import get_session
-from ...models.module import Module, ModuleCreate, ModuleRead, ModuleUpdate
+from ...config import get_settings
+from ...db.session import get_async_session, get_session
+from ...models.base import BulkItemError
+from ...models.lesson import LessonRead
+from ...models.module import Module, ModuleBulkResult, ModuleCreate, ModuleRead, ModuleUpdate
+from ...services.base_service import ReorderError
 from ...services.course_service import CourseService
+from ...services.lesson_service import LessonService
 from ...services.module_service import ModuleService
+from ...utils.cache import tag_response
+from ...utils.fields import parse_fields
+from ...utils.pagination import (
+    TOTAL_COUNT_HEADER,
+    acount_rows,
+    apply_keyset,
+    count_rows,
+    decode_cursor,
+    set_next_cursor,
+    set_total_count,
+)
+from ...utils.serialization import rows_response
+from ...utils.streaming import StreamFormat, astream_rows, stream_rows
+
+settings = get_settings()
 
 router = APIRouter()
+# Async variants of the read endpoints, mounted in place of the sync ones by DATABASE_ASYNC
+async_router = APIRouter()
 module_service = ModuleService()
 course_service = CourseService()
+lesson_service = LessonService()
 
 
 @router.get("/", response_model=List[ModuleRead])
 def read_modules(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     course_id: int = Query(None),
     skip: int = 0,
     limit: int = 100,
     ordered: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
 ) -> Any:
-    """Get modules."""
+    """Get modules.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one,
+    and ``stream`` to receive the rows as NDJSON or a JSON array while they are read.
+    ``fields`` limits the items to a comma separated list of fields, e.g.
+    ``fields=id,title,order``, and only those columns are read.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, ModuleRead)
+    keys = ("id",)
     if course_id:
+        statement = module_service.select_by_course_id(course_id=course_id)
         if ordered:
-            modules = module_service.get_by_course_id_ordered(
-                db=db, course_id=course_id, skip=skip, limit=limit
-            )
-        else:
-            modules = module_service.get_by_course_id(
-                db=db, course_id=course_id, skip=skip, limit=limit
-            )
+            keys = ("order", "id")
     else:
-        modules = module_service.get_multi(db=db, skip=skip, limit=limit)
-    return modules
+        statement = module_service.select_multi()
+    total = count_rows(db, statement, cached=True)
+    page = apply_keyset(statement, [getattr(Module, key) for key in keys], after)
+    page = page.offset(skip).limit(limit)
+    if stream:
+        return stream_rows(
+            db,
+            page,
+            model=Module,
+            read_model=ModuleRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    modules = module_service.get_fields(db, page, fields=names + keys if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, modules, keys, limit=limit)
+    tag_response(response, f"modules:course:{course_id}" if course_id else "modules")
+    return rows_response(modules, read_model=ModuleRead, fields=names, response=response)
 
 
 @router.post("/", response_model=ModuleRead)
@@ -55,16 +105,36 @@ def create_module(
     return module_service.create(db=db, obj_in=module_in)
 
 
+@router.post("/bulk", response_model=ModuleBulkResult)
+def create_modules_bulk(
+    *,
+    db: Session = Depends(get_session),
+    modules_in: List[ModuleCreate] = Body(..., max_length=settings.BULK_CREATE_MAX_ITEMS),
+) -> Any:
+    """Create modules in one transaction.
+
+    Items that cannot be created are listed in ``errors`` by their position in the
+    request; the others are created.
+    """
+    created, errors = module_service.create_many(db=db, objs_in=modules_in)
+    return ModuleBulkResult(
+        created=created,
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in errors.items()],
+    )
+
+
 @router.get("/{module_id}", response_model=ModuleRead)
 def read_module(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     module_id: int,
 ) -> Any:
     """Get module by ID."""
     module = module_service.get(db=db, id=module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
+    tag_response(response, f"module:{module_id}")
     return module
 
 
@@ -82,6 +152,26 @@ def update_module(
     return module_service.update(db=db, db_obj=module, obj_in=module_in)
 
 
+@router.put("/{module_id}/lesson-order", response_model=List[LessonRead])
+def update_lesson_order(
+    *,
+    db: Session = Depends(get_session),
+    module_id: int,
+    lesson_ids: List[int] = Body(...),
+) -> Any:
+    """Reorder all lessons of a module at once.
+
+    ``lesson_ids`` lists every lesson of the module in its new order.
+    """
+    module = module_service.get(db=db, id=module_id)
+    if not module:
+        raise HTTPException(status_code=404, detail="Module not found")
+    try:
+        return lesson_service.reorder(db=db, parent_id=module_id, ids=lesson_ids)
+    except ReorderError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.delete("/{module_id}", response_model=ModuleRead)
 def delete_module(
     *,
@@ -92,4 +182,63 @@ def delete_module(
     module = module_service.get(db=db, id=module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
-    return module_service.remove(db=db, id=module_id)
\ No newline at end of file
+    return module_service.remove(db=db, id=module_id)
+
+
+@async_router.get("/", response_model=List[ModuleRead])
+async def read_modules_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    course_id: int = Query(None),
+    skip: int = 0,
+    limit: int = 100,
+    ordered: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    stream: Optional[StreamFormat] = Query(None),
+    fields: Optional[str] = Query(None),
+) -> Any:
+    """Get modules."""
+    after = decode_cursor(cursor) if cursor else None
+    names = parse_fields(fields, ModuleRead)
+    keys = ("id",)
+    if course_id:
+        statement = module_service.select_by_course_id(course_id=course_id)
+        if ordered:
+            keys = ("order", "id")
+    else:
+        statement = module_service.select_multi()
+    total = await acount_rows(db, statement, cached=True)
+    page = apply_keyset(statement, [getattr(Module, key) for key in keys], after)
+    page = page.offset(skip).limit(limit)
+    if stream:
+        return astream_rows(
+            db,
+            page,
+            model=Module,
+            read_model=ModuleRead,
+            fmt=stream,
+            fields=names,
+            headers={TOTAL_COUNT_HEADER: str(total)},
+        )
+
+    modules = await module_service.aget_fields(db, page, fields=names + keys if names else None)
+    set_total_count(response, total)
+    set_next_cursor(response, modules, keys, limit=limit)
+    tag_response(response, f"modules:course:{course_id}" if course_id else "modules")
+    return rows_response(modules, read_model=ModuleRead, fields=names, response=response)
+
+
+@async_router.get("/{module_id}", response_model=ModuleRead)
+async def read_module_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    module_id: int,
+) -> Any:
+    """Get module by ID."""
+    module = await module_service.aget(db=db, id=module_id)
+    if not module:
+        raise HTTPException(status_code=404, detail="Module not found")
+    tag_response(response, f"module:{module_id}")
+    return module
@@ -0,0 +1,63 @@
+"""Request profile API endpoints."""
+
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from ...models.user import User
+from ...utils.profiling import ProfileStore, profile_store
+from ..deps import get_current_admin_user
+
+router = APIRouter()
+
+
+def get_profile_store() -> Optional[ProfileStore]:
+    """Get the configured profile store, if profiling is enabled."""
+    return profile_store
+
+
+def _require_store(store: Optional[ProfileStore]) -> ProfileStore:
+    """Reject requests while profiling is disabled."""
+    if store is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return store
+
+
+@router.get("/")
+def read_profiles(
+    *,
+    store: Optional[ProfileStore] = Depends(get_profile_store),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Get the stored request profiles, newest first."""
+    store = _require_store(store)
+    return [profile for id in store.ids() if (profile := store.get(id)) is not None]
+
+
+@router.get("/{profile_id}")
+def read_profile(
+    *,
+    profile_id: str,
+    store: Optional[ProfileStore] = Depends(get_profile_store),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Get a request profile with its allocation deltas."""
+    profile = _require_store(store).get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/{profile_id}/flamegraph")
+def read_profile_flamegraph(
+    *,
+    profile_id: str,
+    store: Optional[ProfileStore] = Depends(get_profile_store),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Get the sampled stacks of a request profile in the collapsed flamegraph format."""
+    path = _require_store(store).folded_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
@@ -0,0 +1,82 @@
+"""Search API endpoints."""
+
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ...db.session import get_async_session, get_session
+from ...models.lesson import LessonType
+from ...models.search import SearchHit, SearchKind
+from ...services.search_service import SearchService
+from ...utils.cache import tag_response
+
+router = APIRouter()
+# Async variant of the search endpoint, mounted in place of the sync one by DATABASE_ASYNC
+async_router = APIRouter()
+search_service = SearchService()
+
+
+def _check_dialect(dialect: str) -> None:
+    """Reject search on databases without the FTS5 index."""
+    if dialect != "sqlite":
+        raise HTTPException(status_code=501, detail="Search requires SQLite FTS5")
+
+
+@router.get("/", response_model=List[SearchHit])
+def search(
+    *,
+    db: Session = Depends(get_session),
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    course_id: Optional[int] = Query(None),
+    lesson_type: Optional[LessonType] = Query(None),
+    kind: Optional[SearchKind] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+) -> Any:
+    """Search active courses, modules and lessons, best matches first.
+
+    Every word of ``q`` must match; end a word with ``*`` to match it as a prefix.
+    Filtering by ``lesson_type`` only returns lessons.
+    """
+    _check_dialect(db.get_bind().dialect.name)
+    hits = search_service.search(
+        db,
+        query=q,
+        course_id=course_id,
+        lesson_type=lesson_type,
+        kind=kind,
+        skip=skip,
+        limit=limit,
+    )
+    tag_response(response, "courses", "modules", "lessons")
+    return hits
+
+
+@async_router.get("/", response_model=List[SearchHit])
+async def search_async(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    course_id: Optional[int] = Query(None),
+    lesson_type: Optional[LessonType] = Query(None),
+    kind: Optional[SearchKind] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+) -> Any:
+    """Search active courses, modules and lessons."""
+    _check_dialect(db.bind.dialect.name)
+    hits = await search_service.asearch(
+        db,
+        query=q,
+        course_id=course_id,
+        lesson_type=lesson_type,
+        kind=kind,
+        skip=skip,
+        limit=limit,
+    )
+    tag_response(response, "courses", "modules", "lessons")
+    return hits
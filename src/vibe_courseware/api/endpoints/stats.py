@@ -0,0 +1,31 @@
+"""Operational statistics API endpoints."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from ...db.instrumentation import query_stats
+from ...db.session import get_pool_stats
+from ...models.user import User
+from ...utils.hashing import password_hasher
+from ..deps import get_current_admin_user
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+def read_db_pool_stats(current_user: User = Depends(get_current_admin_user)) -> Any:
+    """Get database connection pool checkout statistics."""
+    return get_pool_stats()
+
+
+@router.get("/password-hashing")
+def read_password_hashing_stats(current_user: User = Depends(get_current_admin_user)) -> Any:
+    """Get password hashing pool queue depth and counters."""
+    return password_hasher.stats()
+
+
+@router.get("/queries")
+def read_query_stats(current_user: User = Depends(get_current_admin_user)) -> Any:
+    """Get SQL statement counts and times by route, with likely N+1 and slow counts."""
+    return query_stats.snapshot()
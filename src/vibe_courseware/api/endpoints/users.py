@@ -2,14 +2,19 @@
 
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlmodel import Session
 
+from ...config import get_settings
 from ...db.session import get_session
-from ...models.user import User, UserCreate, UserRead, UserUpdate
+from ...models.base import BulkItemError
+from ...models.user import User, UserBulkResult, UserCreate, UserRead, UserUpdate
 from ...services.user_service import UserService
+from ...utils.pagination import count_rows, set_total_count
 from ..deps import get_current_active_user, get_current_admin_user
 
+settings = get_settings()
+
 router = APIRouter()
 user_service = UserService()
 
@@ -18,12 +23,14 @@ user_service = UserService()
 def read_users(
     *,
     db: Session = Depends(get_session),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_admin_user),
 ) -> Any:
     """Get users."""
     users = user_service.get_multi(db=db, skip=skip, limit=limit)
+    set_total_count(response, count_rows(db, user_service.select_multi(), cached=True))
     return users
 
 
@@ -34,22 +41,29 @@ def create_user(
     user_in: UserCreate,
     current_user: User = Depends(get_current_admin_user),
 ) -> Any:
-    """Create user."""
-    user = user_service.get_by_email(db=db, email=user_in.email)
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="A user with this email already exists.",
-        )
-    user = user_service.get_by_username(db=db, username=user_in.username)
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="A user with this username already exists.",
-        )
+    """Create user; a taken email or username is rejected by the database."""
     return user_service.create(db=db, obj_in=user_in)
 
 
+@router.post("/bulk", response_model=UserBulkResult)
+def create_users_bulk(
+    *,
+    db: Session = Depends(get_session),
+    users_in: List[UserCreate] = Body(..., max_length=settings.BULK_CREATE_MAX_ITEMS),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Create users in one transaction, hashing their passwords concurrently.
+
+    Items that cannot be created are listed in ``errors`` by their position in the
+    request; the others are created.
+    """
+    created, errors = user_service.create_many(db=db, objs_in=users_in)
+    return UserBulkResult(
+        created=created,
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in errors.items()],
+    )
+
+
 @router.get("/me", response_model=UserRead)
 def read_user_me(
     current_user: User = Depends(get_current_active_user),
@@ -13,13 +13,99 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Vibe Courseware"
     
+    # Server settings, read by run.py
+    SERVER_MODE: str = "development"  # "development" reloads; "production" forks workers
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # production worker processes; 0 starts one per CPU
+    SERVER_BACKLOG: int = 2048  # connections the listening socket queues
+    SERVER_KEEP_ALIVE: int = 5  # seconds an idle keep-alive connection stays open
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds in-flight requests get on shutdown
+    SERVER_MIGRATE: bool = False  # run "alembic upgrade head" before production workers start
+
     # Database settings
     DATABASE_URL: str = "sqlite:///./vibe_courseware.db"
+    # Serve catalog reads through AsyncSession instead of the threadpool
+    DATABASE_ASYNC: bool = False
+    # Defaults to DATABASE_URL with its async driver (sqlite+aiosqlite, postgresql+asyncpg, ...)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool settings (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 3600  # seconds; -1 never recycles
+    DB_POOL_PRE_PING: bool = False  # worth enabling for network databases
+
+    # SQL instrumentation settings
+    # Time statements per request, send Server-Timing and log N+1 patterns and slow queries
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SLOW_QUERIES: bool = True  # attach EXPLAIN QUERY PLAN (SQLite) to the log
+    # Log slow query parameter values, which include password hashes and emails; debug only
+    SQL_LOG_QUERY_PARAMETERS: bool = False
+    # Runs of one statement shape in a request reported as a likely N+1; 0 disables
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Metrics settings
+    # Serve Prometheus metrics at /metrics, with latency histograms per route
+    METRICS_ENABLED: bool = True
+
+    # Profiling settings
+    # Directory of the request profile ring; unset disables profiling
+    PROFILING_DIR: Optional[str] = None
+    PROFILING_MAX_PROFILES: int = 50
+    # Also profile one in this many requests of any user; 0 profiles only on request
+    PROFILING_SAMPLE_RATE: int = 0
+    PROFILING_INTERVAL_MS: float = 10.0  # between stack samples
+    PROFILING_MEMORY_TOP: int = 25  # allocation sites kept per profile
+    # Ignore X-Profile for this long after a refused token
+    PROFILING_AUTH_RETRY_S: float = 1.0
+
+    # SQLite connection pragmas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # negative values are KiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_FOREIGN_KEYS: bool = True
     
     # Security settings
     SECRET_KEY: str = "change_this_in_production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # Seconds an access token's user is reused without a JWT check or query; 0 disables
+    AUTH_PRINCIPAL_CACHE_TTL: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing settings
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # running plus queued hashes
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0  # seconds to wait for a slot before a 503
     
+    # Pagination settings
+    # Seconds a list total may be served from cache; 0 always runs COUNT(*)
+    PAGINATION_COUNT_CACHE_TTL: float = 0.0
+    # Rows fetched and written per chunk by streaming list responses
+    STREAM_CHUNK_SIZE: int = 500
+
+    # Response cache settings
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 4096
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL: float = 300.0
+
+    # Catalog snapshot settings
+    # Directory of prerendered course outlines served under /catalog; unset disables
+    CATALOG_SNAPSHOT_DIR: Optional[str] = None
+
+    # Bulk write settings
+    BULK_CREATE_MAX_ITEMS: int = 1000
+    BULK_INSERT_BATCH_SIZE: int = 500  # rows per multi-row INSERT
+    IMPORT_BATCH_ROWS: int = 5000  # rows per catalog import transaction
+    IMPORT_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024  # uploads beyond this spill to disk
+
     # CORS settings
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:8000", "http://localhost:3000"]
 
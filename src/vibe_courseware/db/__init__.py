@@ -1,5 +1,5 @@
 """Database module."""
 
-from .session import engine, get_session
+from .session import engine, get_async_engine, get_async_session, get_pool_stats, get_session
 
-__all__ = ["engine", "get_session"]
\ No newline at end of file
+__all__ = ["engine", "get_async_engine", "get_async_session", "get_pool_stats", "get_session"]
\ No newline at end of file
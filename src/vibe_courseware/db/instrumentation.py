@@ -0,0 +1,260 @@
+"""Per-request SQL instrumentation.
+
+Engine event hooks time every statement and attribute it to the request that runs
+it, which ``QueryInstrumentationMiddleware`` tracks in a context variable (copied into
+the threadpool for sync endpoints and into the greenlet for async sessions). Each
+response then carries a ``Server-Timing`` header with the request's statement count
+and database time, and per-route totals are kept for ``/stats/queries``.
+
+Two patterns are logged as warnings:
+
+- a statement of the same shape (SQL text with ``IN`` lists collapsed) run at least
+  ``SQL_N_PLUS_ONE_THRESHOLD`` times in one request, which is most likely an N+1
+- a statement slower than ``SQL_SLOW_QUERY_MS``, with its SQLite
+  ``EXPLAIN QUERY PLAN`` attached
+
+Slow queries are logged with the types of their parameters only, as the values may be
+password hashes or personal data, unless ``SQL_LOG_QUERY_PARAMETERS`` is set.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_IN_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+# Start times of the statements running on a connection, by cursor
+_STARTED_KEY = "query_started"
+
+
+@dataclass
+class RequestQueries:
+    """Statements run by one request."""
+
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    slow: int = 0
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Get the statement shapes run at least ``threshold`` times."""
+        if threshold <= 0:
+            return {}
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+@dataclass
+class RouteQueryStats:
+    """Statement totals of one route."""
+
+    requests: int = 0
+    statements: int = 0
+    seconds: float = 0.0
+    max_statements: int = 0
+    n_plus_one: int = 0
+    slow: int = 0
+
+
+class QueryStats:
+    """Statement totals by route."""
+
+    def __init__(self) -> None:
+        """Initialize totals."""
+        self.routes: Dict[str, RouteQueryStats] = {}
+        self._lock = Lock()
+
+    def record(self, route: str, queries: RequestQueries, *, n_plus_one: bool) -> None:
+        """Add one request's statements to its route."""
+        with self._lock:
+            stats = self.routes.setdefault(route, RouteQueryStats())
+            stats.requests += 1
+            stats.statements += queries.count
+            stats.seconds += queries.seconds
+            stats.max_statements = max(stats.max_statements, queries.count)
+            stats.n_plus_one += n_plus_one
+            stats.slow += queries.slow
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get the totals of every route, with per-request averages."""
+        with self._lock:
+            return {
+                route: {
+                    "requests": stats.requests,
+                    "statements": stats.statements,
+                    "statements_per_request": round(stats.statements / stats.requests, 2),
+                    "max_statements": stats.max_statements,
+                    "seconds_total": round(stats.seconds, 6),
+                    "ms_per_request": round(stats.seconds / stats.requests * 1000, 3),
+                    "n_plus_one_requests": stats.n_plus_one,
+                    "slow_statements": stats.slow,
+                }
+                for route, stats in sorted(self.routes.items())
+            }
+
+    def clear(self) -> None:
+        """Reset the totals."""
+        with self._lock:
+            self.routes.clear()
+
+
+query_stats = QueryStats()
+
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "current_queries", default=None
+)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so runs that differ only in ``IN`` list length match."""
+    return _IN_LIST.sub("?...", " ".join(statement.split()))
+
+
+def explain(connection: Connection, statement: str, parameters: Any) -> Optional[str]:
+    """Get the SQLite query plan of a statement as an indented tree."""
+    if connection.dialect.name != "sqlite":
+        return None
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        rows = cursor.fetchall()
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+    depths: Dict[int, int] = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depths[node] = depths.get(parent, -1) + 1
+        lines.append(f"{'  ' * depths[node]}{detail}")
+    return "\n".join(lines)
+
+
+def _before_cursor_execute(connection: Connection, cursor: Any, *args: Any) -> None:
+    connection.info.setdefault(_STARTED_KEY, {})[id(cursor)] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    connection: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - connection.info[_STARTED_KEY].pop(id(cursor))
+    slow = elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS
+    queries = current_queries.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += elapsed
+        queries.shapes[statement_shape(statement)] += 1
+        queries.slow += slow
+    if slow:
+        plan = None
+        if settings.SQL_EXPLAIN_SLOW_QUERIES and not executemany:
+            plan = explain(connection, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms): %s\nParameters: %s\nPlan:\n%s",
+            elapsed * 1000,
+            statement,
+            repr(parameters) if settings.SQL_LOG_QUERY_PARAMETERS else parameter_types(parameters),
+            plan or "unavailable",
+        )
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # Failed statements get no after_cursor_execute, so forget their start time here
+    execution = context.execution_context
+    if context.connection is not None and execution is not None:
+        context.connection.info.get(_STARTED_KEY, {}).pop(id(execution.cursor), None)
+
+
+def parameter_types(parameters: Any) -> str:
+    """Describe statement parameters by their types, leaving out their values."""
+    if isinstance(parameters, (list, tuple)) and parameters:
+        if isinstance(parameters[0], (list, tuple, dict)):
+            return f"{len(parameters)} rows of {parameter_types(parameters[0])}"
+    values = parameters.values() if isinstance(parameters, dict) else parameters or ()
+    return "({})".format(", ".join(type(value).__name__ for value in values))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time and attribute the statements of ``engine``."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def server_timing(queries: RequestQueries) -> str:
+    """Render a request's statements as a ``Server-Timing`` metric."""
+    return f'db;dur={queries.seconds * 1000:.3f};desc="{queries.count} queries"'
+
+
+def _route(scope: Scope) -> Optional[str]:
+    """Get the method and path template of the route that handled a request."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else None
+
+
+class QueryInstrumentationMiddleware:
+    """Track each request's statements and report them in ``Server-Timing``.
+
+    Statements a streaming response runs after its headers are sent still count
+    towards the route totals, but not towards the header.
+    """
+
+    def __init__(self, app: ASGIApp, stats: QueryStats = query_stats) -> None:
+        """Initialize middleware."""
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header = (SERVER_TIMING_HEADER.lower().encode(), server_timing(queries).encode())
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_queries.reset(token)
+            self._finish(scope, queries)
+
+    def _finish(self, scope: Scope, queries: RequestQueries) -> None:
+        """Log likely N+1 patterns and add the request to its route's totals."""
+        route = _route(scope)
+        repeated = queries.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        for shape, n in repeated.items():
+            logger.warning(
+                "Likely N+1 in %s: statement ran %d times: %s", route or scope["path"], n, shape
+            )
+        if route is not None:
+            self.stats.record(route, queries, n_plus_one=bool(repeated))
+
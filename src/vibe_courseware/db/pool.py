@@ -0,0 +1,92 @@
+"""Database connection pool instrumentation."""
+
+import time
+from threading import Lock
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+
+class PoolStats:
+    """Checkout and wait counters for a connection pool."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = Lock()
+
+    def record_checkout(self, waited: float) -> None:
+        """Count a checkout that waited ``waited`` seconds for a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_timeout(self, waited: float) -> None:
+        """Count a checkout that gave up after ``waited`` seconds."""
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_checkin(self) -> None:
+        """Count a connection returned to the pool."""
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Combine the counters with the live state of ``pool``."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return stats
+
+
+class TimedPoolMixin:
+    """Record how long each checkout waits for a pooled connection."""
+
+    stats: PoolStats
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.stats.record_timeout(time.perf_counter() - started)
+            raise
+        self.stats.record_checkout(time.perf_counter() - started)
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)  # type: ignore[misc]
+        self.stats.record_checkin()
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """Queue pool for the sync engine with checkout statistics."""
+
+    # Class level so the counters survive Engine.dispose(), which recreates the pool
+    stats = PoolStats()
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """Queue pool for the async engine with checkout statistics."""
+
+    stats = PoolStats()
@@ -1,18 +1,113 @@
 """Database session module."""
 
-from typing import Generator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Generator, Type
 
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import Pool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..config import get_settings
+from .instrumentation import instrument_engine
+from .pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 settings = get_settings()
 
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    """Check whether a SQLite URL points at an in-memory database."""
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def engine_options(url: URL, poolclass: Type[Pool]) -> Dict[str, Any]:
+    """Get the pool options from settings for an engine on ``url``."""
+    if url.get_backend_name() == "sqlite" and _is_memory_sqlite(url):
+        # In-memory SQLite needs SQLAlchemy's single-connection pools
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the SQLite performance profile to a new connection.
+
+    WAL lets readers proceed while a writer commits, and ``synchronous=NORMAL`` is
+    durable across application crashes in WAL mode while skipping most fsyncs.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+    cursor.execute(f"PRAGMA foreign_keys = {'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+    cursor.close()
+
+
+_database_url = make_url(settings.DATABASE_URL)
+
 engine = create_engine(
-    settings.DATABASE_URL,
+    _database_url,
     echo=False,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
+    connect_args=(
+        {"check_same_thread": False} if _database_url.get_backend_name() == "sqlite" else {}
+    ),
+    **engine_options(_database_url, TimedQueuePool),
 )
+if _database_url.get_backend_name() == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    instrument_engine(engine)
+
+
+def get_async_database_url() -> str:
+    """Get the async database URL, deriving the driver from ``DATABASE_URL`` if unset."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine, created on first use so the sync path needs no async driver."""
+    url = make_url(get_async_database_url())
+    async_engine = create_async_engine(
+        url, echo=False, **engine_options(url, TimedAsyncAdaptedQueuePool)
+    )
+    if url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections if it was ever created."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -21,6 +116,20 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
 def init_db() -> None:
     """Initialize database."""
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(engine)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get checkout statistics for the sync and, if created, the async engine pools."""
+    stats = {"sync": TimedQueuePool.stats.snapshot(engine.pool)}
+    if get_async_engine.cache_info().currsize:
+        stats["async"] = TimedAsyncAdaptedQueuePool.stats.snapshot(get_async_engine().pool)
+    return stats
\ No newline at end of file
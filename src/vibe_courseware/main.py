@@ -1,21 +1,87 @@
 """Main application module."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .api import api_router
+from .api.deps import is_admin_token
+from .api.endpoints import metrics
 from .config import get_settings
+from .db.instrumentation import SERVER_TIMING_HEADER, QueryInstrumentationMiddleware
+from .db.session import dispose_async_engine
+from .services.base_service import DuplicateError, NotFoundError
+from .services.catalog_publisher import catalog_publisher, enable_catalog_publisher
+from .utils.cache import CACHE_STATUS_HEADER, ResponseCacheMiddleware
+from .utils.fields import InvalidFieldsError
+from .utils.hashing import HashingPoolBusyError, password_hasher
+from .utils.metrics import MetricsMiddleware
+from .utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, InvalidCursorError
+from .utils.profiling import PROFILE_ID_HEADER, ProfilingMiddleware, profile_store
 
 settings = get_settings()
 
 
+def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """Report malformed pagination cursors as client errors."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def invalid_fields_handler(request: Request, exc: InvalidFieldsError) -> JSONResponse:
+    """Report unknown sparse fieldset names as client errors."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def duplicate_handler(request: Request, exc: DuplicateError) -> JSONResponse:
+    """Report unique constraint violations as client errors."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def not_found_handler(request: Request, exc: NotFoundError) -> JSONResponse:
+    """Report writes to rows deleted meanwhile as missing."""
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+def hashing_pool_busy_handler(request: Request, exc: HashingPoolBusyError) -> JSONResponse:
+    """Shed password hashing load instead of queueing it without bound."""
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """Publish catalog snapshots on startup; finish them and release resources on shutdown."""
+    if catalog_publisher is not None:
+        catalog_publisher.ensure_published()
+        enable_catalog_publisher(catalog_publisher)
+    yield
+    if catalog_publisher is not None:
+        await run_in_threadpool(catalog_publisher.flush)
+    await dispose_async_engine()
+    password_hasher.shutdown()
+
+
 def create_application() -> FastAPI:
     """Create FastAPI application."""
     application = FastAPI(
         title=settings.PROJECT_NAME,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    # Serve cached catalog reads; added first so CORS headers still vary per request
+    application.add_middleware(ResponseCacheMiddleware)
+
+    # Outside the cache, so a cached Server-Timing header is never replayed
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        application.add_middleware(QueryInstrumentationMiddleware)
+
     # Set up CORS
     if settings.BACKEND_CORS_ORIGINS:
         application.add_middleware(
@@ -24,10 +90,35 @@ def create_application() -> FastAPI:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[
+                TOTAL_COUNT_HEADER,
+                NEXT_CURSOR_HEADER,
+                CACHE_STATUS_HEADER,
+                SERVER_TIMING_HEADER,
+                PROFILE_ID_HEADER,
+            ],
         )
 
+    # Inside the metrics middleware, which then counts the profiling overhead
+    if profile_store is not None:
+        application.add_middleware(
+            ProfilingMiddleware, store=profile_store, authorize=is_admin_token
+        )
+
+    # Outermost, so request latency includes cache hits and every other middleware
+    if settings.METRICS_ENABLED:
+        application.add_middleware(MetricsMiddleware)
+
+    application.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
+    application.add_exception_handler(InvalidFieldsError, invalid_fields_handler)
+    application.add_exception_handler(DuplicateError, duplicate_handler)
+    application.add_exception_handler(NotFoundError, not_found_handler)
+    application.add_exception_handler(HashingPoolBusyError, hashing_pool_busy_handler)
+
     # Include API router
     application.include_router(api_router)
+    if settings.METRICS_ENABLED:
+        application.include_router(metrics.router)
 
     return application
 
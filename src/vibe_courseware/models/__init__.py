@@ -1,30 +1,67 @@
 """Models module."""
 
-from .base import BaseModel, TimestampModel
+from .base import BaseModel, BulkItemError, TimestampModel
+from .catalog_import import CourseImport, ImportReport, LessonImport, ModuleImport
 from .course import Course, CourseCreate, CourseRead, CourseReadWithModules, CourseUpdate
-from .lesson import Lesson, LessonCreate, LessonRead, LessonType, LessonUpdate
-from .module import Module, ModuleCreate, ModuleRead, ModuleReadWithLessons, ModuleUpdate
-from .user import User, UserCreate, UserRead, UserRole, UserUpdate, Token, TokenPayload
+from .lesson import (
+    Lesson,
+    LessonBulkResult,
+    LessonCreate,
+    LessonOutline,
+    LessonRead,
+    LessonType,
+    LessonUpdate,
+)
+from .module import (
+    Module,
+    ModuleBulkResult,
+    ModuleCreate,
+    ModuleRead,
+    ModuleReadWithLessons,
+    ModuleUpdate,
+)
+from .search import SearchHit, SearchKind
+from .user import (
+    Token,
+    TokenPayload,
+    User,
+    UserBulkResult,
+    UserCreate,
+    UserRead,
+    UserRole,
+    UserUpdate,
+)
 
 __all__ = [
     "BaseModel",
+    "BulkItemError",
     "TimestampModel",
+    "CourseImport",
+    "ImportReport",
+    "LessonImport",
+    "ModuleImport",
     "Course",
     "CourseCreate",
     "CourseRead",
     "CourseReadWithModules",
     "CourseUpdate",
     "Module",
+    "ModuleBulkResult",
     "ModuleCreate",
     "ModuleRead",
     "ModuleReadWithLessons",
     "ModuleUpdate",
     "Lesson",
+    "LessonBulkResult",
     "LessonCreate",
+    "LessonOutline",
     "LessonRead",
     "LessonType",
     "LessonUpdate",
+    "SearchHit",
+    "SearchKind",
     "User",
+    "UserBulkResult",
     "UserCreate",
     "UserRead",
     "UserRole",
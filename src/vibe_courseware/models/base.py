@@ -16,4 +16,14 @@ class TimestampModel(BaseModel):
     """Base model with timestamp fields."""
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    # Also bumped by every UPDATE that does not set it itself
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+
+class BulkItemError(SQLModel):
+    """Error for one item of a bulk request, identified by its position."""
+
+    index: int
+    detail: str
\ No newline at end of file
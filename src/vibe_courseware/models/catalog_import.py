@@ -0,0 +1,51 @@
+"""Catalog import models module."""
+
+from typing import List, Optional
+
+from sqlmodel import Field, SQLModel
+
+from .lesson import LessonType
+
+
+class LessonImport(SQLModel):
+    """Lesson of an imported module, matched by title within the module."""
+
+    title: str
+    content: str
+    type: LessonType = Field(default=LessonType.TEXT)
+    # Defaults to the lesson's position in its module
+    order: Optional[int] = None
+
+
+class ModuleImport(SQLModel):
+    """Module of an imported course, matched by title within the course."""
+
+    title: str
+    description: str = ""
+    # Defaults to the module's position in its course
+    order: Optional[int] = None
+    lessons: List[LessonImport] = []
+
+
+class CourseImport(SQLModel):
+    """Imported course tree, matched by title."""
+
+    title: str
+    description: str
+    is_active: bool = True
+    modules: List[ModuleImport] = []
+
+
+class ImportReport(SQLModel):
+    """Outcome of a catalog import."""
+
+    courses_created: int = 0
+    courses_updated: int = 0
+    modules_created: int = 0
+    modules_updated: int = 0
+    lessons_created: int = 0
+    lessons_updated: int = 0
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
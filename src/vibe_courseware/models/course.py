@@ -6,14 +6,15 @@ from typing import List, Optional
 from sqlmodel import Field, Relationship, SQLModel
 
 from .base import TimestampModel
+from .module import Module, ModuleReadWithLessons
 
 
 class CourseBase(SQLModel):
     """Base course model."""
 
-    title: str = Field(index=True)
+    title: str = Field(unique=True, index=True)
     description: str
-    is_active: bool = Field(default=True)
+    is_active: bool = Field(default=True, index=True)
 
 
 class Course(CourseBase, TimestampModel, table=True):
@@ -22,7 +23,10 @@ class Course(CourseBase, TimestampModel, table=True):
     __tablename__ = "courses"
 
     # Relationships
-    modules: List["Module"] = Relationship(back_populates="course")
+    modules: List["Module"] = Relationship(
+        back_populates="course",
+        sa_relationship_kwargs={"order_by": "[Module.course_id, Module.order, Module.id]"},
+    )
 
 
 class CourseCreate(CourseBase):
@@ -48,8 +52,6 @@ class CourseRead(CourseBase):
 
 
 class CourseReadWithModules(CourseRead):
-    """Course read model with modules."""
+    """Course read model with its ordered modules and their ordered lessons."""
 
-    from .module import ModuleRead
-
-    modules: List[ModuleRead] = []
\ No newline at end of file
+    modules: List[ModuleReadWithLessons] = []
\ No newline at end of file
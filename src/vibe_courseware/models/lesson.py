@@ -2,11 +2,15 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from .base import TimestampModel
+from .base import BulkItemError, TimestampModel
+
+if TYPE_CHECKING:
+    from .module import Module
 
 
 class LessonType(str, Enum):
@@ -23,15 +27,17 @@ class LessonBase(SQLModel):
 
     title: str = Field(index=True)
     content: str
-    type: LessonType = Field(default=LessonType.TEXT)
+    type: LessonType = Field(default=LessonType.TEXT, index=True)
     order: int = Field(default=0)
-    module_id: int = Field(foreign_key="modules.id")
+    module_id: int = Field(foreign_key="modules.id", index=True)
 
 
 class Lesson(LessonBase, TimestampModel, table=True):
     """Lesson model."""
 
     __tablename__ = "lessons"
+    # Ordered listings; the id tie-breaker is the rowid every index ends with
+    __table_args__ = (Index("ix_lessons_module_id_order", "module_id", "order"),)
 
     # Relationships
     module: "Module" = Relationship(back_populates="lessons")
@@ -57,4 +63,17 @@ class LessonRead(LessonBase):
 
     id: int
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+
+class LessonOutline(LessonRead):
+    """Lesson entry of a course outline, whose content may be left out."""
+
+    content: Optional[str] = None
+
+
+class LessonBulkResult(SQLModel):
+    """Outcome of a bulk lesson create."""
+
+    created: List[LessonRead] = []
+    errors: List[BulkItemError] = []
\ No newline at end of file
@@ -1,11 +1,16 @@
 """Module models module."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from .base import TimestampModel
+from .base import BulkItemError, TimestampModel
+from .lesson import Lesson, LessonOutline
+
+if TYPE_CHECKING:
+    from .course import Course
 
 
 class ModuleBase(SQLModel):
@@ -14,17 +19,24 @@ class ModuleBase(SQLModel):
     title: str = Field(index=True)
     description: str
     order: int = Field(default=0)
-    course_id: int = Field(foreign_key="courses.id")
+    course_id: int = Field(foreign_key="courses.id", index=True)
 
 
 class Module(ModuleBase, TimestampModel, table=True):
     """Module model."""
 
     __tablename__ = "modules"
+    # Ordered listings; the id tie-breaker is the rowid every index ends with
+    __table_args__ = (Index("ix_modules_course_id_order", "course_id", "order"),)
 
     # Relationships
     course: "Course" = Relationship(back_populates="modules")
-    lessons: List["Lesson"] = Relationship(back_populates="module")
+    # Leading with module_id lets selectin loads of many modules read
+    # ix_lessons_module_id_order in order instead of sorting
+    lessons: List["Lesson"] = Relationship(
+        back_populates="module",
+        sa_relationship_kwargs={"order_by": "[Lesson.module_id, Lesson.order, Lesson.id]"},
+    )
 
 
 class ModuleCreate(ModuleBase):
@@ -52,6 +64,11 @@ class ModuleRead(ModuleBase):
 class ModuleReadWithLessons(ModuleRead):
     """Module read model with lessons."""
 
-    from .lesson import LessonRead
+    lessons: List[LessonOutline] = []
+
+
+class ModuleBulkResult(SQLModel):
+    """Outcome of a bulk module create."""
 
-    lessons: List[LessonRead] = []
\ No newline at end of file
+    created: List[ModuleRead] = []
+    errors: List[BulkItemError] = []
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Search models module.
+
+Full-text search runs on the SQLite FTS5 table ``search_index``, which holds one row
+per course, module and lesson. Its rowid is ``id * 4 + kind`` so the triggers below
+find a row by primary key. The triggers keep it in step with every write, including
+bulk and raw SQL ones; updates that only touch ``order`` or timestamps do not
+reindex.
+"""
+
+from enum import Enum
+from typing import Any, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from .lesson import LessonType
+
+SEARCH_TABLE = "search_index"
+
+
+class SearchKind(str, Enum):
+    """Kind of a search hit."""
+
+    COURSE = "course"
+    MODULE = "module"
+    LESSON = "lesson"
+
+
+class SearchHit(SQLModel):
+    """Ranked full-text search result."""
+
+    kind: SearchKind
+    id: int
+    course_id: int
+    lesson_type: Optional[LessonType] = None
+    title: str
+    # HTML: the escaped matching text, with <mark> around the matched terms
+    snippet: str
+    score: float
+
+
+_COURSE_ROW = (
+    "SELECT {id} * 4 + 1, 'course', {id}, {id}, NULL, {alias}.title, {alias}.description"
+)
+_MODULE_ROW = (
+    "SELECT {id} * 4 + 2, 'module', {id}, {alias}.course_id, NULL, "
+    "{alias}.title, {alias}.description"
+)
+_LESSON_ROW = (
+    "SELECT {id} * 4 + 3, 'lesson', {id}, "
+    "(SELECT course_id FROM modules WHERE modules.id = {alias}.module_id), "
+    "{alias}.type, {alias}.title, {alias}.content"
+)
+_INSERT = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, kind, item_id, course_id, lesson_type, title, body) "
+)
+
+
+_INDEXED_TABLES = (("courses", _COURSE_ROW), ("modules", _MODULE_ROW), ("lessons", _LESSON_ROW))
+
+
+def _triggers(table: str, code: int, row: str, columns: str) -> List[str]:
+    """Build the insert, update and delete triggers of one indexed table."""
+    new_row = row.format(id="new.id", alias="new")
+    delete_old = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {code};"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} "
+        f"BEGIN {_INSERT}{new_row}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {columns} "
+        f"ON {table} BEGIN {delete_old} {_INSERT}{new_row}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END",
+    ]
+
+
+SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "kind UNINDEXED, item_id UNINDEXED, course_id UNINDEXED, lesson_type UNINDEXED, "
+    "title, body, tokenize = 'porter unicode61 remove_diacritics 2')",
+    *_triggers("courses", 1, _COURSE_ROW, "title, description"),
+    *_triggers("modules", 2, _MODULE_ROW, "title, description, course_id"),
+    *_triggers("lessons", 3, _LESSON_ROW, "title, content, type, module_id"),
+    # Lessons carry their course id, so follow modules that move between courses
+    "CREATE TRIGGER IF NOT EXISTS modules_search_move AFTER UPDATE OF course_id ON modules "
+    f"BEGIN UPDATE {SEARCH_TABLE} SET course_id = new.course_id "
+    "WHERE rowid IN (SELECT id * 4 + 3 FROM lessons WHERE module_id = new.id); END",
+]
+
+
+def is_search_table(name: str) -> bool:
+    """Whether ``name`` is the search index or one of its FTS5 shadow tables."""
+    return name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_")
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Repopulate the search index from the catalog tables."""
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    for table, row in _INDEXED_TABLES:
+        select_rows = row.format(id=f"{table}.id", alias=table)
+        connection.execute(text(f"{_INSERT}{select_rows} FROM {table}"))
+
+
+def install_search_index(target: Any, connection: Connection, **kwargs: Any) -> None:
+    """Create the search index and its triggers, backfilling a new index."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SEARCH_TABLE},
+    ).first()
+    for statement in SEARCH_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        rebuild_search_index(connection)
+
+
+event.listen(SQLModel.metadata, "after_create", install_search_index)
@@ -2,12 +2,12 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import EmailStr, Field
-from sqlmodel import SQLModel
+from pydantic import EmailStr
+from sqlmodel import Field, SQLModel
 
-from .base import TimestampModel
+from .base import BulkItemError, TimestampModel
 
 
 class UserRole(str, Enum):
@@ -61,6 +61,13 @@ class UserRead(UserBase):
     updated_at: datetime
 
 
+class UserBulkResult(SQLModel):
+    """Outcome of a bulk user create."""
+
+    created: List[UserRead] = []
+    errors: List[BulkItemError] = []
+
+
 class Token(SQLModel):
     """Token model."""
 
@@ -0,0 +1,193 @@
+"""Production server.
+
+The supervisor imports the application once, binds the listening socket and then forks
+the workers, which inherit both. Workers therefore skip the import and share its
+memory copy-on-write, and the kernel spreads connections over them as they accept on
+the shared socket. They also inherit the shared invalidation counters of the response
+and principal caches, so a write in one worker evicts the entries of all of them.
+uvloop and httptools are used when installed.
+
+On SIGTERM or SIGINT the supervisor asks every worker to shut down gracefully: it
+stops accepting, finishes in-flight requests for up to ``graceful_timeout`` seconds
+and runs the application shutdown. Workers that are still running after that are
+killed. A worker that exits on its own is replaced, except when it failed to start,
+which stops the server.
+"""
+
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import time
+from types import FrameType
+from typing import Any, Dict, Optional, Set
+
+import uvicorn
+
+from .config import get_settings
+
+settings = get_settings()
+
+# Shares uvicorn's log format, as uvicorn's own supervisors do
+logger = logging.getLogger("uvicorn.error")
+
+APP = "vibe_courseware.main:app"
+
+# Exit status of a worker whose application failed to start, as uvicorn uses
+STARTUP_FAILURE = 3
+# Seconds workers get beyond the graceful timeout before they are killed
+KILL_GRACE = 5.0
+# Settings of spawned workers, which cannot see each other's cache invalidations
+_UNSHARED_CACHES_OFF = {
+    "RESPONSE_CACHE_ENABLED": "false",
+    "AUTH_PRINCIPAL_CACHE_TTL": "0",
+    "PAGINATION_COUNT_CACHE_TTL": "0",
+}
+
+
+def default_workers() -> int:
+    """Get the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _implementation(preferred: str, fallback: str) -> str:
+    """Get ``preferred`` if its module is installed, else ``fallback``."""
+    return preferred if importlib.util.find_spec(preferred) else fallback
+
+
+class Supervisor:
+    """Fork workers serving one socket and restart them until told to stop."""
+
+    def __init__(
+        self, config: uvicorn.Config, sock: socket.socket, *, workers: int, graceful_timeout: int
+    ) -> None:
+        """Initialize supervisor."""
+        self.config = config
+        self.socket = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.pids: Set[int] = set()
+        self.deadline: Optional[float] = None
+        self.exit_code = 0
+
+    def run(self) -> int:
+        """Serve until stopped and get the exit status."""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for _ in range(self.workers):
+            self._spawn()
+        while self.pids:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                if self.deadline is not None and time.monotonic() > self.deadline:
+                    self._signal_workers(signal.SIGKILL)
+                time.sleep(0.1)
+                continue
+            self.pids.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if self.deadline is not None:
+                continue
+            if code == STARTUP_FAILURE:
+                logger.error("Worker [%d] failed to start, stopping", pid)
+                self.exit_code = 1
+                self.stop()
+            else:
+                logger.warning("Worker [%d] exited with status %d, replacing it", pid, code)
+                self._spawn()
+        logger.info("Stopped all workers")
+        return self.exit_code
+
+    def stop(self) -> None:
+        """Ask every worker to shut down gracefully."""
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.graceful_timeout + KILL_GRACE
+        self._signal_workers(signal.SIGTERM)
+
+    def _handle_stop(self, signum: int, frame: Optional[FrameType]) -> None:
+        logger.info("Received %s, stopping workers", signal.Signals(signum).name)
+        self.stop()
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in self.pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self) -> None:
+        """Fork a worker."""
+        pid = os.fork()
+        if pid:
+            self.pids.add(pid)
+            return
+        code = 1
+        try:
+            code = self._serve()
+        finally:
+            os._exit(code)
+
+    def _serve(self) -> int:
+        """Serve requests in a forked worker until asked to stop."""
+        # uvicorn installs its own handlers while it serves
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        from .db.session import engine
+
+        # Connections pooled before the fork belong to the supervisor
+        engine.dispose(close=False)
+        server = uvicorn.Server(self.config)
+        server.run(sockets=[self.socket])
+        return 0 if server.started else STARTUP_FAILURE
+
+
+def serve(
+    *,
+    host: str = settings.SERVER_HOST,
+    port: int = settings.SERVER_PORT,
+    workers: int = settings.SERVER_WORKERS,
+    backlog: int = settings.SERVER_BACKLOG,
+    keep_alive: int = settings.SERVER_KEEP_ALIVE,
+    graceful_timeout: int = settings.SERVER_GRACEFUL_TIMEOUT,
+) -> int:
+    """Serve the application with ``workers`` processes, or one per CPU if 0."""
+    workers = workers or default_workers()
+    options: Dict[str, Any] = dict(
+        host=host,
+        port=port,
+        loop=_implementation("uvloop", "asyncio"),
+        http=_implementation("httptools", "h11"),
+        backlog=backlog,
+        timeout_keep_alive=keep_alive,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
+    if not hasattr(os, "fork"):
+        # Spawned workers import the application themselves, so they share no cache
+        # invalidations; their caches are turned off rather than served stale
+        if workers > 1:
+            os.environ.update(_UNSHARED_CACHES_OFF)
+        uvicorn.run(APP, workers=workers, **options)
+        return 0
+
+    from .main import app
+    from .services.catalog_publisher import catalog_publisher
+
+    # Once here rather than in every worker's startup; the workers inherit the flag
+    if catalog_publisher is not None:
+        catalog_publisher.ensure_published()
+    config = uvicorn.Config(app, **options)
+    config.load()
+    logger.info(
+        "Serving with %d workers, %s event loop and %s HTTP parser",
+        workers,
+        config.loop,
+        config.http,
+    )
+    sock = config.bind_socket()
+    try:
+        supervisor = Supervisor(config, sock, workers=workers, graceful_timeout=graceful_timeout)
+        return supervisor.run()
+    finally:
+        sock.close()
@@ -1,42 +1,183 @@
 """Base service module."""
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlmodel import SQLModel, Session, select
+from sqlalchemy import Row, case, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Select, Update
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..utils.cache import response_cache
+from ..utils.fields import select_columns
+from ..utils.pagination import apply_keyset
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+settings = get_settings()
+
+# Called with the session and the cache tags of every committed catalog write
+WriteListener = Callable[[Session, Set[str]], None]
+write_listeners: List[WriteListener] = []
+
+
+def notify_write_listeners(db: Session, tags: Set[str]) -> None:
+    """Call every write listener."""
+    for listener in write_listeners:
+        listener(db, tags)
+
+
+class ReorderError(ValueError):
+    """Raised when an ordering does not list exactly the children of its parent."""
+
+
+class DuplicateError(ValueError):
+    """Raised when a write would break one of the model's unique constraints."""
+
+
+class NotFoundError(LookupError):
+    """Raised when the row a write targets was deleted in the meantime."""
+
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base service class."""
 
+    # Parent model and foreign key field that ``create_many`` checks for every item
+    parent: Optional[Tuple[Type[SQLModel], str]] = None
+    # Unique fields and the error reported when a write would duplicate one
+    unique_fields: Dict[str, str] = {}
+
     def __init__(self, model: Type[ModelType]):
         """Initialize service."""
         self.model = model
 
+    def cache_tags(self, db: Session, obj: ModelType) -> Set[str]:
+        """Get the response cache tags to evict when ``obj`` changes."""
+        return set()
+
+    def cache_tags_many(self, db: Session, objs: Sequence[ModelType]) -> Set[str]:
+        """Get the cache tags of several objects written together.
+
+        Services whose tags need a lookup override this to batch it.
+        """
+        tags: Set[str] = set()
+        for obj in objs:
+            tags |= self.cache_tags(db, obj)
+        return tags
+
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """Get by id."""
         return db.get(self.model, id)
 
+    def select_multi(self) -> Select:
+        """Build the statement behind ``get_multi``."""
+        return select(self.model)
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
     ) -> List[ModelType]:
-        """Get multiple."""
-        statement = select(self.model).offset(skip).limit(limit)
+        """Get multiple, ordered by id and starting after the ``(id,)`` cursor if given."""
+        statement = apply_keyset(self.select_multi(), (self.model.id,), after)
+        statement = statement.offset(skip).limit(limit)
         return db.exec(statement).all()
 
+    def get_fields(
+        self, db: Session, statement: Select, *, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Run a ``select(model)`` listing for the columns named by ``fields`` (default: all).
+
+        Returns plain rows rather than objects, so nothing is held in the identity map
+        and columns left out (such as lesson content) are never read.
+        """
+        return db.execute(select_columns(statement, self.model, fields)).all()
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        """Create."""
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        """Create with a single ``INSERT ... RETURNING``."""
+        return self._insert(db, self.bulk_rows([obj_in])[0])
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        batch_size: int = settings.BULK_INSERT_BATCH_SIZE,
+    ) -> Tuple[List[ModelType], Dict[int, str]]:
+        """Create many in a single transaction.
+
+        Items rejected by ``validate_many`` are skipped and reported by index. The
+        rest are converted by ``bulk_rows`` and written with multi-row
+        ``INSERT ... RETURNING`` statements of ``batch_size`` rows, so the created
+        objects need no refresh.
+        """
+        errors = self.validate_many(db, objs_in)
+        rows = self.bulk_rows(
+            [obj_in for index, obj_in in enumerate(objs_in) if index not in errors]
+        )
+
+        table = self.model.__table__
+        # ``sort_by_parameter_order`` would make SQLite fall back to one INSERT per row,
+        # as it has no sentinel column. Ids grow in VALUES order within a statement, so
+        # sorting by id restores the order of the input instead.
+        statement = insert(table).returning(*table.columns)
+        created: List[ModelType] = []
+        try:
+            for start in range(0, len(rows), batch_size):
+                result = db.execute(statement, rows[start : start + batch_size])
+                batch = sorted(result, key=lambda row: row.id)
+                created.extend(self.model(**row._mapping) for row in batch)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            raise self._write_error(exc) from exc
+
+        self._after_write(db, self.cache_tags_many(db, created))
+        return created, errors
+
+    def validate_many(
+        self, db: Session, objs_in: Sequence[CreateSchemaType]
+    ) -> Dict[int, str]:
+        """Get the errors of the items ``create_many`` must skip, keyed by index.
+
+        Checks that each item's parent exists, with one query for the whole request.
+        """
+        if self.parent is None or not objs_in:
+            return {}
+        parent_model, field = self.parent
+        ids = {getattr(obj_in, field) for obj_in in objs_in}
+        found = set(db.exec(select(parent_model.id).where(parent_model.id.in_(ids))).all())
+        return {
+            index: f"{parent_model.__name__} not found"
+            for index, obj_in in enumerate(objs_in)
+            if getattr(obj_in, field) not in found
+        }
+
+    def bulk_rows(self, objs_in: Sequence[CreateSchemaType]) -> List[Dict[str, Any]]:
+        """Convert validated items into column values for ``create_many``."""
+        # Going through the model fills in defaults such as the timestamps
+        return [self.model(**obj_in.model_dump()).model_dump(exclude={"id"}) for obj_in in objs_in]
 
     def update(
         self,
@@ -45,23 +186,215 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        """Update."""
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        """Update with a single ``UPDATE ... RETURNING`` that also bumps ``updated_at``.
+
+        Returns a fresh object built from the returned row; ``db_obj`` is expired on
+        commit as usual. Raises ``NotFoundError`` if the row was deleted after
+        ``db_obj`` was read.
+        """
+        stale_tags = self.cache_tags(db, db_obj)
+        statement = self._update_statement(db_obj.id, obj_in)
+        try:
+            row = db.execute(statement).one_or_none()
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            raise self._write_error(exc) from exc
+        if row is None:
+            raise NotFoundError(f"{self.model.__name__} not found")
+        updated = self.model(**row._mapping)
+        self._after_write(db, stale_tags | self.cache_tags(db, updated))
+        return updated
+
+    def reorder(self, db: Session, *, parent_id: int, ids: Sequence[int]) -> List[ModelType]:
+        """Set ``order`` of every child of a parent from its position in ``ids``.
+
+        ``ids`` must list each child of ``parent_id`` exactly once. The new positions
+        are applied with one ``UPDATE ... SET order = CASE id ...`` over all the children
+        and the reordered children are returned in their new order.
+
+        The children are checked against the rows the ``UPDATE`` returns, inside its
+        transaction, so a child added or removed concurrently rolls the reorder back
+        instead of leaving it out of the ordering.
+        """
+        if len(set(ids)) != len(ids):
+            raise ReorderError("Duplicate ids in ordering")
+
+        table = self.model.__table__
+        positions = {id: position for position, id in enumerate(ids)}
+        statement = (
+            update(table)
+            .where(table.c[self.parent[1]] == parent_id)
+            .values(
+                order=case(positions, value=table.c.id, else_=table.c.order)
+                if positions
+                else table.c.order,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(*table.columns)
+        )
+        try:
+            rows = db.execute(statement).all()
+            if {row.id for row in rows} != set(ids):
+                raise ReorderError(
+                    f"Ordering must list exactly the {len(rows)} children of this parent"
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        reordered = sorted((self.model(**row._mapping) for row in rows), key=lambda obj: obj.order)
+        if reordered:
+            self._after_write(db, self.cache_tags_many(db, reordered))
+        return reordered
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         """Remove."""
         obj = db.get(self.model, id)
+        tags = self.cache_tags(db, obj)
         db.delete(obj)
         db.commit()
-        return obj
\ No newline at end of file
+        self._after_write(db, tags)
+        return obj
+
+    async def acache_tags(self, db: AsyncSession, obj: ModelType) -> Set[str]:
+        """Async variant of ``cache_tags``."""
+        return await db.run_sync(lambda session: self.cache_tags(session, obj))
+
+    async def aget(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """Async variant of ``get``."""
+        return await db.get(self.model, id)
+
+    async def aget_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[ModelType]:
+        """Async variant of ``get_multi``."""
+        statement = apply_keyset(self.select_multi(), (self.model.id,), after)
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
+
+    async def aget_fields(
+        self, db: AsyncSession, statement: Select, *, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Async variant of ``get_fields``."""
+        return (await db.execute(select_columns(statement, self.model, fields))).all()
+
+    async def acreate(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Async variant of ``create``."""
+        return await self._ainsert(db, self.bulk_rows([obj_in])[0])
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Async variant of ``update``."""
+        stale_tags = await self.acache_tags(db, db_obj)
+        statement = self._update_statement(db_obj.id, obj_in)
+        try:
+            row = (await db.execute(statement)).one_or_none()
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            raise self._write_error(exc) from exc
+        if row is None:
+            raise NotFoundError(f"{self.model.__name__} not found")
+        updated = self.model(**row._mapping)
+        await self._aafter_write(db, stale_tags | await self.acache_tags(db, updated))
+        return updated
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> ModelType:
+        """Async variant of ``remove``."""
+        obj = await db.get(self.model, id)
+        tags = await self.acache_tags(db, obj)
+        await db.delete(obj)
+        await db.commit()
+        await self._aafter_write(db, tags)
+        return obj
+
+    def _after_write(self, db: Session, tags: Set[str]) -> None:
+        """Evict ``tags`` from the response cache and notify the write listeners."""
+        response_cache.invalidate(tags)
+        if tags:
+            notify_write_listeners(db, tags)
+
+    async def _aafter_write(self, db: AsyncSession, tags: Set[str]) -> None:
+        """Async variant of ``_after_write``."""
+        response_cache.invalidate(tags)
+        if tags and write_listeners:
+            await db.run_sync(notify_write_listeners, tags)
+
+    def _insert(self, db: Session, values: Dict[str, Any]) -> ModelType:
+        """Insert one row of column values and build the object from ``RETURNING``."""
+        table = self.model.__table__
+        try:
+            row = db.execute(insert(table).values(values).returning(*table.columns)).one()
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            raise self._write_error(exc) from exc
+        db_obj = self.model(**row._mapping)
+        self._after_write(db, self.cache_tags(db, db_obj))
+        return db_obj
+
+    async def _ainsert(self, db: AsyncSession, values: Dict[str, Any]) -> ModelType:
+        """Async variant of ``_insert``."""
+        table = self.model.__table__
+        try:
+            row = (await db.execute(insert(table).values(values).returning(*table.columns))).one()
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            raise self._write_error(exc) from exc
+        db_obj = self.model(**row._mapping)
+        await self._aafter_write(db, await self.acache_tags(db, db_obj))
+        return db_obj
+
+    def _write_error(self, exc: Exception) -> Exception:
+        """Turn a unique constraint violation on ``unique_fields`` into a ``DuplicateError``.
+
+        The database enforces uniqueness, so writes need no lookup first and stay
+        correct under concurrency. Any other error is returned unchanged.
+        """
+        if not isinstance(exc, IntegrityError):
+            return exc
+        message = str(exc.orig)
+        table = self.model.__tablename__
+        for field, detail in self.unique_fields.items():
+            # SQLite names the column, PostgreSQL the index and key
+            if any(
+                marker in message
+                for marker in (f"{table}.{field}", f"ix_{table}_{field}", f"({field})=")
+            ):
+                error = DuplicateError(detail)
+                error.__cause__ = exc
+                return error
+        return exc
+
+    def _update_statement(
+        self, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Update:
+        """Build the ``UPDATE ... RETURNING`` of the set fields of ``obj_in``."""
+        table = self.model.__table__
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        values = {
+            field: value
+            for field, value in update_data.items()
+            if field in table.c and field != "id"
+        }
+        if "updated_at" in table.c:
+            values["updated_at"] = datetime.utcnow()
+        return (
+            update(table).where(table.c.id == id).values(values).returning(*table.columns)
+        )
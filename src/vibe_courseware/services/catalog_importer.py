@@ -0,0 +1,255 @@
+"""Streaming catalog importer.
+
+Reads course trees from NDJSON or a JSON array one course at a time and writes them
+in transactions of about ``IMPORT_BATCH_ROWS`` rows. Each level is upserted by its
+natural key (course title, module title within the course, lesson title within the
+module) with chunked lookup queries plus bulk UPDATE and multi-row INSERT ... RETURNING
+statements. Parent ids come straight from the RETURNING rows, so children can be
+written in the same batch. Re-importing the same document changes nothing but
+``updated_at``. Rows that are missing from the document are left alone.
+"""
+
+import codecs
+import json
+import time
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple, Type
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_, update
+from sqlmodel import Session, SQLModel
+
+from ..config import get_settings
+from ..models.catalog_import import CourseImport, ImportReport
+from ..models.course import Course
+from ..models.lesson import Lesson
+from ..models.module import Module
+from ..utils.cache import response_cache
+from .base_service import notify_write_listeners
+
+settings = get_settings()
+
+Key = Tuple[Any, ...]
+
+# Keys per IN list of a lookup, far below SQLite's limit of 32766 bound parameters
+LOOKUP_CHUNK_KEYS = 500
+
+
+class CatalogImportError(ValueError):
+    """Raised when an import document is malformed."""
+
+
+def iter_documents(stream: IO[bytes], *, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the JSON values of an NDJSON stream or the items of a JSON array.
+
+    Only the value being decoded is held in memory. When a value spans the buffer,
+    the next read doubles the buffer so large values still decode in linear time.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+
+    def fill(size: int) -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(size)
+        buffer = buffer[position:] + text.decode(chunk, final=not chunk)
+        position = 0
+        eof = not chunk
+        return bool(chunk)
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position == len(buffer):
+            if eof or not fill(chunk_size):
+                if in_array:
+                    raise CatalogImportError("Unterminated JSON array")
+                return
+            continue
+        if in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+            continue
+        if in_array and buffer[position] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            if eof or not fill(max(chunk_size, len(buffer))):
+                raise CatalogImportError(f"Invalid JSON: {exc}") from exc
+            continue
+        position = end
+        yield value
+
+
+def iter_courses(documents: Iterable[Any]) -> Iterator[CourseImport]:
+    """Validate raw documents as course trees."""
+    for number, document in enumerate(documents, start=1):
+        try:
+            yield CourseImport.model_validate(document)
+        except ValidationError as exc:
+            raise CatalogImportError(f"Document {number}: {exc}") from exc
+
+
+class CatalogImporter:
+    """Upsert course trees in batched transactions."""
+
+    def __init__(
+        self,
+        *,
+        batch_rows: int = settings.IMPORT_BATCH_ROWS,
+        lookup_chunk_keys: int = LOOKUP_CHUNK_KEYS,
+    ):
+        """Initialize importer."""
+        self.batch_rows = batch_rows
+        self.lookup_chunk_keys = lookup_chunk_keys
+
+    def run(self, db: Session, courses: Iterable[CourseImport]) -> ImportReport:
+        """Import ``courses`` and report row counts and throughput.
+
+        Batches are committed as they fill up; if a later document is malformed the
+        earlier batches stay imported, and running the import again is safe.
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        batch: List[CourseImport] = []
+        rows = 0
+        for course in courses:
+            batch.append(course)
+            rows += 1 + sum(1 + len(module.lessons) for module in course.modules)
+            if rows >= self.batch_rows:
+                self._import_batch(db, batch, report)
+                batch, rows = [], 0
+        if batch:
+            self._import_batch(db, batch, report)
+
+        report.seconds = round(time.perf_counter() - started, 3)
+        if report.seconds:
+            report.rows_per_second = round(report.rows / report.seconds, 1)
+        return report
+
+    def _import_batch(
+        self, db: Session, courses: Sequence[CourseImport], report: ImportReport
+    ) -> None:
+        """Upsert one batch of course trees in a single transaction."""
+        now = datetime.utcnow()
+        try:
+            course_ids, created, updated = self._upsert(
+                db,
+                Course,
+                ("title",),
+                [course.model_dump(exclude={"modules"}) for course in courses],
+                now,
+            )
+            report.courses_created += created
+            report.courses_updated += updated
+
+            module_rows = []
+            for course in courses:
+                for position, module in enumerate(course.modules):
+                    row = module.model_dump(exclude={"lessons"})
+                    row["course_id"] = course_ids[(course.title,)]
+                    row["order"] = position if module.order is None else module.order
+                    module_rows.append(row)
+            module_ids, created, updated = self._upsert(
+                db, Module, ("course_id", "title"), module_rows, now
+            )
+            report.modules_created += created
+            report.modules_updated += updated
+
+            lesson_rows = []
+            for course in courses:
+                course_id = course_ids[(course.title,)]
+                for module in course.modules:
+                    module_id = module_ids[(course_id, module.title)]
+                    for position, lesson in enumerate(module.lessons):
+                        row = lesson.model_dump()
+                        row["module_id"] = module_id
+                        row["order"] = position if lesson.order is None else lesson.order
+                        lesson_rows.append(row)
+            lesson_ids, created, updated = self._upsert(
+                db, Lesson, ("module_id", "title"), lesson_rows, now
+            )
+            report.lessons_created += created
+            report.lessons_updated += updated
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        report.rows += len(course_ids) + len(module_ids) + len(lesson_ids)
+        report.batches += 1
+        tags = self._cache_tags(course_ids.values(), module_ids, lesson_ids.values())
+        response_cache.invalidate(tags)
+        notify_write_listeners(db, tags)
+
+    def _upsert(
+        self,
+        db: Session,
+        model: Type[SQLModel],
+        key_fields: Tuple[str, ...],
+        rows: List[Dict[str, Any]],
+        now: datetime,
+    ) -> Tuple[Dict[Key, int], int, int]:
+        """Insert or update ``rows`` matched on ``key_fields``.
+
+        Returns the id of every row by key, and the numbers of created and updated
+        rows. When a key repeats, the last row wins.
+        """
+        by_key = {tuple(row[field] for field in key_fields): row for row in rows}
+        if not by_key:
+            return {}, 0, 0
+        table = model.__table__
+        key_columns = [table.c[field] for field in key_fields]
+        keys = list(by_key)
+        ids: Dict[Key, int] = {}
+        # One course may have more lessons than a single IN list can bind
+        for start in range(0, len(keys), self.lookup_chunk_keys):
+            chunk = keys[start : start + self.lookup_chunk_keys]
+            if len(key_columns) == 1:
+                condition = key_columns[0].in_([key[0] for key in chunk])
+            else:
+                condition = tuple_(*key_columns).in_(chunk)
+            ids.update(
+                (tuple(row[1:]), row[0])
+                for row in db.execute(select(table.c.id, *key_columns).where(condition))
+            )
+
+        updates = [
+            {**row, "id": ids[key], "updated_at": now} for key, row in by_key.items() if key in ids
+        ]
+        inserts = [
+            {**row, "created_at": now, "updated_at": now}
+            for key, row in by_key.items()
+            if key not in ids
+        ]
+        if updates:
+            db.execute(update(model), updates)
+        if inserts:
+            statement = insert(table).returning(
+                table.c.id, *key_columns, sort_by_parameter_order=True
+            )
+            for row in db.execute(statement, inserts):
+                ids[tuple(row[1:])] = row[0]
+        return ids, len(inserts), len(updates)
+
+    def _cache_tags(
+        self, course_ids: Iterable[int], module_ids: Dict[Key, int], lesson_ids: Iterable[int]
+    ) -> Set[str]:
+        """Get the response cache tags touched by an imported batch."""
+        tags = {"courses", "modules", "lessons"}
+        for course_id in course_ids:
+            tags.update(
+                {f"course:{course_id}", f"outline:{course_id}", f"modules:course:{course_id}"}
+            )
+        for module_id in module_ids.values():
+            tags.update({f"module:{module_id}", f"lessons:module:{module_id}"})
+        tags.update(f"lesson:{lesson_id}" for lesson_id in lesson_ids)
+        return tags
+
+
+catalog_importer = CatalogImporter()
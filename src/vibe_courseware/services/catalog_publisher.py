@@ -0,0 +1,190 @@
+"""Static catalog snapshot publisher.
+
+Renders every active course outline (course, ordered modules, ordered lessons) to a
+JSON file with a precompressed gzip twin under ``CATALOG_SNAPSHOT_DIR``:
+
+- ``courses.json``: the active courses
+- ``courses/{id}.json``: the full outline of one course
+
+The publisher listens to catalog writes and re-renders only the courses named by
+their ``outline:{id}`` cache tags, plus the index when a course itself changed. The
+rendering runs on a background thread with its own session, after the write's response,
+and a burst of writes to one course is rendered once. Files are replaced atomically, so
+readers never see a partial snapshot.
+
+The full snapshot is published once per process tree: the production supervisor does it
+before forking, and its workers inherit ``published``.
+"""
+
+import gzip
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Optional, Set, Union
+
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from ..config import get_settings
+from ..db.session import engine
+from ..models.course import CourseRead
+from .base_service import write_listeners
+from .course_service import CourseService
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+OUTLINE_TAG = re.compile(r"^outline:(\d+)$")
+
+course_list_adapter = TypeAdapter(List[CourseRead])
+
+
+class CatalogPublisher:
+    """Publish catalog snapshots to a directory."""
+
+    def __init__(self, directory: Union[str, Path], engine: Engine):
+        """Initialize publisher rendering writes with sessions on ``engine``."""
+        self.directory = Path(directory)
+        self.engine = engine
+        self.course_service = CourseService()
+        self.published = False
+        self._pending: Set[str] = set()
+        self._publishing = False
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def index_path(self) -> Path:
+        """Get the path of the course index snapshot."""
+        return self.directory / "courses.json"
+
+    def course_path(self, course_id: int) -> Path:
+        """Get the path of a course outline snapshot."""
+        return self.directory / "courses" / f"{course_id}.json"
+
+    def publish_all(self, db: Session) -> int:
+        """Render the index and every active course; return the number of courses."""
+        (self.directory / "courses").mkdir(parents=True, exist_ok=True)
+        courses = self.course_service.get_active_courses(db, limit=None)
+        published = {course.id for course in courses}
+        for course_id in published:
+            self.publish_course(db, course_id)
+        for path in (self.directory / "courses").glob("*.json"):
+            if path.stem.isdigit() and int(path.stem) not in published:
+                self._remove(path)
+        self.publish_index(db)
+        self.published = True
+        return len(published)
+
+    def ensure_published(self) -> None:
+        """Publish every snapshot unless this process or its parent already did."""
+        if not self.published:
+            with Session(self.engine) as db:
+                self.publish_all(db)
+
+    def publish_index(self, db: Session) -> None:
+        """Render the list of active courses."""
+        courses = self.course_service.get_active_courses(db, limit=None)
+        self._write(self.index_path(), course_list_adapter.dump_json(courses))
+
+    def publish_course(self, db: Session, course_id: int) -> None:
+        """Render one course outline, or drop it if the course is gone or inactive."""
+        outline = self.course_service.get_outline(db, course_id=course_id)
+        path = self.course_path(course_id)
+        if outline is None or not outline.is_active:
+            self._remove(path)
+            return
+        self._write(path, outline.model_dump_json(exclude_none=True).encode())
+
+    def on_write(self, db: Session, tags: Set[str]) -> None:
+        """Queue the snapshots affected by a catalog write for the background thread."""
+        with self._changed:
+            self._pending |= tags
+            # Threads do not survive a fork, so each worker starts its own
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="catalog-publisher", daemon=True
+                )
+                self._thread.start()
+            self._changed.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is rendered; False if ``timeout`` ran out."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: not self._pending and not self._publishing, timeout
+            )
+
+    def publish_tags(self, db: Session, tags: Set[str]) -> None:
+        """Re-render the snapshots named by the cache tags of catalog writes.
+
+        A snapshot failure is logged rather than raised, because the writes it
+        follows have already been committed.
+        """
+        try:
+            for tag in tags:
+                match = OUTLINE_TAG.match(tag)
+                if match:
+                    self.publish_course(db, int(match.group(1)))
+            if "courses" in tags:
+                self.publish_index(db)
+        except Exception:
+            logger.exception("Failed to publish catalog snapshot for %s", sorted(tags))
+
+    def _run(self) -> None:
+        """Render queued writes, coalescing the tags that queue up meanwhile."""
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._pending)
+                tags, self._pending = self._pending, set()
+                self._publishing = True
+            try:
+                with Session(self.engine) as db:
+                    self.publish_tags(db, tags)
+            finally:
+                with self._changed:
+                    self._publishing = False
+                    self._changed.notify_all()
+
+    def _write(self, path: Path, body: bytes) -> None:
+        """Atomically replace ``path`` and its gzip twin."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for target, data in (
+            (path, body),
+            (gzip_path(path), gzip.compress(body, compresslevel=9, mtime=0)),
+        ):
+            temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, target)
+
+    def _remove(self, path: Path) -> None:
+        """Delete a snapshot and its gzip twin if they exist."""
+        for target in (path, gzip_path(path)):
+            target.unlink(missing_ok=True)
+
+
+def gzip_path(path: Path) -> Path:
+    """Get the precompressed twin of a snapshot."""
+    return path.with_name(f"{path.name}.gz")
+
+
+catalog_publisher: Optional[CatalogPublisher] = (
+    CatalogPublisher(settings.CATALOG_SNAPSHOT_DIR, engine)
+    if settings.CATALOG_SNAPSHOT_DIR
+    else None
+)
+
+
+def enable_catalog_publisher(publisher: CatalogPublisher) -> None:
+    """Keep ``publisher`` up to date with catalog writes."""
+    if publisher.on_write not in write_listeners:
+        write_listeners.append(publisher.on_write)
+
+
+def disable_catalog_publisher(publisher: CatalogPublisher) -> None:
+    """Stop updating ``publisher`` on catalog writes."""
+    if publisher.on_write in write_listeners:
+        write_listeners.remove(publisher.on_write)
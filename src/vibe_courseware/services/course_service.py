@@ -1,26 +1,112 @@
 """Course service module."""
 
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Set
 
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..models.course import Course, CourseCreate, CourseUpdate
+from ..models.course import Course, CourseCreate, CourseReadWithModules, CourseUpdate
+from ..models.lesson import Lesson
+from ..models.module import Module
+from ..utils.pagination import apply_keyset
 from .base_service import BaseService
 
 
 class CourseService(BaseService[Course, CourseCreate, CourseUpdate]):
     """Course service."""
 
+    unique_fields = {"title": "Course with this title already exists."}
+
     def __init__(self):
         """Initialize service."""
         super().__init__(Course)
 
+    def cache_tags(self, db: Session, obj: Course) -> Set[str]:
+        """Get the response cache tags to evict when a course changes."""
+        return {"courses", f"course:{obj.id}", f"outline:{obj.id}"}
+
     def get_by_title(self, db: Session, *, title: str) -> Optional[Course]:
         """Get course by title."""
         statement = select(Course).where(Course.title == title)
         return db.exec(statement).first()
 
-    def get_active_courses(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Course]:
-        """Get active courses."""
-        statement = select(Course).where(Course.is_active == True).offset(skip).limit(limit)  # noqa: E712
-        return db.exec(statement).all()
\ No newline at end of file
+    def select_active_courses(self) -> Select:
+        """Build the statement behind ``get_active_courses``."""
+        return select(Course).where(Course.is_active == True)  # noqa: E712
+
+    def get_active_courses(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Course]:
+        """Get active courses, ordered by id and starting after the ``(id,)`` cursor if given."""
+        statement = apply_keyset(self.select_active_courses(), (Course.id,), after)
+        statement = statement.offset(skip).limit(limit)
+        return db.exec(statement).all()
+
+    def select_outline(self, *, course_id: int, include_content: bool = True) -> Select:
+        """Build the statement behind ``get_outline``.
+
+        Modules and lessons are selectin-loaded, so the tree costs three queries
+        (course, modules, lessons) whatever its size. Without ``include_content`` the
+        lesson content column is never selected.
+        """
+        lessons = selectinload(Course.modules).selectinload(Module.lessons)
+        if not include_content:
+            lessons = lessons.defer(Lesson.content)
+        return select(Course).where(Course.id == course_id).options(lessons)
+
+    def get_outline(
+        self, db: Session, *, course_id: int, include_content: bool = True
+    ) -> Optional[CourseReadWithModules]:
+        """Get a course with its ordered modules and lessons."""
+        statement = self.select_outline(course_id=course_id, include_content=include_content)
+        course = db.exec(statement).first()
+        return self._build_outline(course) if course else None
+
+    async def aget_by_title(self, db: AsyncSession, *, title: str) -> Optional[Course]:
+        """Async variant of ``get_by_title``."""
+        statement = select(Course).where(Course.title == title)
+        return (await db.exec(statement)).first()
+
+    async def aget_active_courses(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Course]:
+        """Async variant of ``get_active_courses``."""
+        statement = apply_keyset(self.select_active_courses(), (Course.id,), after)
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
+
+    async def aget_outline(
+        self, db: AsyncSession, *, course_id: int, include_content: bool = True
+    ) -> Optional[CourseReadWithModules]:
+        """Async variant of ``get_outline``."""
+        statement = self.select_outline(course_id=course_id, include_content=include_content)
+        course = (await db.exec(statement)).first()
+        return self._build_outline(course) if course else None
+
+    def _build_outline(self, course: Course) -> CourseReadWithModules:
+        """Convert a course with loaded modules and lessons into its outline."""
+        # model_dump() skips unloaded deferred columns instead of lazy loading them
+        return CourseReadWithModules.model_validate(
+            {
+                **course.model_dump(),
+                "modules": [
+                    {
+                        **module.model_dump(),
+                        "lessons": [lesson.model_dump() for lesson in module.lessons],
+                    }
+                    for module in course.modules
+                ],
+            }
+        )
@@ -1,37 +1,150 @@
 """Lesson service module."""
 
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Set
 
+from sqlalchemy.sql import Select
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.lesson import Lesson, LessonCreate, LessonType, LessonUpdate
+from ..models.module import Module
+from ..utils.pagination import apply_keyset
 from .base_service import BaseService
 
 
 class LessonService(BaseService[Lesson, LessonCreate, LessonUpdate]):
     """Lesson service."""
 
+    parent = (Module, "module_id")
+
     def __init__(self):
         """Initialize service."""
         super().__init__(Lesson)
 
-    def get_by_module_id(self, db: Session, *, module_id: int, skip: int = 0, limit: int = 100) -> List[Lesson]:
-        """Get lessons by module id."""
-        statement = select(Lesson).where(Lesson.module_id == module_id).offset(skip).limit(limit)
+    def cache_tags(self, db: Session, obj: Lesson) -> Set[str]:
+        """Get the response cache tags to evict when a lesson changes.
+
+        Besides the lesson itself this covers its module's lesson listing and its
+        course's outline.
+        """
+        tags = {"lessons", f"lesson:{obj.id}", f"lessons:module:{obj.module_id}"}
+        module = db.get(Module, obj.module_id)
+        if module:
+            tags.add(f"outline:{module.course_id}")
+        return tags
+
+    def cache_tags_many(self, db: Session, objs: Sequence[Lesson]) -> Set[str]:
+        """Get the cache tags of several lessons, finding their courses in one query."""
+        if not objs:
+            return set()
+        module_ids = {obj.module_id for obj in objs}
+        course_ids = db.exec(
+            select(Module.course_id).where(Module.id.in_(module_ids)).distinct()
+        ).all()
+        tags = {"lessons"}
+        for obj in objs:
+            tags |= {f"lesson:{obj.id}", f"lessons:module:{obj.module_id}"}
+        return tags | {f"outline:{course_id}" for course_id in course_ids}
+
+    def select_by_module_id(self, *, module_id: int) -> Select:
+        """Build the statement behind the ``get_by_module_id*`` methods."""
+        return select(Lesson).where(Lesson.module_id == module_id)
+
+    def select_by_type(self, *, lesson_type: LessonType) -> Select:
+        """Build the statement behind ``get_by_type``."""
+        return select(Lesson).where(Lesson.type == lesson_type)
+
+    def get_by_module_id(
+        self,
+        db: Session,
+        *,
+        module_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Get lessons by module id, starting after the ``(id,)`` cursor if given."""
+        statement = apply_keyset(
+            self.select_by_module_id(module_id=module_id), (Lesson.id,), after
+        )
+        statement = statement.offset(skip).limit(limit)
         return db.exec(statement).all()
 
-    def get_by_module_id_ordered(self, db: Session, *, module_id: int, skip: int = 0, limit: int = 100) -> List[Lesson]:
-        """Get lessons by module id ordered by order field."""
-        statement = (
-            select(Lesson)
-            .where(Lesson.module_id == module_id)
-            .order_by(Lesson.order)
-            .offset(skip)
-            .limit(limit)
+    def get_by_module_id_ordered(
+        self,
+        db: Session,
+        *,
+        module_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Get lessons by module id ordered by order field.
+
+        Ties are broken by id, and ``after`` is an ``(order, id)`` cursor.
+        """
+        statement = apply_keyset(
+            self.select_by_module_id(module_id=module_id), (Lesson.order, Lesson.id), after
         )
+        statement = statement.offset(skip).limit(limit)
         return db.exec(statement).all()
-        
-    def get_by_type(self, db: Session, *, lesson_type: LessonType, skip: int = 0, limit: int = 100) -> List[Lesson]:
-        """Get lessons by type."""
-        statement = select(Lesson).where(Lesson.type == lesson_type).offset(skip).limit(limit)
-        return db.exec(statement).all()
\ No newline at end of file
+
+    def get_by_type(
+        self,
+        db: Session,
+        *,
+        lesson_type: LessonType,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Get lessons by type, starting after the ``(id,)`` cursor if given."""
+        statement = apply_keyset(self.select_by_type(lesson_type=lesson_type), (Lesson.id,), after)
+        statement = statement.offset(skip).limit(limit)
+        return db.exec(statement).all()
+
+    async def aget_by_module_id(
+        self,
+        db: AsyncSession,
+        *,
+        module_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Async variant of ``get_by_module_id``."""
+        statement = apply_keyset(
+            self.select_by_module_id(module_id=module_id), (Lesson.id,), after
+        )
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
+
+    async def aget_by_module_id_ordered(
+        self,
+        db: AsyncSession,
+        *,
+        module_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Async variant of ``get_by_module_id_ordered``."""
+        statement = apply_keyset(
+            self.select_by_module_id(module_id=module_id), (Lesson.order, Lesson.id), after
+        )
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
+
+    async def aget_by_type(
+        self,
+        db: AsyncSession,
+        *,
+        lesson_type: LessonType,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Lesson]:
+        """Async variant of ``get_by_type``."""
+        statement = apply_keyset(self.select_by_type(lesson_type=lesson_type), (Lesson.id,), after)
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
@@ -1,32 +1,102 @@
 """Module service module."""
 
-from typing import List
+from typing import Any, List, Optional, Sequence, Set
 
+from sqlalchemy.sql import Select
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..models.course import Course
 from ..models.module import Module, ModuleCreate, ModuleUpdate
+from ..utils.pagination import apply_keyset
 from .base_service import BaseService
 
 
 class ModuleService(BaseService[Module, ModuleCreate, ModuleUpdate]):
     """Module service."""
 
+    parent = (Course, "course_id")
+
     def __init__(self):
         """Initialize service."""
         super().__init__(Module)
 
-    def get_by_course_id(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100) -> List[Module]:
-        """Get modules by course id."""
-        statement = select(Module).where(Module.course_id == course_id).offset(skip).limit(limit)
+    def cache_tags(self, db: Session, obj: Module) -> Set[str]:
+        """Get the response cache tags to evict when a module changes."""
+        return {
+            "modules",
+            f"module:{obj.id}",
+            f"modules:course:{obj.course_id}",
+            f"outline:{obj.course_id}",
+        }
+
+    def select_by_course_id(self, *, course_id: int) -> Select:
+        """Build the statement behind the ``get_by_course_id*`` methods."""
+        return select(Module).where(Module.course_id == course_id)
+
+    def get_by_course_id(
+        self,
+        db: Session,
+        *,
+        course_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Module]:
+        """Get modules by course id, starting after the ``(id,)`` cursor if given."""
+        statement = apply_keyset(
+            self.select_by_course_id(course_id=course_id), (Module.id,), after
+        )
+        statement = statement.offset(skip).limit(limit)
+        return db.exec(statement).all()
+
+    def get_by_course_id_ordered(
+        self,
+        db: Session,
+        *,
+        course_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Module]:
+        """Get modules by course id ordered by order field.
+
+        Ties are broken by id, and ``after`` is an ``(order, id)`` cursor.
+        """
+        statement = apply_keyset(
+            self.select_by_course_id(course_id=course_id), (Module.order, Module.id), after
+        )
+        statement = statement.offset(skip).limit(limit)
         return db.exec(statement).all()
 
-    def get_by_course_id_ordered(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100) -> List[Module]:
-        """Get modules by course id ordered by order field."""
-        statement = (
-            select(Module)
-            .where(Module.course_id == course_id)
-            .order_by(Module.order)
-            .offset(skip)
-            .limit(limit)
+    async def aget_by_course_id(
+        self,
+        db: AsyncSession,
+        *,
+        course_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Module]:
+        """Async variant of ``get_by_course_id``."""
+        statement = apply_keyset(
+            self.select_by_course_id(course_id=course_id), (Module.id,), after
+        )
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
+
+    async def aget_by_course_id_ordered(
+        self,
+        db: AsyncSession,
+        *,
+        course_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Module]:
+        """Async variant of ``get_by_course_id_ordered``."""
+        statement = apply_keyset(
+            self.select_by_course_id(course_id=course_id), (Module.order, Module.id), after
         )
-        return db.exec(statement).all()
\ No newline at end of file
+        statement = statement.offset(skip).limit(limit)
+        return (await db.exec(statement)).all()
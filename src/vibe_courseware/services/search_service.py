@@ -0,0 +1,110 @@
+"""Search service module."""
+
+import html
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.lesson import LessonType
+from ..models.search import SEARCH_TABLE, SearchHit, SearchKind
+
+# Column weights for bm25(): the unindexed columns first, then title and body
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+SNIPPET_TOKENS = 16
+# Delimiters snippet() puts around matches: private use characters, so the text can be
+# HTML-escaped before they become <mark> tags
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+
+def build_match_query(query: str) -> str:
+    """Turn user input into an FTS5 query that matches every term.
+
+    Terms are quoted so FTS5 operators in the input are searched for literally; a
+    trailing ``*`` keeps its prefix-match meaning.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"{}"{}'.format(term.replace('"', '""'), "*" if prefix else ""))
+    return " ".join(terms)
+
+
+def highlight(snippet: str) -> str:
+    """Render a snippet as HTML, escaping the catalog text around its matches."""
+    return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+class SearchService:
+    """Full-text search over courses, modules and lessons."""
+
+    def select_search(
+        self,
+        *,
+        query: str,
+        course_id: Optional[int] = None,
+        lesson_type: Optional[LessonType] = None,
+        kind: Optional[SearchKind] = None,
+        active_only: bool = True,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> TextClause:
+        """Build the ranked search statement."""
+        conditions = [f"{SEARCH_TABLE} MATCH :query"]
+        params: Dict[str, Any] = {
+            "query": build_match_query(query),
+            "skip": skip,
+            "limit": limit,
+            "mark_start": MARK_START,
+            "mark_end": MARK_END,
+        }
+        if course_id is not None:
+            conditions.append(f"{SEARCH_TABLE}.course_id = :course_id")
+            params["course_id"] = course_id
+        if lesson_type is not None:
+            conditions.append(f"{SEARCH_TABLE}.lesson_type = :lesson_type")
+            params["lesson_type"] = lesson_type.name
+        if kind is not None:
+            conditions.append(f"{SEARCH_TABLE}.kind = :kind")
+            params["kind"] = kind.value
+        if active_only:
+            conditions.append("courses.is_active")
+        return text(
+            f"SELECT {SEARCH_TABLE}.kind, {SEARCH_TABLE}.item_id AS id, "
+            f"{SEARCH_TABLE}.course_id, {SEARCH_TABLE}.lesson_type, {SEARCH_TABLE}.title, "
+            f"snippet({SEARCH_TABLE}, -1, :mark_start, :mark_end, '…', {SNIPPET_TOKENS}) "
+            "AS snippet, "
+            f"bm25({SEARCH_TABLE}, 0, 0, 0, 0, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score "
+            f"FROM {SEARCH_TABLE} JOIN courses ON courses.id = {SEARCH_TABLE}.course_id "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY score, {SEARCH_TABLE}.rowid LIMIT :limit OFFSET :skip"
+        ).bindparams(**params)
+
+    def search(self, db: Session, **kwargs: Any) -> List[SearchHit]:
+        """Search the catalog, best matches first; see ``select_search``."""
+        if not build_match_query(kwargs["query"]):
+            return []
+        rows = db.execute(self.select_search(**kwargs)).mappings().all()
+        return [self._hit(row) for row in rows]
+
+    async def asearch(self, db: AsyncSession, **kwargs: Any) -> List[SearchHit]:
+        """Async variant of ``search``."""
+        if not build_match_query(kwargs["query"]):
+            return []
+        rows = (await db.execute(self.select_search(**kwargs))).mappings().all()
+        return [self._hit(row) for row in rows]
+
+    def _hit(self, row: Any) -> SearchHit:
+        """Convert a result row, whose lesson type is stored by name."""
+        values = dict(row)
+        values["snippet"] = highlight(values["snippet"])
+        if values["lesson_type"] is not None:
+            values["lesson_type"] = LessonType[values["lesson_type"]]
+        return SearchHit(**values)
@@ -1,35 +1,32 @@
 """User service module."""
 
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 
-from sqlmodel import Session, select
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.user import User, UserCreate, UserUpdate
-from ..utils.security import get_password_hash, verify_password
+from ..utils.hashing import password_hasher
+from ..utils.principal_cache import principal_cache
 from .base_service import BaseService
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
     """User service."""
 
+    unique_fields = {
+        "email": "A user with this email already exists.",
+        "username": "A user with this username already exists.",
+    }
+
     def __init__(self):
         """Initialize service."""
         super().__init__(User)
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         """Create user."""
-        db_obj = User(
-            email=obj_in.email,
-            username=obj_in.username,
-            full_name=obj_in.full_name,
-            hashed_password=get_password_hash(obj_in.password),
-            is_active=obj_in.is_active,
-            role=obj_in.role,
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self._insert(db, self._row(obj_in, password_hasher.hash(obj_in.password)))
 
     def update(
         self, db: Session, *, db_obj: User, obj_in: UserUpdate
@@ -37,16 +34,60 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """Update user."""
         update_data = obj_in.model_dump(exclude_unset=True)
         if "password" in update_data and update_data["password"]:
-            update_data["hashed_password"] = get_password_hash(update_data["password"])
+            update_data["hashed_password"] = password_hasher.hash(update_data["password"])
             del update_data["password"]
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate_user(user.id)
+        return user
+
+    def remove(self, db: Session, *, id: int) -> User:
+        """Remove user."""
+        user = super().remove(db, id=id)
+        principal_cache.invalidate_user(id)
+        return user
+
+    def validate_many(self, db: Session, objs_in: Sequence[UserCreate]) -> Dict[int, str]:
+        """Reject items whose email or username is taken or repeated in the request."""
+        emails = {obj_in.email for obj_in in objs_in}
+        usernames = {obj_in.username for obj_in in objs_in}
+        statement = select(User.email, User.username).where(
+            or_(User.email.in_(emails), User.username.in_(usernames))
+        )
+        taken_emails, taken_usernames = set(), set()
+        for email, username in db.exec(statement).all():
+            taken_emails.add(email)
+            taken_usernames.add(username)
+
+        errors: Dict[int, str] = {}
+        for index, obj_in in enumerate(objs_in):
+            if obj_in.email in taken_emails:
+                errors[index] = self.unique_fields["email"]
+            elif obj_in.username in taken_usernames:
+                errors[index] = self.unique_fields["username"]
+            taken_emails.add(obj_in.email)
+            taken_usernames.add(obj_in.username)
+        return errors
+
+    def bulk_rows(self, objs_in: Sequence[UserCreate]) -> List[Dict[str, Any]]:
+        """Hash all passwords concurrently on the hashing pool."""
+        hashes = password_hasher.hash_many([obj_in.password for obj_in in objs_in])
+        return [
+            self._row(obj_in, hashed_password)
+            for obj_in, hashed_password in zip(objs_in, hashes, strict=True)
+        ]
+
+    def _row(self, obj_in: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        """Get the column values of a new user."""
+        return User(
+            **obj_in.model_dump(exclude={"password"}), hashed_password=hashed_password
+        ).model_dump(exclude={"id"})
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         """Authenticate user."""
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not password_hasher.verify(password, user.hashed_password):
             return None
         return user
 
@@ -60,6 +101,57 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         statement = select(User).where(User.username == username)
         return db.exec(statement).first()
 
+    async def acreate(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """Async variant of ``create``."""
+        hashed_password = await password_hasher.ahash(obj_in.password)
+        return await self._ainsert(db, self._row(obj_in, hashed_password))
+
+    async def aupdate(
+        self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate
+    ) -> User:
+        """Async variant of ``update``."""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if "password" in update_data and update_data["password"]:
+            update_data["hashed_password"] = await password_hasher.ahash(update_data["password"])
+            del update_data["password"]
+        user = await super().aupdate(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate_user(user.id)
+        return user
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> User:
+        """Async variant of ``remove``."""
+        user = await super().aremove(db, id=id)
+        principal_cache.invalidate_user(id)
+        return user
+
+    async def aauthenticate(
+        self, db: Union[Session, AsyncSession], *, email: str, password: str
+    ) -> Optional[User]:
+        """Async variant of ``authenticate``.
+
+        With a sync session only the lookup runs in the threadpool; bcrypt runs on the
+        hashing pool either way.
+        """
+        if isinstance(db, AsyncSession):
+            user = await self.aget_by_email(db, email=email)
+        else:
+            user = await run_in_threadpool(self.get_by_email, db, email=email)
+        if not user:
+            return None
+        if not await password_hasher.averify(password, user.hashed_password):
+            return None
+        return user
+
+    async def aget_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        """Async variant of ``get_by_email``."""
+        statement = select(User).where(User.email == email)
+        return (await db.exec(statement)).first()
+
+    async def aget_by_username(self, db: AsyncSession, *, username: str) -> Optional[User]:
+        """Async variant of ``get_by_username``."""
+        statement = select(User).where(User.username == username)
+        return (await db.exec(statement)).first()
+
     def is_active(self, user: User) -> bool:
         """Check if user is active."""
         return user.is_active
@@ -0,0 +1,308 @@
+"""Response cache utilities.
+
+Read endpoints opt in by tagging their response with ``tag_response``; the
+``ResponseCacheMiddleware`` then keeps the serialized response keyed by path and
+query string. Services evict entries by tag when they write:
+
+- ``courses`` / ``modules`` / ``lessons``: unscoped listings of that entity
+- ``course:{id}`` / ``module:{id}`` / ``lesson:{id}``: a single entity
+- ``modules:course:{id}`` / ``lessons:module:{id}``: listings scoped to a parent
+- ``outline:{id}``: the outline of a course
+
+Entries live in each process, but every invalidation also advances a counter in shared
+memory. Workers forked by ``vibe_courseware.server`` inherit it, and a worker that
+finds it advanced by another process drops all of its entries on its next lookup.
+"""
+
+import multiprocessing
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+settings = get_settings()
+
+CACHE_TAGS_HEADER = "X-Cache-Tags"
+CACHE_STATUS_HEADER = "X-Cache"
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+@dataclass
+class CacheEntry:
+    """Serialized response kept by the cache."""
+
+    status: int
+    headers: Headers
+    body: bytes
+    tags: Set[str]
+    expires_at: float
+    # Route that computed the response, restored on hits for per-route metrics
+    route: Any = None
+
+
+@dataclass
+class CacheStats:
+    """Response cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+# Forked workers are what share the counters. Locks made in the fork context are
+# unlinked at once, so processes started by spawn, like the development reloader's
+# server, leave no semaphores for the resource tracker to report at exit
+_FORK_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+)
+
+
+class SharedGeneration:
+    """Invalidation counter shared with the processes forked after its creation."""
+
+    def __init__(self) -> None:
+        """Initialize counter."""
+        self._counter = _FORK_CONTEXT.Value("Q", 0)
+
+    @property
+    def value(self) -> int:
+        """Get the number of invalidations in every process so far."""
+        # Aligned 64 bit reads are atomic, so readers skip the lock
+        return int(self._counter.get_obj().value)
+
+    def advance(self) -> Tuple[int, int]:
+        """Count an invalidation and get the counter before and after it."""
+        with self._counter.get_lock():
+            before = self._counter.value
+            self._counter.value = before + 1
+        return before, before + 1
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized responses with TTL and tag invalidation."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int, ttl: float, enabled: bool = True):
+        """Initialize cache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.size = 0
+        # Bumped by every invalidation so responses computed before it are not stored
+        self.generation = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+        self._shared = SharedGeneration()
+        self._seen = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get a live entry and mark it as recently used."""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < time.monotonic():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def record_miss(self) -> None:
+        """Count a cacheable response that had to be computed."""
+        with self._lock:
+            self.misses += 1
+
+    def set(
+        self,
+        key: str,
+        *,
+        status: int,
+        headers: Headers,
+        body: bytes,
+        tags: Iterable[str],
+        generation: int,
+        route: Any = None,
+    ) -> None:
+        """Store an entry unless the data changed since it was computed."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._sync()
+            if generation != self.generation:
+                return
+            self._discard(key)
+            entry = CacheEntry(
+                status=status,
+                headers=headers,
+                body=body,
+                tags=set(tags),
+                expires_at=time.monotonic() + self.ttl,
+                route=route,
+            )
+            self._entries[key] = entry
+            self.size += len(body)
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Evict every entry carrying one of ``tags``, here and in the other workers."""
+        with self._lock:
+            self.generation += 1
+            before, after = self._shared.advance()
+            # Unless another process invalidated meanwhile, only the tags need evicting
+            if before == self._seen:
+                self._seen = after
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def stats(self) -> CacheStats:
+        """Snapshot the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+                entries=len(self._entries),
+                size=self.size,
+            )
+
+    def _sync(self) -> None:
+        """Drop every entry if another process invalidated; the lock must be held."""
+        shared = self._shared.value
+        if shared == self._seen:
+            return
+        self._seen = shared
+        self.generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def _discard(self, key: str) -> None:
+        """Remove an entry and its tag index; the lock must be held."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+
+def tag_response(response: Response, *tags: str) -> None:
+    """Mark a response as cacheable under ``tags``."""
+    response.headers[CACHE_TAGS_HEADER] = ",".join(tags)
+
+
+def _cache_key(scope: Scope) -> str:
+    """Build a cache key from the request path and its sorted query string."""
+    query = scope.get("query_string", b"").decode("latin-1")
+    params = "&".join(sorted(part for part in query.split("&") if part))
+    return f"{scope['path']}?{params}"
+
+
+class ResponseCacheMiddleware:
+    """Serve tagged GET responses from a ``ResponseCache``."""
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache) -> None:
+        """Initialize middleware."""
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http" or scope["method"] != "GET" or not self.cache.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        key = _cache_key(scope)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.route is not None:
+                scope["route"] = entry.route
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": entry.status,
+                    "headers": entry.headers + [(CACHE_STATUS_HEADER.lower().encode(), b"HIT")],
+                }
+            )
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        generation = self.cache.generation
+        status = 0
+        headers: Headers = []
+        tags: List[str] = []
+        chunks: List[bytes] = []
+        tag_header = CACHE_TAGS_HEADER.lower().encode()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == tag_header:
+                        tags.extend(tag for tag in value.decode().split(",") if tag)
+                    else:
+                        headers.append((name, value))
+                message = {**message, "headers": list(headers)}
+                if tags:
+                    self.cache.record_miss()
+                    message["headers"].append((CACHE_STATUS_HEADER.lower().encode(), b"MISS"))
+            elif message["type"] == "http.response.body" and tags and status == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.set(
+                        key,
+                        status=status,
+                        headers=headers,
+                        body=b"".join(chunks),
+                        tags=tags,
+                        generation=generation,
+                        route=scope.get("route"),
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,222 @@
+"""Password hashing worker pool.
+
+bcrypt is deliberately slow, so hashing and verification run on a dedicated executor
+sized by ``PASSWORD_HASH_WORKERS`` instead of the request threadpool. The number of
+pending hashes (running plus queued) is bounded by ``PASSWORD_HASH_MAX_PENDING``;
+callers wait up to ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds for a slot and then get a
+``HashingPoolBusyError``, which the application reports as 503.
+
+Coroutines wait for a slot on the event loop, so an async endpoint holds no request
+thread while bcrypt runs; threads wait on a condition. ``hash_many`` holds at most
+``PASSWORD_HASH_WORKERS`` slots at a time, so a bulk import cannot take the slots
+logins need.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Condition, Lock
+from typing import Any, Callable, Deque, List, Optional, Sequence, Tuple
+
+from ..config import get_settings
+from .security import get_password_hash, verify_password
+
+settings = get_settings()
+
+
+class HashingPoolBusyError(RuntimeError):
+    """Raised when the password hashing queue stays full for too long."""
+
+
+@dataclass
+class HashingStats:
+    """Password hashing pool counters."""
+
+    executor: str
+    workers: int
+    max_pending: int
+    pending: int = 0
+    completed: int = 0
+    rejected: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class PasswordHasher:
+    """Run bcrypt on a bounded thread or process pool."""
+
+    def __init__(
+        self, *, executor: str = "thread", workers: int, max_pending: int, queue_timeout: float
+    ):
+        """Initialize hasher; the executor itself is started on first use."""
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.executor = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+        # Wakes threads waiting for a slot; coroutines wait on their loop's futures
+        self._slot_freed = Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue ``fn(*args)`` once a slot is free, waiting at most ``queue_timeout``."""
+        started = time.perf_counter()
+        with self._lock:
+            acquired = self._slot_freed.wait_for(self._has_free_slot, self.queue_timeout)
+            self._take_slot(started, acquired)
+        return self._start(fn, *args)
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the pool."""
+        return self.submit(get_password_hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the pool."""
+        return self.submit(verify_password, plain_password, hashed_password).result()
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hash several passwords concurrently on the pool, keeping their order.
+
+        Only ``workers`` hashes are submitted at a time, as the pool runs no more.
+        """
+        hashes: List[str] = []
+        running: Deque[Future] = deque()
+        for password in passwords:
+            if len(running) >= self.workers:
+                hashes.append(running.popleft().result())
+            running.append(self.submit(get_password_hash, password))
+        hashes.extend(future.result() for future in running)
+        return hashes
+
+    async def ahash(self, password: str) -> str:
+        """Async variant of ``hash``."""
+        return await self._arun(get_password_hash, password)
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        """Async variant of ``verify``."""
+        return await self._arun(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> HashingStats:
+        """Snapshot the pool counters."""
+        with self._lock:
+            return HashingStats(
+                executor=self.executor,
+                workers=self.workers,
+                max_pending=self.max_pending,
+                pending=self.pending,
+                completed=self.completed,
+                rejected=self.rejected,
+                wait_seconds_total=round(self.wait_seconds_total, 6),
+                wait_seconds_max=round(self.wait_seconds_max, 6),
+            )
+
+    def shutdown(self) -> None:
+        """Stop the executor; it is started again on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def _arun(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Wait for a slot on the event loop, then await the result."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        while True:
+            with self._lock:
+                if self._has_free_slot():
+                    self._take_slot(started, True)
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._take_slot(started, self._has_free_slot())
+                break
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+        return await asyncio.wrap_future(self._start(fn, *args))
+
+    def _has_free_slot(self) -> bool:
+        """Whether fewer than ``max_pending`` hashes are pending; needs the lock."""
+        return self.pending < self.max_pending
+
+    def _take_slot(self, started: float, acquired: bool) -> None:
+        """Record a wait for a slot and take the slot if it was free; needs the lock."""
+        waited = time.perf_counter() - started
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        if not acquired:
+            self.rejected += 1
+            raise HashingPoolBusyError("Password hashing is overloaded, retry later")
+        self.pending += 1
+
+    def _start(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run ``fn(*args)`` on the executor in a slot already taken."""
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release(completed=True))
+        return future
+
+    def _get_executor(self) -> Executor:
+        """Get the executor, starting it if needed."""
+        with self._lock:
+            if self._executor is None:
+                if self.executor == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _release(self, *, completed: bool = False) -> None:
+        """Free the slot of a finished or failed submission and wake its waiters."""
+        with self._lock:
+            self.pending -= 1
+            if completed:
+                self.completed += 1
+            self._slot_freed.notify()
+            # Every waiting coroutine retries, as one may have timed out meanwhile
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's loop is closed
+                pass
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Resolve a slot waiter unless it already timed out."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,335 @@
+"""Prometheus metrics.
+
+``MetricsMiddleware`` times every HTTP request and counts its responses by method,
+route template and status code. ``render_metrics`` adds the live state of the request
+threadpool, the database pools, the password hashing pool and the caches, in the
+Prometheus text format served at ``/metrics``.
+
+Request metrics are only updated on the event loop, so recording a request takes no
+lock, only two clock reads and a few dictionary updates. Every worker process keeps
+its own metrics.
+"""
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from anyio.to_thread import current_default_thread_limiter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db.instrumentation import query_stats
+from ..db.session import get_pool_stats
+from .cache import response_cache
+from .hashing import password_hasher
+from .principal_cache import principal_cache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds of the request latency buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label of requests no route matched, so unknown paths share one series
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Dict[str, str]
+
+
+class RequestMetrics:
+    """Latency histograms and response counts by route, and requests in flight."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize metrics."""
+        self.buckets = buckets
+        self.in_flight = 0
+        # Per (method, route): request count of each bucket, the last one unbounded
+        self.latencies: Dict[Tuple[str, str], List[int]] = {}
+        self.latency_sums: Dict[Tuple[str, str], float] = {}
+        self.responses: Counter = Counter()
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Record a finished request."""
+        key = (method, route)
+        counts = self.latencies.get(key)
+        if counts is None:
+            counts = self.latencies[key] = [0] * (len(self.buckets) + 1)
+            self.latency_sums[key] = 0.0
+        counts[bisect_left(self.buckets, seconds)] += 1
+        self.latency_sums[key] += seconds
+        self.responses[(method, route, status)] += 1
+
+    def clear(self) -> None:
+        """Reset the metrics of finished requests."""
+        self.latencies.clear()
+        self.latency_sums.clear()
+        self.responses.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """Time requests and count their responses in a ``RequestMetrics``."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        """Initialize middleware."""
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reported when the app fails before it starts a response
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            metrics.observe(scope["method"], route, status, elapsed)
+
+
+class MetricsWriter:
+    """Build a document in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        """Initialize document."""
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help: str) -> None:
+        """Start the metric family ``name``."""
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, labels: Optional[Labels] = None) -> None:
+        """Add a sample to the current family."""
+        if labels:
+            rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            name = f"{name}{{{rendered}}}"
+        self.lines.append(f"{name} {_number(value)}")
+
+    def metric(
+        self, name: str, kind: str, help: str, samples: Iterable[Tuple[Labels, float]]
+    ) -> None:
+        """Add a family of samples of ``name``."""
+        self.family(name, kind, help)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def render(self) -> str:
+        """Get the document."""
+        return "\n".join(self.lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _ratio(hits: int, misses: int) -> float:
+    """Get the fraction of lookups that hit."""
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _write_requests(writer: MetricsWriter, metrics: RequestMetrics) -> None:
+    """Add the request latency histograms, response counts and requests in flight."""
+    writer.metric(
+        "http_requests_in_flight",
+        "gauge",
+        "Requests being handled.",
+        [({}, metrics.in_flight)],
+    )
+    writer.family("http_request_duration_seconds", "histogram", "Request latency by route.")
+    for (method, route), counts in sorted(metrics.latencies.items()):
+        labels = {"method": method, "route": route}
+        total = 0
+        for bound, count in zip((*metrics.buckets, float("inf")), counts, strict=True):
+            total += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            writer.sample("http_request_duration_seconds_bucket", total, {**labels, "le": le})
+        writer.sample(
+            "http_request_duration_seconds_sum", metrics.latency_sums[(method, route)], labels
+        )
+        writer.sample("http_request_duration_seconds_count", total, labels)
+    writer.metric(
+        "http_responses_total",
+        "counter",
+        "Responses by route and status code.",
+        (
+            ({"method": method, "route": route, "status": str(status)}, count)
+            for (method, route, status), count in sorted(metrics.responses.items())
+        ),
+    )
+
+
+def _write_threadpool(writer: MetricsWriter) -> None:
+    """Add the saturation of the threadpool that runs sync endpoints."""
+    limiter = current_default_thread_limiter()
+    statistics = limiter.statistics()
+    writer.metric(
+        "threadpool_threads",
+        "gauge",
+        "Threads the request threadpool may run.",
+        [({}, limiter.total_tokens)],
+    )
+    writer.metric(
+        "threadpool_threads_busy",
+        "gauge",
+        "Threads of the request threadpool running a call.",
+        [({}, statistics.borrowed_tokens)],
+    )
+    writer.metric(
+        "threadpool_tasks_waiting",
+        "gauge",
+        "Calls waiting for a request threadpool thread.",
+        [({}, statistics.tasks_waiting)],
+    )
+
+
+def _write_db(writer: MetricsWriter) -> None:
+    """Add connection pool checkouts and waits, and SQL statements by route."""
+    pools = get_pool_stats()
+    counters = [
+        ("db_pool_checkouts_total", "checkouts", "Connections checked out."),
+        ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out."),
+        (
+            "db_pool_checkout_wait_seconds_total",
+            "wait_seconds_total",
+            "Time spent waiting for a connection.",
+        ),
+    ]
+    for name, key, help in counters:
+        samples = (({"pool": pool}, stats[key]) for pool, stats in pools.items())
+        writer.metric(name, "counter", help, samples)
+    writer.metric(
+        "db_pool_checkout_wait_seconds_max",
+        "gauge",
+        "Longest wait for a connection.",
+        (({"pool": pool}, stats["wait_seconds_max"]) for pool, stats in pools.items()),
+    )
+    writer.metric(
+        "db_pool_connections",
+        "gauge",
+        "Pooled connections by state.",
+        (
+            ({"pool": pool, "state": state}, stats[state])
+            for pool, stats in pools.items()
+            for state in ("checked_out", "checked_in", "overflow")
+            if state in stats
+        ),
+    )
+
+    routes = [(route.split(" ", 1), stats) for route, stats in query_stats.snapshot().items()]
+    writer.metric(
+        "db_statements_total",
+        "counter",
+        "SQL statements by route.",
+        (({"method": m, "route": r}, stats["statements"]) for (m, r), stats in routes),
+    )
+    writer.metric(
+        "db_statement_seconds_total",
+        "counter",
+        "SQL statement time by route.",
+        (({"method": m, "route": r}, stats["seconds_total"]) for (m, r), stats in routes),
+    )
+
+
+def _write_hashing(writer: MetricsWriter) -> None:
+    """Add the password hashing pool queue and counters."""
+    stats = password_hasher.stats()
+    writer.metric(
+        "password_hash_workers", "gauge", "Password hashing workers.", [({}, stats.workers)]
+    )
+    writer.metric(
+        "password_hash_pending",
+        "gauge",
+        "Password hashes running or queued.",
+        [({}, stats.pending)],
+    )
+    writer.metric(
+        "password_hash_completed_total",
+        "counter",
+        "Password hashes completed.",
+        [({}, stats.completed)],
+    )
+    writer.metric(
+        "password_hash_rejected_total",
+        "counter",
+        "Password hashes rejected because the queue stayed full.",
+        [({}, stats.rejected)],
+    )
+    writer.metric(
+        "password_hash_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a password hashing slot.",
+        [({}, stats.wait_seconds_total)],
+    )
+
+
+def _write_caches(writer: MetricsWriter) -> None:
+    """Add hits, misses and hit ratios of the response and principal caches."""
+    response = response_cache.stats()
+    caches = {
+        "response": (response.hits, response.misses),
+        "principal": (principal_cache.hits, principal_cache.misses),
+    }
+    writer.metric(
+        "cache_hits_total",
+        "counter",
+        "Cache lookups that hit.",
+        (({"cache": cache}, hits) for cache, (hits, _) in caches.items()),
+    )
+    writer.metric(
+        "cache_misses_total",
+        "counter",
+        "Cache lookups that missed.",
+        (({"cache": cache}, misses) for cache, (_, misses) in caches.items()),
+    )
+    writer.metric(
+        "cache_hit_ratio",
+        "gauge",
+        "Fraction of cache lookups that hit since startup.",
+        (({"cache": cache}, _ratio(hits, misses)) for cache, (hits, misses) in caches.items()),
+    )
+    writer.metric(
+        "response_cache_entries", "gauge", "Cached responses.", [({}, response.entries)]
+    )
+    writer.metric(
+        "response_cache_bytes", "gauge", "Size of cached response bodies.", [({}, response.size)]
+    )
+    writer.metric(
+        "response_cache_evictions_total",
+        "counter",
+        "Cached responses evicted to stay within bounds.",
+        [({}, response.evictions)],
+    )
+
+
+def render_metrics(metrics: RequestMetrics = request_metrics) -> str:
+    """Render every metric; must run on the event loop."""
+    writer = MetricsWriter()
+    _write_requests(writer, metrics)
+    _write_threadpool(writer)
+    _write_db(writer)
+    _write_hashing(writer)
+    _write_caches(writer)
+    return writer.render()
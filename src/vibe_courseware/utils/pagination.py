@@ -1,12 +1,35 @@
 """Pagination utilities."""
 
-from typing import Generic, List, Optional, TypeVar
+import base64
+import binascii
+import json
+import time
+from threading import Lock
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
 
+from fastapi import Response
 from pydantic import BaseModel
+from sqlalchemy import and_, func, or_
+from sqlalchemy.sql import ColumnElement, Select
 from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
 
 T = TypeVar("T", bound=SQLModel)
 
+settings = get_settings()
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# JSON types a cursor value may have, besides null
+CURSOR_VALUE_TYPES = (str, int, float)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or does not fit the listing."""
+
 
 class Page(BaseModel, Generic[T]):
     """Page model for pagination."""
@@ -18,22 +41,164 @@ class Page(BaseModel, Generic[T]):
     pages: int
 
 
+class CountCache:
+    """Short-lived cache of ``COUNT(*)`` results keyed by statement and bind."""
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize cache."""
+        self.ttl = ttl
+        self._entries: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[int]:
+        """Get a cached count if it has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, total = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return total
+
+    def set(self, key: Tuple[Any, ...], total: int) -> None:
+        """Store a count."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, total)
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.PAGINATION_COUNT_CACHE_TTL)
+
+
+def _as_statement(query: Union[type[T], Select]) -> Select:
+    """Accept either a model class or a select statement."""
+    if isinstance(query, Select):
+        return query
+    return select(query)
+
+
+def _cache_key(db: Session, statement: Select) -> Tuple[Any, ...]:
+    """Build a cache key from the compiled SQL, its parameters and the bound engine."""
+    compiled = statement.compile()
+    params = tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+    return (id(db.get_bind()), str(compiled), params)
+
+
+def count_rows(db: Session, query: Union[type[T], Select], *, cached: bool = False) -> int:
+    """Count the rows matched by a query with a single ``SELECT COUNT(*)``.
+
+    Ordering, offset and limit are stripped so the database can answer from an index
+    where one exists. With ``cached`` the result is reused for
+    ``PAGINATION_COUNT_CACHE_TTL`` seconds, which trades exactness for one query less
+    on very large tables.
+    """
+    statement = _as_statement(query).order_by(None).offset(None).limit(None)
+    use_cache = cached and count_cache.ttl > 0
+    if use_cache:
+        key = _cache_key(db, statement)
+        total = count_cache.get(key)
+        if total is not None:
+            return total
+
+    count_statement = select(func.count()).select_from(statement.subquery())
+    total = db.exec(count_statement).one()
+
+    if use_cache:
+        count_cache.set(key, total)
+    return total
+
+
+async def acount_rows(
+    db: AsyncSession, query: Union[type[T], Select], *, cached: bool = False
+) -> int:
+    """Async variant of ``count_rows``."""
+    return await db.run_sync(lambda session: count_rows(session, query, cached=cached))
+
+
+def set_total_count(response: Response, total: int) -> None:
+    """Expose a list total to clients without changing the response body."""
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode keyset values into an opaque cursor token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Tuple[Any, ...]:
+    """Decode a cursor token produced by ``encode_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    if not isinstance(values, list) or not values:
+        raise InvalidCursorError("Invalid cursor")
+    # Keyset values are scalars; anything else would reach the SQL bind
+    if not all(value is None or isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise InvalidCursorError("Invalid cursor")
+    return tuple(values)
+
+
+def apply_keyset(
+    statement: Select,
+    columns: Sequence[ColumnElement],
+    after: Optional[Sequence[Any]] = None,
+) -> Select:
+    """Order a statement by ``columns`` and, given a cursor, seek past it.
+
+    The seek predicate ``(c1 > v1) OR (c1 = v1 AND c2 > v2) ...`` lets the database
+    start from an index position, so every page costs the same as the first one.
+    """
+    statement = statement.order_by(None).order_by(*columns)
+    if after is None:
+        return statement
+    if len(after) != len(columns):
+        raise InvalidCursorError("Cursor does not match this listing")
+
+    condition = columns[-1] > after[-1]
+    for column, value in zip(reversed(columns[:-1]), reversed(after[:-1]), strict=True):
+        condition = or_(column > value, and_(column == value, condition))
+    return statement.where(condition)
+
+
+def set_next_cursor(
+    response: Response, items: Sequence[Any], keys: Sequence[str], *, limit: int
+) -> None:
+    """Expose the cursor of the page following ``items`` when there may be one."""
+    if items and len(items) >= limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, key) for key in keys]
+        )
+
+
 def paginate(
     db: Session,
-    model: type[T],
+    query: Union[type[T], Select],
     *,
     page: int = 1,
     size: int = 10,
+    cached_count: bool = False,
 ) -> Page[T]:
-    """Paginate query results."""
+    """Paginate query results.
+
+    ``query`` may be a model class or a (filtered, ordered) select statement.
+    """
     if page < 1:
         page = 1
     if size < 1:
         size = 10
 
-    statement = select(model)
-    total = db.exec(select(model)).all()
-    total_count = len(total)
+    statement = _as_statement(query)
+    total_count = count_rows(db, statement, cached=cached_count)
 
     statement = statement.offset((page - 1) * size).limit(size)
     items = db.exec(statement).all()
@@ -46,4 +211,4 @@ def paginate(
         page=page,
         size=size,
         pages=pages,
-    )
\ No newline at end of file
+    )
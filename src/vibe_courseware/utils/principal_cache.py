@@ -0,0 +1,131 @@
+"""Authenticated principal cache.
+
+``get_current_user`` keeps the column values of the user behind each access token for
+``AUTH_PRINCIPAL_CACHE_TTL`` seconds, so repeated requests with the same token skip
+both the JWT signature check and the user query. ``UserService`` evicts a user's
+entries whenever it updates or removes that user; like the response cache, the other
+workers then drop all of their entries.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..config import get_settings
+from .cache import SharedGeneration
+
+settings = get_settings()
+
+
+class PrincipalCache:
+    """Bounded LRU cache of user values keyed by access token."""
+
+    def __init__(self, *, ttl: float, max_entries: int):
+        """Initialize cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation so users loaded before it are not stored
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._tokens: Dict[int, Set[str]] = {}
+        self._lock = Lock()
+        self._shared = SharedGeneration()
+        self._seen = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are kept at all."""
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the user values cached for ``token`` if they have not expired."""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] < time.monotonic():
+                self._discard(token)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self,
+        token: str,
+        values: Dict[str, Any],
+        *,
+        expires: Optional[float] = None,
+        generation: int,
+    ) -> None:
+        """Store the user values for ``token``.
+
+        ``expires`` is the token's own expiry as a UNIX timestamp; the entry never
+        outlives it.
+        """
+        if not self.enabled:
+            return
+        lifetime = self.ttl
+        if expires is not None:
+            lifetime = min(lifetime, expires - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._sync()
+            if generation != self.generation:
+                return
+            self._discard(token)
+            self._entries[token] = (time.monotonic() + lifetime, values)
+            self._tokens.setdefault(values["id"], set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Evict every token of a user, here and in the other workers."""
+        with self._lock:
+            self.generation += 1
+            before, after = self._shared.advance()
+            if before == self._seen:
+                self._seen = after
+            for token in list(self._tokens.get(user_id, ())):
+                self._discard(token)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tokens.clear()
+
+    def _sync(self) -> None:
+        """Drop every entry if another process invalidated; the lock must be held."""
+        shared = self._shared.value
+        if shared == self._seen:
+            return
+        self._seen = shared
+        self.generation += 1
+        self._entries.clear()
+        self._tokens.clear()
+
+    def _discard(self, token: str) -> None:
+        """Remove an entry and its user index; the lock must be held."""
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1]["id"]
+        tokens = self._tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens[user_id]
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,353 @@
+"""On-demand request profiling.
+
+``ProfilingMiddleware`` profiles a request when an active admin sends it with the
+``X-Profile`` header, or when it is drawn by the one in ``PROFILING_SAMPLE_RATE``
+sample. Profiled responses carry the profile id in ``X-Profile-Id``.
+
+While a profile runs, a background thread samples the stacks of every busy thread
+every ``PROFILING_INTERVAL_MS``, which covers sync endpoints running in the threadpool
+as well as the event loop, and ``tracemalloc`` traces allocations. Each profile is
+stored under ``PROFILING_DIR`` as:
+
+- ``{id}.folded``: sampled stacks in the collapsed format read by flamegraph.pl,
+  inferno and speedscope
+- ``{id}.json``: the request, its timing and its largest allocation deltas
+
+Only the newest ``PROFILING_MAX_PROFILES`` profiles are kept. One request is profiled
+at a time; requests asking for a profile while another runs are served unprofiled,
+without checking their token. After a token is refused, ``X-Profile`` is ignored for
+``PROFILING_AUTH_RETRY_S`` seconds, so the header cannot be used to flood the
+threadpool and the database with token checks.
+Sampling sees the whole process, so requests running concurrently also show up, and
+a thread running pure Python holds the GIL for up to ``sys.getswitchinterval()``, so
+CPU-bound code is sampled less often than the interval asks for.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+PROFILE_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+# Directories left out of the file names in stacks, longest first
+_PATH_PREFIXES = sorted(
+    {sysconfig.get_paths()["purelib"], sysconfig.get_paths()["stdlib"], os.getcwd()},
+    key=len,
+    reverse=True,
+)
+
+# Leaf frames of threads parked waiting for work, left out of the samples
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+def _short_path(path: str) -> str:
+    """Get a source file path relative to the library or working directory."""
+    for prefix in _PATH_PREFIXES:
+        if path.startswith(prefix + os.sep):
+            return path[len(prefix) + 1 :]
+    return path
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Name a stack frame by function and the module file that defines it."""
+    code = frame.f_code
+    return f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame: FrameType) -> bool:
+    """Whether a thread's innermost frame is a wait for work."""
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES
+
+
+class StackSampler:
+    """Count the stacks of busy threads from a background thread."""
+
+    def __init__(self, interval: float) -> None:
+        """Initialize sampler taking a sample every ``interval`` seconds."""
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the last sample."""
+        self._stopped.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Render the stacks in the collapsed flamegraph format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                names = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    names.append(_frame_name(current))
+                    current = current.f_back
+                self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+
+class MemoryTracer:
+    """Allocation deltas of a stretch of code, by source line."""
+
+    def __init__(self, top: int) -> None:
+        """Initialize tracer keeping the ``top`` largest deltas."""
+        self.top = top
+        self._started = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        """Start tracing unless ``tracemalloc`` already is, and mark the baseline."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        tracemalloc.reset_peak()
+        self._before = self._snapshot()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing and report the allocations since ``start``."""
+        after = self._snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._started:
+            tracemalloc.stop()
+        differences = after.compare_to(self._before, "lineno")
+        return {
+            "peak_bytes": peak,
+            "allocated_bytes": sum(difference.size_diff for difference in differences),
+            "top": [
+                {
+                    "site": "{}:{}".format(
+                        _short_path(difference.traceback[0].filename),
+                        difference.traceback[0].lineno,
+                    ),
+                    "size_diff": difference.size_diff,
+                    "count_diff": difference.count_diff,
+                }
+                for difference in differences[: self.top]
+            ],
+        }
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Snapshot the traced allocations, leaving out the profiler's own."""
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+
+
+class ProfileStore:
+    """Bounded ring of request profiles in a directory."""
+
+    def __init__(self, directory: Union[str, Path], max_profiles: int) -> None:
+        """Initialize store."""
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, profile: Dict[str, Any], folded: str) -> None:
+        """Write a profile and drop the oldest beyond ``max_profiles``."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = profile["id"]
+        self._write(self.directory / f"{profile_id}.folded", folded)
+        # The metadata goes last, as it is what lists a profile
+        self._write(self.directory / f"{profile_id}.json", json.dumps(profile, indent=2))
+        for old in self.ids()[self.max_profiles :]:
+            for suffix in (".json", ".folded"):
+                (self.directory / f"{old}{suffix}").unlink(missing_ok=True)
+
+    def ids(self) -> List[str]:
+        """Get the stored profile ids, newest first."""
+        if not self.directory.is_dir():
+            return []
+        ids = (path.stem for path in self.directory.glob("*.json"))
+        return sorted((id for id in ids if PROFILE_ID.match(id)), reverse=True)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata of a profile."""
+        path = self._path(profile_id, ".json")
+        if path is None or not path.is_file():
+            return None
+        return json.loads(path.read_text())
+
+    def folded_path(self, profile_id: str) -> Optional[Path]:
+        """Get the path of a profile's collapsed stacks."""
+        path = self._path(profile_id, ".folded")
+        return path if path is not None and path.is_file() else None
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        """Get a profile file path, refusing ids that are not profile ids."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        return self.directory / f"{profile_id}{suffix}"
+
+    @staticmethod
+    def _write(path: Path, text: str) -> None:
+        """Replace ``path`` atomically."""
+        partial = path.with_name(f".{path.name}.tmp")
+        partial.write_text(text)
+        os.replace(partial, path)
+
+
+profile_store: Optional[ProfileStore] = (
+    ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_PROFILES)
+    if settings.PROFILING_DIR
+    else None
+)
+
+
+def _new_profile_id() -> str:
+    """Make a profile id that sorts by creation time."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return f"{stamp}-{uuid.uuid4().hex[:8]}"
+
+
+def _bearer_token(headers: Headers) -> Optional[str]:
+    """Get the bearer token of a request."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+
+class ProfilingMiddleware:
+    """Profile requests on demand into a ``ProfileStore``.
+
+    ``authorize`` gets the bearer token of a request carrying ``X-Profile`` and tells
+    whether it may be profiled; it runs in the threadpool, as it may query the
+    database. It is not called again for ``auth_retry_delay`` seconds after it refused
+    a token.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        store: ProfileStore,
+        authorize: Callable[[str], bool],
+        sample_rate: int = settings.PROFILING_SAMPLE_RATE,
+        interval: float = settings.PROFILING_INTERVAL_MS / 1000,
+        memory_top: int = settings.PROFILING_MEMORY_TOP,
+        auth_retry_delay: float = settings.PROFILING_AUTH_RETRY_S,
+    ) -> None:
+        """Initialize middleware."""
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.memory_top = memory_top
+        self.auth_retry_delay = auth_retry_delay
+        self._running = threading.Lock()
+        self._refused_until = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = await self._trigger(scope)
+        if trigger is None or not self._running.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send, trigger)
+        finally:
+            self._running.release()
+
+    async def _trigger(self, scope: Scope) -> Optional[str]:
+        """Get why a request is profiled, if it is."""
+        # Cheap checks first, so requests that cannot be profiled cost no token check
+        if self._running.locked():
+            return None
+        headers = Headers(scope=scope)
+        if PROFILE_HEADER.lower() in headers and time.monotonic() >= self._refused_until:
+            token = _bearer_token(headers)
+            if token is not None:
+                if await run_in_threadpool(self.authorize, token):
+                    return "header"
+                self._refused_until = time.monotonic() + self.auth_retry_delay
+        if self.sample_rate > 0 and random.randrange(self.sample_rate) == 0:
+            return "sample"
+        return None
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, trigger: str) -> None:
+        """Serve a request while sampling its stacks and tracing its allocations."""
+        profile_id = _new_profile_id()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        sampler = StackSampler(self.interval)
+        tracer = MemoryTracer(self.memory_top)
+        tracer.start()
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+            memory = tracer.stop()
+            profile = {
+                "id": profile_id,
+                "trigger": trigger,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status,
+                "started_at": started_at.isoformat(),
+                "duration_ms": round(elapsed * 1000, 3),
+                "interval_ms": round(self.interval * 1000, 3),
+                "samples": sampler.samples,
+                "memory": memory,
+            }
+            try:
+                await run_in_threadpool(self.store.save, profile, sampler.folded())
+            except OSError:
+                logger.exception("Could not store request profile %s", profile_id)
@@ -0,0 +1,143 @@
+"""Streaming list responses.
+
+List endpoints accept ``stream=ndjson`` or ``stream=json`` to send their rows as they
+are read instead of building the whole page first. Rows are fetched
+``STREAM_CHUNK_SIZE`` at a time as plain column rows, so no ORM objects pile up in the
+identity map, and every fetched chunk is encoded by the precompiled row adapters of
+``serialization`` and written before the next one is read. Memory use therefore
+stays flat however large ``limit`` is.
+
+The request session has already been closed by its dependency when the body is sent.
+Closing only returns the connection to the pool, so the stream checks out a fresh one
+and closes the session again once it is done.
+"""
+
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.sql import Select
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from .fields import select_columns
+from .serialization import row_adapter, row_dicts, rows_adapter
+
+settings = get_settings()
+
+
+class StreamFormat(str, Enum):
+    """Streaming response format."""
+
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
+MEDIA_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.JSON: "application/json",
+}
+
+
+class ChunkEncoder:
+    """Encode chunks of rows into consecutive pieces of one NDJSON or JSON array body."""
+
+    def __init__(
+        self,
+        read_model: Type[BaseModel],
+        fmt: StreamFormat,
+        fields: Optional[Tuple[str, ...]] = None,
+    ):
+        """Initialize encoder."""
+        self.row_adapter = row_adapter(read_model, fields)
+        self.rows_adapter = rows_adapter(read_model, fields)
+        self.fmt = fmt
+        self.started = False
+
+    def encode(self, rows: Sequence[Dict[str, Any]]) -> bytes:
+        """Encode a chunk of row dicts."""
+        if not rows:
+            return b""
+        if self.fmt is StreamFormat.NDJSON:
+            self.started = True
+            return b"".join(self.row_adapter.dump_json(row) + b"\n" for row in rows)
+        # Strip the brackets of the chunk's own array
+        items = self.rows_adapter.dump_json(rows)[1:-1]
+        prefix = b"," if self.started else b"["
+        self.started = True
+        return prefix + items
+
+    def close(self) -> bytes:
+        """Finish the body."""
+        if self.fmt is StreamFormat.NDJSON:
+            return b""
+        return b"]" if self.started else b"[]"
+
+
+def _column_statement(
+    statement: Select,
+    model: Type[SQLModel],
+    fields: Optional[Tuple[str, ...]],
+    chunk_size: int,
+) -> Select:
+    """Select plain columns in chunks instead of ORM objects."""
+    return select_columns(statement, model, fields).execution_options(yield_per=chunk_size)
+
+
+def stream_rows(
+    db: Session,
+    statement: Select,
+    *,
+    model: Type[SQLModel],
+    read_model: Type[SQLModel],
+    fmt: StreamFormat,
+    fields: Optional[Tuple[str, ...]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = settings.STREAM_CHUNK_SIZE,
+) -> StreamingResponse:
+    """Stream the rows of a ``select(model)`` statement as ``read_model`` items.
+
+    With ``fields`` only those columns are read and sent.
+    """
+    statement = _column_statement(statement, model, fields, chunk_size)
+    encoder = ChunkEncoder(read_model, fmt, fields)
+
+    def body() -> Iterator[bytes]:
+        try:
+            result = db.execute(statement)
+            for rows in result.partitions():
+                yield encoder.encode(row_dicts(rows))
+            yield encoder.close()
+        finally:
+            db.close()
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+def astream_rows(
+    db: AsyncSession,
+    statement: Select,
+    *,
+    model: Type[SQLModel],
+    read_model: Type[SQLModel],
+    fmt: StreamFormat,
+    fields: Optional[Tuple[str, ...]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = settings.STREAM_CHUNK_SIZE,
+) -> StreamingResponse:
+    """Async variant of ``stream_rows``."""
+    statement = _column_statement(statement, model, fields, chunk_size)
+    encoder = ChunkEncoder(read_model, fmt, fields)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            result = await db.stream(statement)
+            async for rows in result.partitions():
+                yield encoder.encode(row_dicts(rows))
+            yield encoder.close()
+        finally:
+            await db.close()
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,248 @@
+"""Service benchmark configuration.
+
+Benchmarks run against catalogs made by ``scripts/generate_catalog.py`` in a few
+fixed sizes and are compared with ``baselines.json``. A benchmark fails when it sends
+more statements than its baseline, which catches N+1 queries regardless of the
+machine, or when its best time exceeds the baseline by more than
+``--benchmark-threshold``. Best rather than median times are compared because they
+are the least disturbed by other load on the machine.
+
+Every benchmark also times a fixed calibration workload of Python and SQLite calls,
+and timings are compared relative to it, so a machine that is uniformly faster or
+slower than the one that recorded the baselines does not trip the threshold. Refresh
+the baselines whenever an intended change moves them:
+
+    python -m pytest tests/benchmarks --benchmark
+    python -m pytest tests/benchmarks --benchmark --benchmark-save
+"""
+
+import json
+import platform
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, create_engine
+
+from scripts.generate_catalog import generate
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+# Courses, modules, lessons and users of each catalog size
+SIZES: Dict[str, Tuple[int, int, int, int]] = {
+    "small": (10, 100, 2000, 100),
+    "medium": (100, 1000, 20000, 1000),
+    "large": (500, 5000, 100000, 10000),
+}
+
+MIN_ROUNDS = 5
+MAX_ROUNDS = 1000
+MIN_SECONDS = 0.2
+CALIBRATION_ROUNDS = 25
+
+# Results of this run by benchmark name
+results: Dict[str, Dict[str, Any]] = {}
+
+
+def _load_baselines() -> Dict[str, Dict[str, Any]]:
+    """Load the stored baselines."""
+    if not BASELINES.exists():
+        return {}
+    return json.loads(BASELINES.read_text())["results"]
+
+
+def calibrate() -> float:
+    """Get the best time of the calibration workload in microseconds."""
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE numbers (n INTEGER PRIMARY KEY, square INTEGER)")
+    connection.executemany("INSERT INTO numbers VALUES (?, ?)", ((n, n * n) for n in range(1000)))
+    timings = []
+    for _ in range(CALIBRATION_ROUNDS):
+        started = time.perf_counter()
+        rows = connection.execute("SELECT n, square FROM numbers WHERE n % 3 = 0").fetchall()
+        sorted({str(square): n for n, square in rows}.items())
+        timings.append(time.perf_counter() - started)
+    connection.close()
+    return round(min(timings) * 1e6, 1)
+
+
+class Catalog:
+    """Seeded benchmark database of one size."""
+
+    def __init__(self, engine: Engine, size: str):
+        """Initialize catalog."""
+        self.engine = engine
+        self.size = size
+        self.courses, self.modules, self.lessons, self.users = SIZES[size]
+
+
+class Benchmark:
+    """Time a service call on a catalog and compare it with its baseline."""
+
+    def __init__(self, catalog: Catalog, baselines: Dict[str, Dict[str, Any]], config: Any):
+        """Initialize benchmark."""
+        self.catalog = catalog
+        self.baselines = baselines
+        self.threshold = config.getoption("--benchmark-threshold")
+        self.save = config.getoption("--benchmark-save")
+
+    def __call__(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        setup: Optional[Callable[[Session], Tuple[Any, ...]]] = None,
+    ) -> Dict[str, Any]:
+        """Run ``function(session, *setup(session))`` repeatedly in fresh sessions.
+
+        ``setup`` runs outside the timed section of every round, for calls that need
+        fresh arguments such as an object to remove. A benchmark slower than its
+        baseline is timed once more before it fails, to rule out a passing disturbance.
+        """
+        key = f"{name}[{self.catalog.size}]"
+        statements = self._count_statements(function, setup)
+        result = {"statements": statements, **self._time(function, setup)}
+        baseline = self.baselines.get(key)
+        if baseline and not self.save:
+            if statements > baseline["statements"]:
+                pytest.fail(
+                    f"{key} sent {statements} statements, baseline {baseline['statements']}"
+                )
+            if self._slower(result, baseline):
+                retry = {"statements": statements, **self._time(function, setup)}
+                result = min(result, retry, key=lambda timed: self._ratio(timed, baseline))
+            result["expected_us"] = round(self._expected(result, baseline), 1)
+        results[key] = result
+        if baseline and not self.save and self._slower(result, baseline):
+            pytest.fail(
+                f"{key} took {result['min_us']}us, "
+                f"expected {result['expected_us']}us from its baseline"
+            )
+        return result
+
+    def _count_statements(
+        self, function: Callable[..., Any], setup: Optional[Callable[[Session], Tuple[Any, ...]]]
+    ) -> int:
+        """Run ``function`` once as warmup and count the statements it sends."""
+        statements = 0
+
+        def count(*args: Any) -> None:
+            nonlocal statements
+            statements += 1
+
+        with Session(self.catalog.engine) as session:
+            arguments = setup(session) if setup else ()
+            event.listen(self.catalog.engine, "before_cursor_execute", count)
+            try:
+                function(session, *arguments)
+            finally:
+                event.remove(self.catalog.engine, "before_cursor_execute", count)
+        return statements
+
+    def _time(
+        self, function: Callable[..., Any], setup: Optional[Callable[[Session], Tuple[Any, ...]]]
+    ) -> Dict[str, Any]:
+        """Time rounds of ``function`` and the calibration workload."""
+        calibration_us = calibrate()
+        timings = []
+        started = time.perf_counter()
+        while len(timings) < MIN_ROUNDS or (
+            time.perf_counter() - started < MIN_SECONDS and len(timings) < MAX_ROUNDS
+        ):
+            with Session(self.catalog.engine) as session:
+                arguments = setup(session) if setup else ()
+                round_started = time.perf_counter()
+                function(session, *arguments)
+                timings.append(time.perf_counter() - round_started)
+        return {
+            "median_us": round(statistics.median(timings) * 1e6, 1),
+            "min_us": round(min(timings) * 1e6, 1),
+            "rounds": len(timings),
+            "calibration_us": calibration_us,
+        }
+
+    def _expected(self, result: Dict[str, Any], baseline: Dict[str, Any]) -> float:
+        """Get the baseline time scaled to the calibration of ``result``."""
+        return baseline["min_us"] * result["calibration_us"] / baseline["calibration_us"]
+
+    def _ratio(self, result: Dict[str, Any], baseline: Dict[str, Any]) -> float:
+        """Get the time of ``result`` relative to its scaled baseline."""
+        return result["min_us"] / self._expected(result, baseline)
+
+    def _slower(self, result: Dict[str, Any], baseline: Dict[str, Any]) -> bool:
+        """Whether ``result`` is slower than its baseline beyond the threshold."""
+        return self._ratio(result, baseline) > 1 + self.threshold
+
+
+class Catalogs(dict):
+    """Benchmark catalogs by size, seeded on first use."""
+
+    def __init__(self, directory: Path):
+        """Initialize catalogs stored in ``directory``."""
+        super().__init__()
+        self.directory = directory
+
+    def __missing__(self, size: str) -> Catalog:
+        """Seed the catalog of ``size``."""
+        engine = create_engine(f"sqlite:///{self.directory / size}.db")
+        courses, modules, lessons, users = SIZES[size]
+        generate(
+            engine,
+            courses=courses,
+            modules=modules,
+            lessons=lessons,
+            users=users,
+            search_index=False,
+        )
+        self[size] = Catalog(engine, size)
+        return self[size]
+
+
+@pytest.fixture(name="catalogs", scope="session")
+def catalogs_fixture(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Catalogs]:
+    """Create the benchmark catalogs."""
+    catalogs = Catalogs(tmp_path_factory.mktemp("benchmarks"))
+    yield catalogs
+    for catalog in catalogs.values():
+        catalog.engine.dispose()
+
+
+@pytest.fixture(name="bench")
+def bench_fixture(request: pytest.FixtureRequest, catalogs: Catalogs) -> Benchmark:
+    """Benchmark on the catalog named by the test's ``size`` parameter."""
+    return Benchmark(catalogs[request.getfixturevalue("size")], _load_baselines(), request.config)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Store the results as baselines with ``--benchmark-save``."""
+    if not results or not session.config.getoption("--benchmark-save"):
+        return
+    stored = {**_load_baselines(), **results}
+    for result in stored.values():
+        result.pop("expected_us", None)
+    document = {
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": dict(sorted(stored.items())),
+    }
+    BASELINES.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    """Print the results next to their baselines."""
+    if not results:
+        return
+    terminalreporter.section("service benchmarks")
+    for key, result in sorted(results.items()):
+        line = f"{key:<60} {result['statements']:>4} stmts {result['min_us']:>12.1f}us"
+        if "expected_us" in result:
+            change = result["min_us"] / result["expected_us"] - 1
+            line += f" {change:+8.1%}"
+        terminalreporter.write_line(line)
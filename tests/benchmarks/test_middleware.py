@@ -0,0 +1,69 @@
+"""Benchmark the per-request cost of the observability middleware."""
+
+import asyncio
+from typing import Any, Callable, Dict
+
+import pytest
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.vibe_courseware.db.instrumentation import QueryInstrumentationMiddleware, QueryStats
+from src.vibe_courseware.utils.metrics import MetricsMiddleware, RequestMetrics
+
+from .conftest import Benchmark
+
+REQUESTS = 1000
+# Most a middleware may add to every request, in microseconds
+OVERHEAD_BUDGET_US = 25.0
+
+loop = asyncio.new_event_loop()
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    """Answer with an empty JSON object."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+# Matched as the router would, so the middleware labels requests with its template
+ROUTE = Route("/items/{item_id}", endpoint)
+
+
+async def receive() -> Message:
+    """Get an empty request body."""
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: Message) -> None:
+    """Discard a response message."""
+
+
+async def serve(app: ASGIApp) -> None:
+    """Send ``REQUESTS`` requests through ``app``."""
+    for n in range(REQUESTS):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": f"/items/{n}",
+            "headers": [],
+            "query_string": b"",
+            "route": ROUTE,
+        }
+        await app(scope, receive, send)
+
+
+MIDDLEWARE: Dict[str, Callable[[ASGIApp], Any]] = {
+    "metrics": lambda app: MetricsMiddleware(app, RequestMetrics()),
+    "queries": lambda app: QueryInstrumentationMiddleware(app, QueryStats()),
+}
+
+
+@pytest.mark.parametrize("size", ["small"])
+@pytest.mark.parametrize("name", list(MIDDLEWARE))
+def test_middleware_overhead(bench: Benchmark, name: str, size: str) -> None:
+    """Check a middleware adds at most ``OVERHEAD_BUDGET_US`` to each request."""
+    wrapped = MIDDLEWARE[name](endpoint)
+    bare = bench("middleware.bare", lambda db: loop.run_until_complete(serve(endpoint)))
+    result = bench(f"middleware.{name}", lambda db: loop.run_until_complete(serve(wrapped)))
+    overhead_us = (result["min_us"] - bare["min_us"]) / REQUESTS
+    assert overhead_us < OVERHEAD_BUDGET_US, f"{name} adds {overhead_us:.1f}us per request"
@@ -0,0 +1,259 @@
+"""Benchmark service methods, pagination and password hashing."""
+
+from itertools import count
+from typing import Any, Callable, List, Optional, Tuple
+
+import pytest
+from sqlmodel import Session, select
+
+from src.vibe_courseware.models.course import Course
+from src.vibe_courseware.models.lesson import Lesson, LessonCreate, LessonType, LessonUpdate
+from src.vibe_courseware.models.user import User, UserCreate, UserUpdate
+from src.vibe_courseware.services.course_service import CourseService
+from src.vibe_courseware.services.lesson_service import LessonService
+from src.vibe_courseware.services.module_service import ModuleService
+from src.vibe_courseware.services.user_service import UserService
+from src.vibe_courseware.utils.pagination import count_rows, paginate
+from src.vibe_courseware.utils.security import get_password_hash, verify_password
+
+from .conftest import SIZES, Benchmark
+
+course_service = CourseService()
+module_service = ModuleService()
+lesson_service = LessonService()
+user_service = UserService()
+
+ALL = tuple(SIZES)
+# Password hashing dominates these, whatever the catalog size
+SMALL = ("small",)
+
+# Middle ids of every catalog size, so listings have rows on both sides
+COURSE_ID = 5
+MODULE_ID = 50
+LESSON_ID = 1000
+# Created lessons go elsewhere, so the listed module keeps its size however many
+# rounds the write benchmarks run
+WRITE_MODULE_IDS = range(1, 41)
+HASHED_PASSWORD = get_password_hash("benchmark")
+
+serial = count()
+
+
+def new_lesson(module_id: int = WRITE_MODULE_IDS[0]) -> LessonCreate:
+    """Build a lesson to create."""
+    return LessonCreate(title=f"Lesson {next(serial)}", content="x" * 2000, module_id=module_id)
+
+
+def new_user() -> UserCreate:
+    """Build a user to create."""
+    n = next(serial)
+    return UserCreate(email=f"new{n}@example.com", username=f"new{n}", password="benchmark")
+
+
+def lesson(session: Session) -> Tuple[Lesson]:
+    """Load the lesson to update."""
+    return (session.get(Lesson, LESSON_ID),)
+
+
+def created_lesson(session: Session) -> Tuple[int]:
+    """Create a lesson to remove."""
+    return (lesson_service.create(session, obj_in=new_lesson()).id,)
+
+
+def module_lesson_ids(session: Session) -> Tuple[List[int]]:
+    """Load a module's lesson ids in reverse order."""
+    ids = session.exec(select(Lesson.id).where(Lesson.module_id == MODULE_ID)).all()
+    return (ids[::-1],)
+
+
+def course_title(session: Session) -> Tuple[str]:
+    """Load the title of a course."""
+    return (session.get(Course, COURSE_ID).title,)
+
+
+def user(session: Session) -> Tuple[User]:
+    """Load the user to update."""
+    return (session.get(User, 2),)
+
+
+Setup = Optional[Callable[[Session], Tuple[Any, ...]]]
+
+# Name, call, setup of its arguments and catalog sizes of every benchmark
+CASES: List[Tuple[str, Callable[..., Any], Setup, Tuple[str, ...]]] = [
+    # BaseService
+    ("base.get", lambda db: lesson_service.get(db, id=LESSON_ID), None, ALL),
+    ("base.get_multi", lambda db: lesson_service.get_multi(db, after=(LESSON_ID,)), None, ALL),
+    (
+        "base.get_fields",
+        lambda db: lesson_service.get_fields(
+            db, lesson_service.select_multi().limit(100), fields=("id", "title", "order")
+        ),
+        None,
+        ALL,
+    ),
+    ("base.cache_tags", lambda db, obj: lesson_service.cache_tags(db, obj), lesson, ALL),
+    ("base.create", lambda db: lesson_service.create(db, obj_in=new_lesson()), None, ALL),
+    (
+        "base.create_many",
+        lambda db: lesson_service.create_many(
+            db, objs_in=[new_lesson(module_id) for module_id in WRITE_MODULE_IDS]
+        ),
+        None,
+        ALL,
+    ),
+    (
+        "base.validate_many",
+        lambda db: lesson_service.validate_many(
+            db, [new_lesson(module_id) for module_id in WRITE_MODULE_IDS]
+        ),
+        None,
+        ALL,
+    ),
+    (
+        "base.bulk_rows",
+        lambda db: lesson_service.bulk_rows([new_lesson() for _ in range(100)]),
+        None,
+        SMALL,
+    ),
+    (
+        "base.update",
+        lambda db, obj: lesson_service.update(
+            db, db_obj=obj, obj_in=LessonUpdate(title=f"Lesson {next(serial)}")
+        ),
+        lesson,
+        ALL,
+    ),
+    (
+        "base.reorder",
+        lambda db, ids: lesson_service.reorder(db, parent_id=MODULE_ID, ids=ids),
+        module_lesson_ids,
+        ALL,
+    ),
+    ("base.remove", lambda db, id: lesson_service.remove(db, id=id), created_lesson, ALL),
+    # CourseService
+    (
+        "course.get_by_title",
+        lambda db, title: course_service.get_by_title(db, title=title),
+        course_title,
+        ALL,
+    ),
+    ("course.get_active_courses", lambda db: course_service.get_active_courses(db), None, ALL),
+    (
+        "course.get_outline",
+        lambda db: course_service.get_outline(db, course_id=COURSE_ID),
+        None,
+        ALL,
+    ),
+    (
+        "course.get_outline_without_content",
+        lambda db: course_service.get_outline(db, course_id=COURSE_ID, include_content=False),
+        None,
+        ALL,
+    ),
+    # ModuleService
+    (
+        "module.get_by_course_id",
+        lambda db: module_service.get_by_course_id(db, course_id=COURSE_ID),
+        None,
+        ALL,
+    ),
+    (
+        "module.get_by_course_id_ordered",
+        lambda db: module_service.get_by_course_id_ordered(db, course_id=COURSE_ID),
+        None,
+        ALL,
+    ),
+    # LessonService
+    (
+        "lesson.get_by_module_id",
+        lambda db: lesson_service.get_by_module_id(db, module_id=MODULE_ID),
+        None,
+        ALL,
+    ),
+    (
+        "lesson.get_by_module_id_ordered",
+        lambda db: lesson_service.get_by_module_id_ordered(db, module_id=MODULE_ID),
+        None,
+        ALL,
+    ),
+    (
+        "lesson.get_by_type",
+        lambda db: lesson_service.get_by_type(db, lesson_type=LessonType.QUIZ, after=(LESSON_ID,)),
+        None,
+        ALL,
+    ),
+    # UserService
+    (
+        "user.get_by_email",
+        lambda db: user_service.get_by_email(db, email="user7@example.com"),
+        None,
+        ALL,
+    ),
+    (
+        "user.get_by_username",
+        lambda db: user_service.get_by_username(db, username="user7"),
+        None,
+        ALL,
+    ),
+    (
+        "user.validate_many",
+        lambda db: user_service.validate_many(db, [new_user() for _ in range(100)]),
+        None,
+        ALL,
+    ),
+    (
+        "user.update",
+        lambda db, obj: user_service.update(
+            db, db_obj=obj, obj_in=UserUpdate(full_name=f"User {next(serial)}")
+        ),
+        user,
+        ALL,
+    ),
+    ("user.create", lambda db: user_service.create(db, obj_in=new_user()), None, SMALL),
+    (
+        "user.authenticate",
+        lambda db: user_service.authenticate(db, email="user7@example.com", password="benchmark"),
+        None,
+        SMALL,
+    ),
+    # Pagination
+    (
+        "pagination.paginate",
+        lambda db: paginate(
+            db, lesson_service.select_by_module_id(module_id=MODULE_ID), page=2, size=5
+        ),
+        None,
+        ALL,
+    ),
+    (
+        "pagination.count_rows",
+        lambda db: count_rows(db, lesson_service.select_by_type(lesson_type=LessonType.QUIZ)),
+        None,
+        ALL,
+    ),
+    # Password hashing
+    (
+        "security.verify_password",
+        lambda db: verify_password("benchmark", HASHED_PASSWORD),
+        None,
+        SMALL,
+    ),
+]
+
+PARAMS = [
+    pytest.param(name, function, setup, size, id=f"{name}[{size}]")
+    for name, function, setup, sizes in CASES
+    for size in sizes
+]
+
+
+@pytest.mark.parametrize("name, function, setup, size", PARAMS)
+def test_service_benchmark(
+    bench: Benchmark,
+    name: str,
+    function: Callable[..., Any],
+    setup: Setup,
+    size: str,
+) -> None:
+    """Benchmark one call against its baseline."""
+    bench(name, function, setup)
@@ -1,7 +1,8 @@
 """Test configuration."""
 
 import os
-from typing import Generator
+from pathlib import Path
+from typing import Generator, Optional
 
 import pytest
 from fastapi.testclient import TestClient
@@ -10,6 +11,32 @@ from sqlmodel.pool import StaticPool
 
 from src.vibe_courseware.db.session import get_session
 from src.vibe_courseware.main import app
+from src.vibe_courseware.utils.cache import response_cache
+from src.vibe_courseware.utils.principal_cache import principal_cache
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the service benchmark options."""
+    group = parser.getgroup("benchmark", "service benchmarks")
+    group.addoption(
+        "--benchmark", action="store_true", help="run the service benchmarks in tests/benchmarks"
+    )
+    group.addoption(
+        "--benchmark-save", action="store_true", help="store the results as the new baselines"
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=1.0,
+        help="fail benchmarks slower than their baseline by more than this fraction",
+    )
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> Optional[bool]:
+    """Only collect the service benchmarks with ``--benchmark``."""
+    if collection_path.name == "benchmarks" and not config.getoption("--benchmark"):
+        return True
+    return None
 
 
 @pytest.fixture(name="session")
@@ -35,6 +62,8 @@ def client_fixture(session: Session) -> Generator[TestClient, None, None]:
         yield session
 
     app.dependency_overrides[get_session] = get_session_override
+    response_cache.clear()
+    principal_cache.clear()
     
     with TestClient(app) as client:
         yield client
@@ -1,11 +1,38 @@
 """Test API endpoints."""
 
+import json
+from pathlib import Path
+
+import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlalchemy import delete, event
+from sqlmodel import Session, select
 
+from src.vibe_courseware.api.deps import is_admin_token
+from src.vibe_courseware.api.endpoints import lessons as lesson_endpoints
+from src.vibe_courseware.api.endpoints.catalog import get_catalog_publisher
+from src.vibe_courseware.api.endpoints.profiles import get_profile_store
+from src.vibe_courseware.db import instrumentation
+from src.vibe_courseware.db.instrumentation import instrument_engine, query_stats
+from src.vibe_courseware.main import app
 from src.vibe_courseware.models.course import Course
-from src.vibe_courseware.models.module import Module
 from src.vibe_courseware.models.lesson import Lesson, LessonType
+from src.vibe_courseware.models.module import Module
+from src.vibe_courseware.models.user import User, UserRole
+from src.vibe_courseware.services.catalog_publisher import (
+    CatalogPublisher,
+    disable_catalog_publisher,
+    enable_catalog_publisher,
+)
+from src.vibe_courseware.utils.cache import response_cache
+from src.vibe_courseware.utils.metrics import request_metrics
+from src.vibe_courseware.utils.principal_cache import principal_cache
+from src.vibe_courseware.utils.profiling import (
+    PROFILE_ID_HEADER,
+    ProfileStore,
+    ProfilingMiddleware,
+)
+from src.vibe_courseware.utils.security import get_password_hash
 
 
 def test_create_course(client: TestClient) -> None:
@@ -84,4 +111,704 @@ def test_delete_course(client: TestClient, session: Session) -> None:
     
     # Verify course is deleted
     response = client.get(f"/api/v1/courses/{course.id}")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_read_courses_total_count(client: TestClient, session: Session) -> None:
+    """Test list endpoints report the total matching rows in a header."""
+    for i in range(5):
+        session.add(Course(title=f"Course {i}", description="Description", is_active=i % 2 == 0))
+    session.commit()
+
+    response = client.get("/api/v1/courses/", params={"skip": 1, "limit": 2})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "5"
+
+    response = client.get("/api/v1/courses/", params={"active_only": True, "limit": 1})
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_read_lessons_cursor(client: TestClient, session: Session) -> None:
+    """Test walking ordered lessons with keyset cursors."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    for i in range(5):
+        session.add(
+            Lesson(title=f"Lesson {i}", content="", order=i // 2, module_id=module.id)
+        )
+    session.commit()
+
+    titles = []
+    cursor = None
+    while True:
+        params = {"module_id": module.id, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/lessons/", params=params)
+        assert response.status_code == 200
+        titles.extend(lesson["title"] for lesson in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert titles == [f"Lesson {i}" for i in range(5)]
+
+    response = client.get("/api/v1/lessons/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_read_course_outline(client: TestClient, session: Session) -> None:
+    """Test course outline endpoint returns the ordered tree."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    modules = [
+        Module(title=f"Module {order}", description="", order=order, course_id=course.id)
+        for order in (2, 1)
+    ]
+    session.add_all(modules)
+    session.commit()
+    for module in modules:
+        for order in (2, 1):
+            session.add(
+                Lesson(
+                    title=f"{module.title} Lesson {order}",
+                    content="Content",
+                    order=order,
+                    module_id=module.id,
+                )
+            )
+    session.commit()
+
+    response = client.get(f"/api/v1/courses/{course.id}/outline")
+    assert response.status_code == 200
+    data = response.json()
+    assert [module["title"] for module in data["modules"]] == ["Module 1", "Module 2"]
+    lessons = data["modules"][0]["lessons"]
+    assert [lesson["title"] for lesson in lessons] == ["Module 1 Lesson 1", "Module 1 Lesson 2"]
+    assert lessons[0]["content"] == "Content"
+
+    session.expire_all()
+    response = client.get(
+        f"/api/v1/courses/{course.id}/outline", params={"include_content": False}
+    )
+    assert response.status_code == 200
+    assert "content" not in response.json()["modules"][0]["lessons"][0]
+
+    response = client.get("/api/v1/courses/999/outline")
+    assert response.status_code == 404
+
+
+def test_catalog_response_cache(client: TestClient, session: Session) -> None:
+    """Test catalog reads are cached and evicted by writes."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    lesson = Lesson(title="Test Lesson", content="Test Content", module_id=module.id)
+    session.add(lesson)
+    session.commit()
+
+    listing = f"/api/v1/lessons/?module_id={module.id}"
+    outline = f"/api/v1/courses/{course.id}/outline"
+    assert client.get(listing).headers["X-Cache"] == "MISS"
+    assert client.get(outline).headers["X-Cache"] == "MISS"
+    response = client.get(listing)
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.headers["X-Total-Count"] == "1"
+    assert client.get(outline).headers["X-Cache"] == "HIT"
+    assert client.get(f"/api/v1/courses/{course.id}").headers["X-Cache"] == "MISS"
+
+    response = client.put(f"/api/v1/lessons/{lesson.id}", json={"title": "Updated Lesson"})
+    assert response.status_code == 200
+
+    response = client.get(listing)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()[0]["title"] == "Updated Lesson"
+    response = client.get(outline)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["modules"][0]["lessons"][0]["title"] == "Updated Lesson"
+    assert client.get(f"/api/v1/courses/{course.id}").headers["X-Cache"] == "HIT"
+
+
+def test_read_db_pool_stats(client: TestClient, session: Session) -> None:
+    """Test pool statistics endpoint is for admins only."""
+    assert client.get("/api/v1/stats/db-pool").status_code == 401
+    headers = _login(client, session, "student", UserRole.STUDENT)
+    assert client.get("/api/v1/stats/db-pool", headers=headers).status_code == 403
+    headers = _login(client, session, "admin", UserRole.ADMIN)
+    response = client.get("/api/v1/stats/db-pool", headers=headers)
+    assert response.status_code == 200
+    assert {"checkouts", "wait_seconds_total", "timeouts"} <= response.json()["sync"].keys()
+
+
+def test_create_lessons_bulk(client: TestClient, session: Session) -> None:
+    """Test bulk lesson creation with per-item errors."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    listing = f"/api/v1/lessons/?module_id={module.id}"
+    assert client.get(listing).json() == []
+
+    lessons = [
+        {"title": f"Lesson {i}", "content": "", "order": i, "module_id": module.id}
+        for i in range(3)
+    ]
+    lessons.insert(1, {"title": "Orphan", "content": "", "module_id": 999})
+    lessons.append({"title": "Quiz", "content": "", "type": "quiz", "module_id": module.id})
+    response = client.post("/api/v1/lessons/bulk", json=lessons)
+    assert response.status_code == 200
+    data = response.json()
+    assert [lesson["title"] for lesson in data["created"]] == [
+        "Lesson 0",
+        "Lesson 1",
+        "Lesson 2",
+        "Quiz",
+    ]
+    assert all(lesson["id"] for lesson in data["created"])
+    assert data["created"][-1]["type"] == LessonType.QUIZ
+    assert data["errors"] == [{"index": 1, "detail": "Module not found"}]
+
+    response = client.get(listing)
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.json()) == 4
+
+
+def test_query_stats(client: TestClient, session: Session, caplog) -> None:
+    """Test per-route statement totals and bulk creates free of N+1 queries."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    modules = [
+        Module(title=f"Module {i}", description="", course_id=course.id) for i in range(8)
+    ]
+    session.add_all(modules)
+    session.commit()
+    headers = _login(client, session, "admin", UserRole.ADMIN)
+    instrument_engine(session.get_bind())
+    query_stats.clear()
+
+    lessons = [{"title": "Lesson", "content": "", "module_id": module.id} for module in modules]
+    with caplog.at_level("WARNING", logger=instrumentation.__name__):
+        response = client.post("/api/v1/lessons/bulk", json=lessons)
+    assert len(response.json()["created"]) == 8
+    assert "Likely N+1" not in caplog.text
+
+    response = client.get(f"/api/v1/lessons/?module_id={modules[0].id}")
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    stats = client.get("/api/v1/stats/queries", headers=headers).json()
+    assert stats["POST /api/v1/lessons/bulk"]["requests"] == 1
+    assert stats["POST /api/v1/lessons/bulk"]["n_plus_one_requests"] == 0
+    assert stats["GET /api/v1/lessons/"]["statements"] >= 1
+    query_stats.clear()
+
+
+def test_metrics(client: TestClient, session: Session) -> None:
+    """Test Prometheus metrics by route template, including cached responses."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    request_metrics.clear()
+    hits = response_cache.stats().hits
+
+    for _ in range(2):
+        assert client.get(f"/api/v1/courses/{course.id}").status_code == 200
+    assert client.get("/api/v1/courses/999").status_code == 404
+    assert client.get("/missing").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    route = 'method="GET",route="/api/v1/courses/{course_id}"'
+    assert f"http_request_duration_seconds_count{{{route}}} 3" in lines
+    assert f'http_request_duration_seconds_bucket{{{route},le="+Inf"}} 3' in lines
+    assert f'http_responses_total{{{route},status="200"}} 2' in lines
+    assert f'http_responses_total{{{route},status="404"}} 1' in lines
+    assert 'http_responses_total{method="GET",route="unmatched",status="404"} 1' in lines
+    # The metrics request itself is still in flight
+    assert "http_requests_in_flight 1" in lines
+    assert f'cache_hits_total{{cache="response"}} {hits + 1}' in lines
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+    assert any(line.startswith("threadpool_threads ") for line in lines)
+    assert any(line.startswith('db_pool_checkouts_total{pool="sync"}') for line in lines)
+    assert any(line.startswith("password_hash_pending ") for line in lines)
+
+
+def test_create_modules_bulk(client: TestClient, session: Session) -> None:
+    """Test bulk module creation."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+
+    modules = [
+        {"title": f"Module {i}", "description": "", "order": i, "course_id": course.id}
+        for i in range(3)
+    ]
+    response = client.post("/api/v1/modules/bulk", json=modules)
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 3
+    assert response.json()["errors"] == []
+    response = client.get(f"/api/v1/courses/{course.id}/outline")
+    assert [module["title"] for module in response.json()["modules"]] == [
+        "Module 0",
+        "Module 1",
+        "Module 2",
+    ]
+
+    response = client.post("/api/v1/modules/bulk", json=[{"title": "Bad"}])
+    assert response.status_code == 422
+
+
+def test_update_lesson_order(client: TestClient, session: Session) -> None:
+    """Test reordering all lessons of a module at once."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    other = Module(title="Other Module", description="Test Description", course_id=course.id)
+    session.add_all([module, other])
+    session.commit()
+    lessons = [
+        Lesson(title=f"Lesson {i}", content="", order=i, module_id=module.id) for i in range(4)
+    ]
+    foreign = Lesson(title="Foreign", content="", module_id=other.id)
+    session.add_all([*lessons, foreign])
+    session.commit()
+    ids = [lesson.id for lesson in lessons]
+    outline = f"/api/v1/courses/{course.id}/outline"
+    client.get(outline)
+
+    new_order = [ids[3], ids[0], ids[2], ids[1]]
+    response = client.put(f"/api/v1/modules/{module.id}/lesson-order", json=new_order)
+    assert response.status_code == 200
+    assert [lesson["id"] for lesson in response.json()] == new_order
+    assert [lesson["order"] for lesson in response.json()] == [0, 1, 2, 3]
+    response = client.get(outline)
+    assert response.headers["X-Cache"] == "MISS"
+    assert [lesson["id"] for lesson in response.json()["modules"][0]["lessons"]] == new_order
+
+    for bad in ([*ids[:3], foreign.id], ids[:3], [*ids, ids[0]]):
+        response = client.put(f"/api/v1/modules/{module.id}/lesson-order", json=bad)
+        assert response.status_code == 400
+    response = client.put("/api/v1/modules/999/lesson-order", json=[])
+    assert response.status_code == 404
+
+
+def test_update_module_order(client: TestClient, session: Session) -> None:
+    """Test reordering all modules of a course at once."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    modules = [
+        Module(title=f"Module {i}", description="", order=i, course_id=course.id)
+        for i in range(3)
+    ]
+    session.add_all(modules)
+    session.commit()
+    new_order = [modules[2].id, modules[1].id, modules[0].id]
+    url = f"/api/v1/courses/{course.id}/module-order"
+
+    assert client.put(url, json=new_order).status_code == 401
+    headers = _login(client, session, "instructor", UserRole.INSTRUCTOR)
+    response = client.put(url, json=new_order, headers=headers)
+    assert response.status_code == 200
+    response = client.get("/api/v1/modules/", params={"course_id": course.id})
+    assert [module["id"] for module in response.json()] == new_order
+
+
+def _login(client: TestClient, session: Session, username: str, role: UserRole) -> dict:
+    """Create a user and get authorization headers for it."""
+    user = User(
+        email=f"{username}@example.com",
+        username=username,
+        hashed_password=get_password_hash(f"{username}123"),
+        role=role,
+    )
+    session.add(user)
+    session.commit()
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": f"{username}@example.com", "password": f"{username}123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_create_users_bulk(client: TestClient, session: Session) -> None:
+    """Test admin bulk user creation with per-item errors."""
+    headers = _login(client, session, "admin", UserRole.ADMIN)
+
+    users = [
+        {"email": f"user{i}@example.com", "username": f"user{i}", "password": f"pass{i}"}
+        for i in range(3)
+    ]
+    users.append({"email": "admin@example.com", "username": "other", "password": "x"})
+    users.append({"email": "new@example.com", "username": "user0", "password": "x"})
+    response = client.post("/api/v1/users/bulk", json=users, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["username"] for user in data["created"]] == ["user0", "user1", "user2"]
+    assert [error["index"] for error in data["errors"]] == [3, 4]
+
+    response = client.post(
+        "/api/v1/auth/login", data={"username": "user2@example.com", "password": "pass2"}
+    )
+    assert response.status_code == 200
+
+
+def test_unique_keys(client: TestClient, session: Session) -> None:
+    """Test taken emails, usernames and titles are rejected by the database."""
+    headers = _login(client, session, "admin", UserRole.ADMIN)
+    user = {"email": "admin@example.com", "username": "other", "password": "x"}
+    response = client.post("/api/v1/users/", json=user, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "A user with this email already exists."
+    user["email"] = "other@example.com"
+    assert client.post("/api/v1/users/", json=user, headers=headers).status_code == 200
+    response = client.put("/api/v1/users/me", json={"username": "other"}, headers=headers)
+    assert response.json()["detail"] == "A user with this username already exists."
+    assert client.get("/api/v1/users/me", headers=headers).json()["username"] == "admin"
+
+    session.add_all(
+        [Course(title="Taken", description=""), Course(title="Free", description="")]
+    )
+    session.commit()
+    headers = _login(client, session, "instructor", UserRole.INSTRUCTOR)
+    course = {"title": "Taken", "description": ""}
+    response = client.post("/api/v1/courses/", json=course, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Course with this title already exists."
+    free = session.exec(select(Course).where(Course.title == "Free")).one()
+    response = client.put(f"/api/v1/courses/{free.id}", json=course, headers=headers)
+    assert response.status_code == 400
+
+
+def test_current_user_cache(client: TestClient, session: Session) -> None:
+    """Test cached principals follow user updates and removal."""
+    admin_headers = _login(client, session, "admin", UserRole.ADMIN)
+    headers = _login(client, session, "student", UserRole.STUDENT)
+    hits = principal_cache.hits
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] is None
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert principal_cache.hits == hits + 1
+
+    response = client.put("/api/v1/users/me", json={"full_name": "Student"}, headers=headers)
+    assert response.status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Student"
+
+    user_id = response.json()["id"]
+    response = client.put(
+        f"/api/v1/users/{user_id}", json={"is_active": False}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 400
+    assert client.delete(f"/api/v1/users/{user_id}", headers=admin_headers).status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 404
+
+
+def test_read_lessons_stream(client: TestClient, session: Session) -> None:
+    """Test streaming lesson listings as NDJSON and as a JSON array."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    session.add_all(
+        Lesson(title=f"Lesson {i}", content="", order=-i, module_id=module.id) for i in range(5)
+    )
+    session.commit()
+
+    params = {"module_id": module.id, "stream": "ndjson", "limit": 4}
+    response = client.get("/api/v1/lessons/", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["X-Total-Count"] == "5"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [lesson["title"] for lesson in lines] == [f"Lesson {i}" for i in (4, 3, 2, 1)]
+
+    params["stream"] = "json"
+    response = client.get("/api/v1/lessons/", params=params)
+    assert response.json() == client.get(
+        "/api/v1/lessons/", params={"module_id": module.id, "limit": 4}
+    ).json()
+    response = client.get("/api/v1/courses/", params={"stream": "json", "active_only": True})
+    assert [item["title"] for item in response.json()] == ["Test Course"]
+    response = client.get("/api/v1/lessons/", params={"module_id": 999, "stream": "json"})
+    assert response.json() == []
+
+
+def test_update_lesson_returning(client: TestClient, session: Session) -> None:
+    """Test updates are one UPDATE ... RETURNING that bumps updated_at."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    lesson = {"title": "Lesson", "content": "Text", "module_id": module.id}
+    created = client.post("/api/v1/lessons/", json=lesson).json()
+
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", record)
+    try:
+        response = client.put(f"/api/v1/lessons/{created['id']}", json={"title": "Renamed"})
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", record)
+    updated = response.json()
+    assert updated["title"] == "Renamed"
+    assert updated["content"] == "Text"
+    assert updated["updated_at"] > created["updated_at"]
+    assert updated["created_at"] == created["created_at"]
+    writes = [statement for statement in statements if not statement.startswith("SELECT")]
+    assert len(writes) == 1 and writes[0].startswith("UPDATE lessons")
+    after = statements[statements.index(writes[0]) + 1 :]
+    assert not any("FROM lessons" in statement for statement in after)
+
+
+def test_update_deleted_lesson(
+    client: TestClient, session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test an update that loses a race with a delete reports 404."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    lesson = {"title": "Lesson", "content": "Text", "module_id": module.id}
+    lesson_id = client.post("/api/v1/lessons/", json=lesson).json()["id"]
+    get = lesson_endpoints.lesson_service.get
+
+    def get_then_delete(db: Session, id: int) -> Lesson:
+        lesson = get(db=db, id=id)
+        db.connection().execute(delete(Lesson).where(Lesson.id == id))
+        return lesson
+
+    monkeypatch.setattr(lesson_endpoints.lesson_service, "get", get_then_delete)
+    response = client.put(f"/api/v1/lessons/{lesson_id}", json={"title": "Renamed"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Lesson not found"
+
+
+def test_read_lessons_fields(client: TestClient, session: Session) -> None:
+    """Test sparse fieldsets on listings."""
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+    session.add_all(
+        Lesson(title=f"Lesson {i}", content="x" * 1000, order=-i, module_id=module.id)
+        for i in range(3)
+    )
+    session.commit()
+
+    params = {"module_id": module.id, "fields": "title,order", "limit": 2}
+    response = client.get("/api/v1/lessons/", params=params)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"title": "Lesson 2", "order": -2},
+        {"title": "Lesson 1", "order": -1},
+    ]
+    assert response.headers["X-Total-Count"] == "3"
+    params["cursor"] = response.headers["X-Next-Cursor"]
+    response = client.get("/api/v1/lessons/", params=params)
+    assert response.json() == [{"title": "Lesson 0", "order": 0}]
+
+    params = {"module_id": module.id, "fields": "id, title", "stream": "ndjson"}
+    lines = client.get("/api/v1/lessons/", params=params).text.splitlines()
+    assert [sorted(json.loads(line)) for line in lines] == [["id", "title"]] * 3
+    response = client.get("/api/v1/courses/", params={"fields": "title"})
+    assert response.json() == [{"title": "Test Course"}]
+    response = client.get("/api/v1/modules/", params={"fields": "title,module_id"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: module_id"
+
+
+def test_catalog_snapshots(client: TestClient, session: Session, tmp_path: Path) -> None:
+    """Test snapshots are published, served and rebuilt on writes."""
+    course = Course(title="Test Course", description="Test Description")
+    hidden = Course(title="Hidden Course", description="Test Description", is_active=False)
+    session.add_all([course, hidden])
+    session.commit()
+    module = Module(title="Test Module", description="Test Description", course_id=course.id)
+    session.add(module)
+    session.commit()
+
+    publisher = CatalogPublisher(tmp_path, session.get_bind())
+    assert publisher.publish_all(session) == 1
+    enable_catalog_publisher(publisher)
+    app.dependency_overrides[get_catalog_publisher] = lambda: publisher
+    try:
+        response = client.get("/api/v1/catalog/courses")
+        assert response.headers["content-encoding"] == "gzip"
+        assert [item["title"] for item in response.json()] == ["Test Course"]
+        url = f"/api/v1/catalog/courses/{course.id}"
+        for accept_encoding in ("identity", "gzip;q=0, identity", "*;q=0"):
+            response = client.get(url, headers={"Accept-Encoding": accept_encoding})
+            assert "content-encoding" not in response.headers
+        assert response.json() == client.get(f"/api/v1/courses/{course.id}/outline").json()
+        assert client.get(f"/api/v1/catalog/courses/{hidden.id}").status_code == 404
+
+        lesson = {"title": "New Lesson", "content": "Text", "module_id": module.id}
+        assert client.post("/api/v1/lessons/", json=lesson).status_code == 200
+        assert publisher.flush(timeout=10)
+        modules = client.get(url).json()["modules"]
+        assert [lesson["title"] for lesson in modules[0]["lessons"]] == ["New Lesson"]
+    finally:
+        disable_catalog_publisher(publisher)
+        del app.dependency_overrides[get_catalog_publisher]
+
+
+def test_request_profiles(client: TestClient, session: Session, tmp_path: Path) -> None:
+    """Test admins profile requests on demand and read the profiles back."""
+    admin_headers = _login(client, session, "admin", UserRole.ADMIN)
+    headers = _login(client, session, "student", UserRole.STUDENT)
+    # Tokens are checked outside the request session, so serve them from the cache
+    for user_headers in (admin_headers, headers):
+        assert client.get("/api/v1/users/me", headers=user_headers).status_code == 200
+
+    store = ProfileStore(tmp_path, max_profiles=10)
+    profiled = TestClient(
+        ProfilingMiddleware(app, store=store, authorize=is_admin_token, auth_retry_delay=0)
+    )
+    url = "/api/v1/courses/"
+    response = profiled.get(url, headers={"X-Profile": "1", **headers})
+    assert PROFILE_ID_HEADER not in response.headers
+    response = profiled.get(url, headers={"X-Profile": "1", **admin_headers})
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    app.dependency_overrides[get_profile_store] = lambda: store
+    try:
+        assert client.get("/api/v1/profiles/", headers=headers).status_code == 403
+        profiles = client.get("/api/v1/profiles/", headers=admin_headers).json()
+        assert [profile["id"] for profile in profiles] == [profile_id]
+        assert profiles[0]["route"] == "/api/v1/courses/"
+        response = client.get(f"/api/v1/profiles/{profile_id}", headers=admin_headers)
+        assert response.json()["memory"]["peak_bytes"] > 0
+        response = client.get(f"/api/v1/profiles/{profile_id}/flamegraph", headers=admin_headers)
+        assert response.headers["content-type"].startswith("text/plain")
+        response = client.get("/api/v1/profiles/missing", headers=admin_headers)
+        assert response.status_code == 404
+    finally:
+        del app.dependency_overrides[get_profile_store]
+    assert client.get("/api/v1/profiles/", headers=admin_headers).status_code == 404
+
+
+def test_import_catalog(client: TestClient, session: Session) -> None:
+    """Test importing course trees is an idempotent upsert."""
+    headers = _login(client, session, "instructor", UserRole.INSTRUCTOR)
+    session.add(Course(title="Existing Course", description="Old"))
+    session.commit()
+    documents = [
+        {
+            "title": "Existing Course",
+            "description": "New",
+            "modules": [
+                {
+                    "title": f"Module {m}",
+                    "lessons": [{"title": f"Lesson {n}", "content": "x"} for n in range(3)],
+                }
+                for m in range(2)
+            ],
+        },
+        {"title": "Imported Course", "description": "", "is_active": False},
+    ]
+    body = "\n".join(json.dumps(document) for document in documents)
+
+    response = client.post("/api/v1/import/", content=body, headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["courses_created"], report["courses_updated"]) == (1, 1)
+    assert (report["modules_created"], report["lessons_created"]) == (2, 6)
+    assert report["rows"] == 10
+
+    response = client.post("/api/v1/import/", content=json.dumps(documents), headers=headers)
+    report = response.json()
+    assert [report[f"{level}_created"] for level in ("courses", "modules", "lessons")] == [0] * 3
+    assert report["lessons_updated"] == 6
+
+    course = session.exec(select(Course).where(Course.title == "Existing Course")).one()
+    outline = client.get(f"/api/v1/courses/{course.id}/outline").json()
+    assert outline["description"] == "New"
+    assert [lesson["order"] for lesson in outline["modules"][1]["lessons"]] == [0, 1, 2]
+
+    response = client.post("/api/v1/import/", content='{"title": 1}', headers=headers)
+    assert response.status_code == 400
+    assert client.post("/api/v1/import/", content="[]").status_code == 401
+
+
+def test_search(client: TestClient, session: Session) -> None:
+    """Test full-text search ranks, filters and follows catalog writes."""
+    course = Course(title="Python Basics", description="Learn programming")
+    hidden = Course(title="Hidden Python", description="Draft", is_active=False)
+    session.add_all([course, hidden])
+    session.commit()
+    module = Module(title="Functions", description="Defining functions", course_id=course.id)
+    session.add(module)
+    session.commit()
+    session.add_all(
+        [
+            Lesson(
+                title="Return values",
+                content="Functions return Python objects",
+                module_id=module.id,
+            ),
+            Lesson(
+                title="Function quiz",
+                content="Test yourself",
+                type=LessonType.QUIZ,
+                module_id=module.id,
+            ),
+        ]
+    )
+    session.commit()
+
+    response = client.get("/api/v1/search/", params={"q": "python"})
+    assert response.status_code == 200
+    hits = response.json()
+    assert [(hit["kind"], hit["title"]) for hit in hits] == [
+        ("course", "Python Basics"),
+        ("lesson", "Return values"),
+    ]
+    assert "<mark>Python</mark>" in hits[1]["snippet"]
+    assert hits[1]["course_id"] == course.id
+
+    response = client.get("/api/v1/search/", params={"q": "function*", "lesson_type": "quiz"})
+    assert [hit["title"] for hit in response.json()] == ["Function quiz"]
+    response = client.get("/api/v1/search/", params={"q": "function*", "kind": "module"})
+    assert [hit["id"] for hit in response.json()] == [module.id]
+    response = client.get("/api/v1/search/", params={"q": '"AND (python'})
+    assert response.status_code == 200
+
+    lesson = {
+        "title": "Markup",
+        "content": "Escape <script>alert(1)</script> & friends",
+        "module_id": module.id,
+    }
+    client.post("/api/v1/lessons/", json=lesson)
+    hits = client.get("/api/v1/search/", params={"q": "script"}).json()
+    assert hits[0]["snippet"] == (
+        "Escape &lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt; &amp; friends"
+    )
+
+    lesson = {"title": "Decorators", "content": "Wrapping callables", "module_id": module.id}
+    client.post("/api/v1/lessons/", json=lesson)
+    hits = client.get("/api/v1/search/", params={"q": "callables"}).json()
+    assert [hit["title"] for hit in hits] == ["Decorators"]
+    client.delete(f"/api/v1/lessons/{hits[0]['id']}")
+    assert client.get("/api/v1/search/", params={"q": "callables"}).json() == []
@@ -0,0 +1,102 @@
+"""Test async database path."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import AsyncGenerator
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.vibe_courseware.api.endpoints import courses, lessons, modules
+from src.vibe_courseware.db.session import get_async_session
+from src.vibe_courseware.models.course import Course, CourseCreate, CourseUpdate
+from src.vibe_courseware.models.lesson import Lesson
+from src.vibe_courseware.models.module import Module
+from src.vibe_courseware.services.course_service import CourseService
+from src.vibe_courseware.utils.cache import response_cache
+
+
+def _seed(path: Path) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        course = Course(title="Test Course", description="Test Description")
+        session.add(course)
+        session.commit()
+        module = Module(title="Test Module", description="", course_id=course.id)
+        session.add(module)
+        session.commit()
+        for order in (2, 1):
+            session.add(
+                Lesson(title=f"Lesson {order}", content="", order=order, module_id=module.id)
+            )
+        session.commit()
+        return course.id
+
+
+def test_async_read_endpoints(tmp_path: Path) -> None:
+    """Test the async read endpoint variants."""
+    course_id = _seed(tmp_path / "test.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def get_async_session_override() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(courses.async_router, prefix="/courses")
+    app.include_router(modules.async_router, prefix="/modules")
+    app.include_router(lessons.async_router, prefix="/lessons")
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    response_cache.clear()
+
+    with TestClient(app) as client:
+        response = client.get("/courses/")
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "1"
+        assert client.get(f"/courses/{course_id}").json()["title"] == "Test Course"
+        outline = client.get(f"/courses/{course_id}/outline").json()
+        lessons_ = outline["modules"][0]["lessons"]
+        assert [lesson["title"] for lesson in lessons_] == ["Lesson 1", "Lesson 2"]
+        module_id = outline["modules"][0]["id"]
+        response = client.get("/lessons/", params={"module_id": module_id, "limit": 1})
+        assert [lesson["title"] for lesson in response.json()] == ["Lesson 1"]
+        assert response.headers["X-Next-Cursor"]
+        response = client.get("/modules/", params={"course_id": course_id})
+        assert response.json()[0]["id"] == module_id
+        assert client.get("/lessons/999").status_code == 404
+        response = client.get("/lessons/", params={"module_id": module_id, "stream": "ndjson"})
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["title"] for line in response.text.splitlines()] == [
+            "Lesson 1",
+            "Lesson 2",
+        ]
+        response = client.get("/lessons/", params={"module_id": module_id, "fields": "title"})
+        assert response.json() == [{"title": "Lesson 1"}, {"title": "Lesson 2"}]
+
+    asyncio.run(engine.dispose())
+
+
+def test_async_crud(tmp_path: Path) -> None:
+    """Test the async BaseService CRUD methods."""
+    _seed(tmp_path / "test.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    service = CourseService()
+
+    async def run() -> None:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            course = await service.acreate(
+                db, obj_in=CourseCreate(title="Async Course", description="Description")
+            )
+            assert (await service.aget_by_title(db, title="Async Course")).id == course.id
+            course = await service.aupdate(db, db_obj=course, obj_in=CourseUpdate(is_active=False))
+            assert [c.title for c in await service.aget_active_courses(db)] == ["Test Course"]
+            await service.aremove(db, id=course.id)
+            assert await service.aget(db, id=course.id) is None
+        await engine.dispose()
+
+    asyncio.run(run())
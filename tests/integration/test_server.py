@@ -0,0 +1,58 @@
+"""Test the production server."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, inspect
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+def free_port() -> int:
+    """Get a port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_production_server(tmp_path: Path) -> None:
+    """Test migrated, prefork serving and graceful shutdown."""
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "run.py", "--mode", "production", "--workers", "2"]
+        + ["--host", "127.0.0.1", "--port", str(port), "--migrate"],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": url},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/api/v1/courses/")
+                break
+            except httpx.TransportError:
+                assert server.poll() is None and time.monotonic() < deadline
+                time.sleep(0.1)
+        assert response.status_code == 200
+        assert response.json() == []
+    finally:
+        server.send_signal(signal.SIGTERM)
+        output, _ = server.communicate(timeout=30)
+    assert server.returncode == 0, output
+    assert output.count("Started server process") == 2
+    assert output.count("Finished server process") == 2
+
+    engine = create_engine(url)
+    # The schema comes from the migrations rather than create_all
+    assert "alembic_version" in inspect(engine).get_table_names()
+    engine.dispose()
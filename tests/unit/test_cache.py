@@ -0,0 +1,103 @@
+"""Test response cache."""
+
+import multiprocessing
+import time
+
+from src.vibe_courseware.utils.cache import ResponseCache
+from src.vibe_courseware.utils.principal_cache import PrincipalCache
+
+
+def _store(cache: ResponseCache, key: str, body: bytes, *tags: str) -> None:
+    cache.set(key, status=200, headers=[], body=body, tags=tags, generation=cache.generation)
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entry is evicted first."""
+    cache = ResponseCache(max_entries=2, max_bytes=1024, ttl=60)
+    _store(cache, "a", b"1")
+    _store(cache, "b", b"2")
+    assert cache.get("a") is not None
+    _store(cache, "c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_size_bound_and_ttl() -> None:
+    """Test the byte bound and expiry."""
+    cache = ResponseCache(max_entries=10, max_bytes=4, ttl=60)
+    _store(cache, "a", b"12")
+    _store(cache, "b", b"345")
+    assert cache.get("a") is None
+    assert cache.stats().size == 3
+
+    cache = ResponseCache(max_entries=10, max_bytes=4, ttl=-1)
+    _store(cache, "a", b"1")
+    assert cache.get("a") is None
+
+
+def test_invalidate_by_tag() -> None:
+    """Test invalidation evicts tagged entries and skips stale stores."""
+    cache = ResponseCache(max_entries=10, max_bytes=1024, ttl=60)
+    _store(cache, "a", b"1", "course:1")
+    _store(cache, "b", b"2", "course:2")
+    generation = cache.generation
+    cache.invalidate({"course:1"})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    cache.set("c", status=200, headers=[], body=b"3", tags=(), generation=generation)
+    assert cache.get("c") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.invalidations) == (1, 1)
+
+
+def test_principal_cache_invalidation() -> None:
+    """Test principal entries expire with their token and are evicted per user."""
+    cache = PrincipalCache(ttl=60, max_entries=2)
+    cache.set("a", {"id": 1}, generation=cache.generation)
+    cache.set("b", {"id": 1}, generation=cache.generation)
+    cache.set("c", {"id": 2}, generation=cache.generation)
+    assert cache.get("a") is None
+    assert cache.get("b") == {"id": 1}
+
+    stale = cache.generation
+    cache.invalidate_user(1)
+    assert cache.get("b") is None
+    assert cache.get("c") == {"id": 2}
+    cache.set("b", {"id": 1}, generation=stale)
+    assert cache.get("b") is None
+
+    cache.set("d", {"id": 3}, expires=time.time() - 1, generation=cache.generation)
+    assert cache.get("d") is None
+
+
+def test_invalidation_across_processes() -> None:
+    """Test an invalidation in a forked worker empties the caches of the others."""
+    cache = ResponseCache(max_entries=10, max_bytes=1024, ttl=60)
+    principals = PrincipalCache(ttl=60, max_entries=10)
+    _store(cache, "a", b"1", "course:1")
+    _store(cache, "b", b"2", "course:2")
+    principals.set("a", {"id": 1}, generation=principals.generation)
+    generation = cache.generation
+
+    def write() -> None:
+        cache.invalidate({"course:1"})
+        principals.invalidate_user(2)
+
+    worker = multiprocessing.get_context("fork").Process(target=write)
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    assert cache.get("b") is None
+    _store(cache, "b", b"2", "course:2")
+    assert cache.get("b") is not None
+    cache.set("c", status=200, headers=[], body=b"3", tags=(), generation=generation)
+    assert cache.get("c") is None
+    assert principals.get("a") is None
+
+    # Local invalidations still evict by tag only
+    _store(cache, "a", b"1", "course:1")
+    cache.invalidate({"course:1"})
+    assert cache.get("b") is not None
@@ -0,0 +1,45 @@
+"""Test catalog import parsing."""
+
+import io
+
+import pytest
+from sqlmodel import Session
+
+from src.vibe_courseware.models.catalog_import import CourseImport
+from src.vibe_courseware.services.catalog_importer import (
+    CatalogImporter,
+    CatalogImportError,
+    iter_documents,
+)
+
+
+def test_iter_documents_formats() -> None:
+    """Test NDJSON and JSON arrays decode across small reads."""
+    documents = [{"title": f"Course {i}", "text": "é" * i} for i in range(20)]
+    ndjson = "\n".join(f'{{"title": "Course {i}", "text": "{"é" * i}"}}' for i in range(20))
+    array = "[\n" + ",\n".join(ndjson.splitlines()) + "\n]"
+    for body in (ndjson, array):
+        stream = io.BytesIO(body.encode())
+        assert list(iter_documents(stream, chunk_size=7)) == documents
+    assert list(iter_documents(io.BytesIO(b" []\n"))) == []
+    assert list(iter_documents(io.BytesIO(b""))) == []
+
+
+def test_iter_documents_errors() -> None:
+    """Test malformed streams are rejected."""
+    with pytest.raises(CatalogImportError):
+        list(iter_documents(io.BytesIO(b'[{"title": "a"}')))
+    with pytest.raises(CatalogImportError):
+        list(iter_documents(io.BytesIO(b'{"title": "a"}\n{"title": ')))
+
+
+def test_chunked_key_lookup(session: Session) -> None:
+    """Test keys are looked up in several IN lists when there are many."""
+    lessons = [{"title": f"Lesson {n}", "content": ""} for n in range(5)]
+    course = CourseImport(
+        title="Course", description="", modules=[{"title": "Module", "lessons": lessons}]
+    )
+    importer = CatalogImporter(lookup_chunk_keys=2)
+    assert importer.run(session, [course]).lessons_created == 5
+    report = importer.run(session, [course])
+    assert (report.lessons_created, report.lessons_updated) == (0, 5)
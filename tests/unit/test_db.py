@@ -0,0 +1,115 @@
+"""Test database engine configuration."""
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+
+from src.vibe_courseware.db import instrumentation
+from src.vibe_courseware.db.instrumentation import (
+    QueryInstrumentationMiddleware,
+    QueryStats,
+    instrument_engine,
+    statement_shape,
+)
+from src.vibe_courseware.db.pool import TimedQueuePool
+from src.vibe_courseware.db.session import engine_options, set_sqlite_pragmas
+
+
+def test_sqlite_pragmas_and_pool_stats(tmp_path) -> None:
+    """Test file databases get the pragma profile and a timed pool."""
+    url = make_url(f"sqlite:///{tmp_path / 'test.db'}")
+    options = engine_options(url, TimedQueuePool)
+    assert options["poolclass"] is TimedQueuePool
+    engine = create_engine(url, **options)
+    event.listen(engine, "connect", set_sqlite_pragmas)
+
+    checkouts = TimedQueuePool.stats.checkouts
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+    assert TimedQueuePool.stats.checkouts == checkouts + 1
+    assert TimedQueuePool.stats.snapshot(engine.pool)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_memory_sqlite_keeps_default_pool() -> None:
+    """Test in-memory databases keep SQLAlchemy's single-connection pool."""
+    assert engine_options(make_url("sqlite://"), TimedQueuePool) == {}
+
+
+def test_statement_shape_collapses_in_lists() -> None:
+    """Test statements differing only in IN list length share a shape."""
+    assert statement_shape("SELECT id FROM lessons WHERE id IN (?, ?,\n ?)") == (
+        "SELECT id FROM lessons WHERE id IN (?...)"
+    )
+    assert statement_shape("SELECT id FROM lessons WHERE id IN (?)") == (
+        "SELECT id FROM lessons WHERE id IN (?)"
+    )
+
+
+def test_query_instrumentation(monkeypatch, caplog) -> None:
+    """Test requests report their statements and log N+1 patterns and slow queries."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    instrument_engine(engine)
+    instrument_engine(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE lessons (id INTEGER PRIMARY KEY)"))
+
+    async def app(scope, receive, send) -> None:
+        with engine.connect() as connection:
+            for id in range(6):
+                connection.execute(text("SELECT id FROM lessons WHERE id = :id"), {"id": id})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    stats = QueryStats()
+    client = TestClient(QueryInstrumentationMiddleware(app, stats))
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        response = client.get("/lessons")
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith(';desc="6 queries"')
+    assert "Likely N+1 in /lessons: statement ran 6 times" in caplog.text
+    assert "Slow query" not in caplog.text
+    # Without a matched route there is no template to group the request under
+    assert stats.snapshot() == {}
+
+    caplog.clear()
+    monkeypatch.setattr(instrumentation.settings, "SQL_SLOW_QUERY_MS", 0.0)
+    monkeypatch.setattr(instrumentation.settings, "SQL_N_PLUS_ONE_THRESHOLD", 0)
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        client.get("/lessons")
+    assert "Likely N+1" not in caplog.text
+    slow = [record for record in caplog.records if "Slow query" in record.message]
+    assert len(slow) == 6
+    assert "Parameters: (int)\n" in slow[-1].message
+    assert "SEARCH lessons USING INTEGER PRIMARY KEY" in slow[-1].message
+
+    caplog.clear()
+    monkeypatch.setattr(instrumentation.settings, "SQL_LOG_QUERY_PARAMETERS", True)
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        client.get("/lessons")
+    assert "Parameters: (5,)" in caplog.records[-1].message
+    engine.dispose()
+
+
+def test_failed_statements_leave_no_start_time() -> None:
+    """Test statements that raise forget their start time like the ones that succeed."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE users (email TEXT UNIQUE)"))
+        insert = text("INSERT INTO users (email) VALUES (:email)")
+        connection.execute(insert, {"email": "a@example.com"})
+        for _ in range(3):
+            with pytest.raises(IntegrityError):
+                connection.execute(insert, {"email": "a@example.com"})
+        assert connection.info[instrumentation._STARTED_KEY] == {}
+    engine.dispose()
@@ -0,0 +1,80 @@
+"""Test password hashing pool."""
+
+import asyncio
+from threading import Event
+
+import pytest
+
+from src.vibe_courseware.utils import hashing
+from src.vibe_courseware.utils.hashing import HashingPoolBusyError, PasswordHasher
+
+
+def test_hash_and_verify() -> None:
+    """Test hashing round trips through the pool."""
+    hasher = PasswordHasher(workers=2, max_pending=4, queue_timeout=1)
+    hashed = hasher.hash("secret")
+    assert hasher.verify("secret", hashed)
+    assert not hasher.verify("wrong", hashed)
+    hashes = hasher.hash_many(["a", "b", "c"])
+    assert hasher.verify("c", hashes[2])
+    assert asyncio.run(hasher.averify("secret", asyncio.run(hasher.ahash("secret"))))
+    stats = hasher.stats()
+    assert stats.completed == 9
+    assert stats.pending == 0
+    hasher.shutdown()
+
+
+def test_back_pressure() -> None:
+    """Test submissions are rejected while the queue stays full."""
+    hasher = PasswordHasher(workers=1, max_pending=2, queue_timeout=0.01)
+    release = Event()
+    futures = [hasher.submit(release.wait) for _ in range(2)]
+    assert hasher.stats().pending == 2
+    with pytest.raises(HashingPoolBusyError):
+        hasher.submit(release.wait)
+    release.set()
+    for future in futures:
+        future.result()
+    hasher.submit(release.wait).result()
+    stats = hasher.stats()
+    assert (stats.rejected, stats.completed, stats.pending) == (1, 3, 0)
+    hasher.shutdown()
+
+
+def test_async_back_pressure() -> None:
+    """Test coroutines wait for a slot on the event loop, then time out like threads."""
+    hasher = PasswordHasher(workers=1, max_pending=1, queue_timeout=0.05)
+    hashed = hasher.hash("secret")
+    release = Event()
+    blocker = hasher.submit(release.wait)
+
+    async def verify_while_full() -> None:
+        with pytest.raises(HashingPoolBusyError):
+            await hasher.averify("secret", hashed)
+        hasher.queue_timeout = 5
+        verify = asyncio.ensure_future(hasher.averify("secret", hashed))
+        await asyncio.sleep(0.05)
+        assert not verify.done()
+        release.set()
+        assert await verify
+
+    asyncio.run(verify_while_full())
+    blocker.result()
+    stats = hasher.stats()
+    assert (stats.rejected, stats.completed, stats.pending) == (1, 3, 0)
+    hasher.shutdown()
+
+
+def test_hash_many_slots(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a batch holds no more slots than there are workers."""
+    hasher = PasswordHasher(workers=2, max_pending=10, queue_timeout=1)
+    pending = []
+
+    def fake_hash(password: str) -> str:
+        pending.append(hasher.stats().pending)
+        return password.upper()
+
+    monkeypatch.setattr(hashing, "get_password_hash", fake_hash)
+    assert hasher.hash_many(list("abcdef")) == list("ABCDEF")
+    assert max(pending) <= 2
+    hasher.shutdown()
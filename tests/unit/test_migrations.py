@@ -0,0 +1,57 @@
+"""Test database migrations."""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from src.vibe_courseware.models.search import SEARCH_TABLE, is_search_table
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+def search_schema(connection: Connection) -> list:
+    """Get the SQL of the search index and its triggers."""
+    return connection.execute(
+        text(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE name = :table OR type = 'trigger' ORDER BY name"
+        ),
+        {"table": SEARCH_TABLE},
+    ).all()
+
+
+def test_migrations_match_models(tmp_path: Path) -> None:
+    """Test upgrading to head builds the schema the models describe, and back."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+    def include_name(name: str, type_: str, parent_names: dict) -> bool:
+        return type_ != "table" or not is_search_table(name)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_name": include_name})
+        assert compare_metadata(context, SQLModel.metadata) == []
+        assert SEARCH_TABLE in inspect(connection).get_table_names()
+        migrated = search_schema(connection)
+
+    # The frozen revisions must build the index init_db builds; changes need a new one
+    models_engine = create_engine(f"sqlite:///{tmp_path / 'models.db'}")
+    SQLModel.metadata.create_all(models_engine)
+    with models_engine.connect() as connection:
+        assert migrated == search_schema(connection)
+    models_engine.dispose()
+
+    command.downgrade(config, "base")
+    with engine.connect() as connection:
+        assert inspect(connection).get_table_names() == ["alembic_version"]
+    engine.dispose()
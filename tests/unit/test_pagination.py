@@ -0,0 +1,75 @@
+"""Test pagination utilities."""
+
+import base64
+
+import pytest
+from sqlmodel import Session, select
+
+from src.vibe_courseware.models.course import Course
+from src.vibe_courseware.models.module import Module
+from src.vibe_courseware.utils.pagination import (
+    InvalidCursorError,
+    count_cache,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+
+def _seed(session: Session) -> Course:
+    course = Course(title="Test Course", description="Test Description")
+    session.add(course)
+    session.commit()
+    for order in range(7):
+        session.add(
+            Module(title=f"Module {order}", description="", order=order, course_id=course.id)
+        )
+    session.commit()
+    return course
+
+
+def test_paginate_model(session: Session) -> None:
+    """Test paginating a bare model."""
+    _seed(session)
+    page = paginate(session, Module, page=2, size=3)
+    assert page.total == 7
+    assert page.pages == 3
+    assert [module.title for module in page.items] == ["Module 3", "Module 4", "Module 5"]
+
+
+def test_paginate_statement(session: Session) -> None:
+    """Test paginating a filtered, ordered statement."""
+    course = _seed(session)
+    statement = (
+        select(Module)
+        .where(Module.course_id == course.id, Module.order >= 2)
+        .order_by(Module.order.desc())
+    )
+    page = paginate(session, statement, page=1, size=2)
+    assert page.total == 5
+    assert [module.order for module in page.items] == [6, 5]
+
+
+def test_count_rows_cached(session: Session) -> None:
+    """Test cached counts are reused until they expire."""
+    _seed(session)
+    ttl = count_cache.ttl
+    count_cache.ttl = 60
+    try:
+        assert count_rows(session, Module, cached=True) == 7
+        session.add(Module(title="Extra", description="", course_id=1))
+        session.commit()
+        assert count_rows(session, Module, cached=True) == 7
+        assert count_rows(session, Module) == 8
+    finally:
+        count_cache.ttl = ttl
+        count_cache.clear()
+
+
+def test_decode_cursor() -> None:
+    """Test cursors round-trip scalars and refuse anything else."""
+    assert decode_cursor(encode_cursor([2, "b", 1.5, None])) == (2, "b", 1.5, None)
+    for raw in (b"[]", b'{"a":1}', b'[{"a":1}]', b"[[1,2]]"):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(base64.urlsafe_b64encode(raw).decode())
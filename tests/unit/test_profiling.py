@@ -0,0 +1,117 @@
+"""Test request profiling."""
+
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.testclient import TestClient
+
+from src.vibe_courseware.utils.profiling import (
+    PROFILE_ID_HEADER,
+    ProfileStore,
+    ProfilingMiddleware,
+)
+
+
+def busy_endpoint_work() -> list:
+    """Spin for a while and keep an allocation alive."""
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return [bytearray(1024) for _ in range(100)]
+
+
+kept = []
+
+
+async def app(scope, receive, send) -> None:
+    """Run the work in the threadpool, like a sync endpoint."""
+    kept.append(await run_in_threadpool(busy_endpoint_work))
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def test_profile_store_ring(tmp_path) -> None:
+    """Test only the newest profiles are kept and only profile ids are read."""
+    store = ProfileStore(tmp_path, max_profiles=2)
+    ids = [f"20261018T12000000000{n}-0000000{n}" for n in range(3)]
+    for profile_id in ids:
+        store.save({"id": profile_id}, "main;work 1\n")
+    assert store.ids() == ids[:0:-1]
+    assert store.get(ids[0]) is None
+    assert store.get(ids[2]) == {"id": ids[2]}
+    assert store.folded_path(ids[2]).read_text() == "main;work 1\n"
+    assert store.get("../secret") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{profile_id}{suffix}" for profile_id in ids[1:] for suffix in (".json", ".folded")
+    )
+
+
+def test_profiling_middleware(tmp_path) -> None:
+    """Test admins profile requests on demand, with stacks from the threadpool."""
+    store = ProfileStore(tmp_path, max_profiles=10)
+    middleware = ProfilingMiddleware(
+        app,
+        store=store,
+        authorize=lambda token: token == "admin",
+        sample_rate=0,
+        auth_retry_delay=0,
+    )
+    client = TestClient(middleware)
+
+    assert PROFILE_ID_HEADER not in client.get("/work").headers
+    response = client.get("/work", headers={"X-Profile": "1", "Authorization": "Bearer user"})
+    assert PROFILE_ID_HEADER not in response.headers
+    assert store.ids() == []
+
+    response = client.get("/work", headers={"X-Profile": "1", "Authorization": "Bearer admin"})
+    profile_id = response.headers[PROFILE_ID_HEADER]
+    assert store.ids() == [profile_id]
+    profile = store.get(profile_id)
+    assert profile["trigger"] == "header"
+    assert profile["status"] == 200
+    assert profile["path"] == "/work"
+    assert profile["duration_ms"] >= 50
+    assert profile["samples"] > 0
+    assert profile["memory"]["allocated_bytes"] > 100 * 1024
+    assert "test_profiling.py" in profile["memory"]["top"][0]["site"]
+    folded = store.folded_path(profile_id).read_text()
+    assert "busy_endpoint_work" in folded
+    stack, _, count = folded.splitlines()[0].rpartition(" ")
+    assert int(count) > 0 and ";" in stack
+
+    middleware.sample_rate = 1
+    profile_id = client.get("/work").headers[PROFILE_ID_HEADER]
+    assert store.get(profile_id)["trigger"] == "sample"
+
+
+def test_profiling_refused_tokens(tmp_path) -> None:
+    """Test tokens are not checked while profiling or shortly after a refusal."""
+    store = ProfileStore(tmp_path, max_profiles=10)
+    checked = []
+
+    def authorize(token: str) -> bool:
+        checked.append(token)
+        return token == "admin"
+
+    middleware = ProfilingMiddleware(
+        app, store=store, authorize=authorize, sample_rate=0, auth_retry_delay=60
+    )
+    client = TestClient(middleware)
+
+    with middleware._running:
+        response = client.get("/work", headers={"X-Profile": "1", "Authorization": "Bearer admin"})
+    assert PROFILE_ID_HEADER not in response.headers
+    assert checked == []
+
+    for token in ("user", "user", "admin"):
+        response = client.get(
+            "/work", headers={"X-Profile": "1", "Authorization": f"Bearer {token}"}
+        )
+        assert PROFILE_ID_HEADER not in response.headers
+    assert checked == ["user"]
+    assert store.ids() == []
+
+    middleware._refused_until = 0.0
+    response = client.get("/work", headers={"X-Profile": "1", "Authorization": "Bearer admin"})
+    assert PROFILE_ID_HEADER in response.headers
+    assert checked == ["user", "admin"]
@@ -0,0 +1,225 @@
+"""Test service queries against their query plans.
+
+Every statement a service method sends is captured and run through ``EXPLAIN QUERY
+PLAN`` on a seeded, analyzed catalog. A statement fails the test when SQLite would
+scan a whole table it filters, or sort rows in a temporary B-tree, which means an
+index is missing or unusable for that query shape.
+"""
+
+from datetime import datetime
+from typing import Callable, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from src.vibe_courseware.models.catalog_import import CourseImport
+from src.vibe_courseware.models.course import Course
+from src.vibe_courseware.models.lesson import Lesson, LessonCreate, LessonType
+from src.vibe_courseware.models.module import Module
+from src.vibe_courseware.models.user import User
+from src.vibe_courseware.services.catalog_importer import CatalogImporter
+from src.vibe_courseware.services.course_service import CourseService
+from src.vibe_courseware.services.lesson_service import LessonService
+from src.vibe_courseware.services.module_service import ModuleService
+from src.vibe_courseware.services.user_service import UserService
+from src.vibe_courseware.utils.pagination import count_rows
+
+COURSES = 200
+MODULES_PER_COURSE = 10
+LESSONS_PER_MODULE = 25
+
+course_service = CourseService()
+module_service = ModuleService()
+lesson_service = LessonService()
+user_service = UserService()
+
+# Each case calls services once; ``scan`` allows a full scan of an unfiltered listing
+CASES: List[Tuple[str, Callable[[Session], object], bool]] = [
+    ("courses.get_multi", lambda db: course_service.get_multi(db, after=(10,)), True),
+    ("courses.get_active", lambda db: course_service.get_active_courses(db, after=(10,)), False),
+    ("courses.get_by_title", lambda db: course_service.get_by_title(db, title="Course 7"), False),
+    ("courses.get_outline", lambda db: course_service.get_outline(db, course_id=7), False),
+    (
+        "courses.count_active",
+        lambda db: count_rows(db, course_service.select_active_courses()),
+        False,
+    ),
+    ("modules.get_multi", lambda db: module_service.get_multi(db, after=(10,)), True),
+    ("modules.get_by_course", lambda db: module_service.get_by_course_id(db, course_id=7), False),
+    (
+        "modules.get_by_course_ordered",
+        lambda db: module_service.get_by_course_id_ordered(db, course_id=7, after=(2, 63)),
+        False,
+    ),
+    (
+        "modules.count_by_course",
+        lambda db: count_rows(db, module_service.select_by_course_id(course_id=7)),
+        False,
+    ),
+    (
+        "modules.reorder",
+        lambda db: module_service.reorder(db, parent_id=7, ids=list(range(70, 60, -1))),
+        False,
+    ),
+    ("lessons.get_multi", lambda db: lesson_service.get_multi(db, after=(10,)), True),
+    ("lessons.get_by_module", lambda db: lesson_service.get_by_module_id(db, module_id=7), False),
+    (
+        "lessons.get_by_module_ordered",
+        lambda db: lesson_service.get_by_module_id_ordered(db, module_id=7, after=(3, 154)),
+        False,
+    ),
+    (
+        "lessons.get_by_type",
+        lambda db: lesson_service.get_by_type(db, lesson_type=LessonType.QUIZ, after=(10,)),
+        False,
+    ),
+    (
+        "lessons.count_by_type",
+        lambda db: count_rows(db, lesson_service.select_by_type(lesson_type=LessonType.QUIZ)),
+        False,
+    ),
+    (
+        "lessons.validate_many",
+        lambda db: lesson_service.validate_many(
+            db, [LessonCreate(title="New", content="", module_id=id) for id in (3, 9)]
+        ),
+        False,
+    ),
+    (
+        "users.get_by_email",
+        lambda db: user_service.get_by_email(db, email="user7@example.com"),
+        False,
+    ),
+    (
+        "users.get_by_username",
+        lambda db: user_service.get_by_username(db, username="user7"),
+        False,
+    ),
+    (
+        "catalog_importer.run",
+        lambda db: CatalogImporter().run(
+            db,
+            [
+                CourseImport.model_validate(
+                    {
+                        "title": "Course 7",
+                        "description": "",
+                        "modules": [
+                            {
+                                "title": "Module 7.1",
+                                "lessons": [{"title": "Lesson 61.2", "content": ""}],
+                            }
+                        ],
+                    }
+                )
+            ],
+        ),
+        False,
+    ),
+]
+
+
+@pytest.fixture(name="engine", scope="module")
+def engine_fixture() -> Iterator[Engine]:
+    """Seed and analyze a catalog large enough for the planner to care about indexes."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    types = [lesson_type.name for lesson_type in LessonType]
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Course.__table__),
+            [
+                {"title": f"Course {c}", "description": "", "is_active": c % 4 > 0, **stamps}
+                for c in range(1, COURSES + 1)
+            ],
+        )
+        connection.execute(
+            insert(Module.__table__),
+            [
+                {
+                    "title": f"Module {c}.{m}",
+                    "description": "",
+                    "order": m,
+                    "course_id": c,
+                    **stamps,
+                }
+                for c in range(1, COURSES + 1)
+                for m in range(MODULES_PER_COURSE)
+            ],
+        )
+        modules = COURSES * MODULES_PER_COURSE
+        connection.execute(
+            insert(Lesson.__table__),
+            [
+                {
+                    "title": f"Lesson {m}.{n}",
+                    "content": "",
+                    "type": types[n % len(types)],
+                    "order": n,
+                    "module_id": m,
+                    **stamps,
+                }
+                for m in range(1, modules + 1)
+                for n in range(LESSONS_PER_MODULE)
+            ],
+        )
+        connection.execute(
+            insert(User.__table__),
+            [
+                {
+                    "email": f"user{u}@example.com",
+                    "username": f"user{u}",
+                    "hashed_password": "",
+                    "is_active": True,
+                    "role": "STUDENT",
+                    **stamps,
+                }
+                for u in range(1000)
+            ],
+        )
+        connection.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+def _plan(engine: Engine, statement: str, parameters: object) -> List[str]:
+    """Get the query plan details of a statement."""
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in rows]
+
+
+@pytest.mark.parametrize("name, call, scan", CASES, ids=[case[0] for case in CASES])
+def test_service_query_plans(
+    engine: Engine, name: str, call: Callable[[Session], object], scan: bool
+) -> None:
+    """Test a service method's statements use indexes for filtering and ordering."""
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and not statement.startswith("EXPLAIN"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as session:
+            call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    for statement, parameters in statements:
+        for detail in _plan(engine, statement, parameters):
+            assert "TEMP B-TREE" not in detail, f"{name} sorts: {statement}"
+            # A ``VALUES`` list shows up as a constant row scan, which reads no table
+            full_scan = detail.startswith("SCAN ") and not any(
+                allowed in detail for allowed in ("COVERING INDEX", "CONSTANT ROW")
+            )
+            assert scan or not full_scan, f"{name} scans: {detail}: {statement}"
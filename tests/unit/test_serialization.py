@@ -0,0 +1,38 @@
+"""Test trusted row serialization."""
+
+import json
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
+
+from src.vibe_courseware.models.course import Course
+from src.vibe_courseware.models.lesson import Lesson, LessonRead, LessonType
+from src.vibe_courseware.models.module import Module
+from src.vibe_courseware.utils.fields import select_columns
+from src.vibe_courseware.utils.serialization import encode_rows
+
+
+def test_encode_rows_matches_read_model() -> None:
+    """Test rows encode like validated read models, limited to the requested fields."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        course = Course(title="Course", description="")
+        session.add(course)
+        session.commit()
+        module = Module(title="Module", description="", course_id=course.id)
+        session.add(module)
+        session.commit()
+        session.add(
+            Lesson(title="Quiz", content="Text", type=LessonType.QUIZ, module_id=module.id)
+        )
+        session.commit()
+
+        rows = session.execute(select_columns(select(Lesson), Lesson)).all()
+        adapter = TypeAdapter(List[LessonRead])
+        expected = adapter.dump_json(adapter.validate_python([row._asdict() for row in rows]))
+        assert json.loads(encode_rows(rows, read_model=LessonRead)) == json.loads(expected)
+        sparse = encode_rows(rows, read_model=LessonRead, fields=("title", "type"))
+        assert json.loads(sparse) == [{"title": "Quiz", "type": "quiz"}]
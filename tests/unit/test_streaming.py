@@ -0,0 +1,38 @@
+"""Test streaming list encoding."""
+
+import json
+from datetime import datetime
+
+from src.vibe_courseware.models.course import CourseRead
+from src.vibe_courseware.utils.streaming import ChunkEncoder, StreamFormat
+
+
+def _rows(start: int, stop: int) -> list:
+    return [
+        {
+            "id": i,
+            "title": f"Course {i}",
+            "description": "",
+            "is_active": True,
+            "created_at": datetime(2024, 1, 1),
+            "updated_at": datetime(2024, 1, 1),
+        }
+        for i in range(start, stop)
+    ]
+
+
+def test_json_array_across_chunks() -> None:
+    """Test chunks join into one JSON array."""
+    encoder = ChunkEncoder(CourseRead, StreamFormat.JSON)
+    body = encoder.encode(_rows(0, 2)) + encoder.encode([]) + encoder.encode(_rows(2, 3))
+    body += encoder.close()
+    assert [course["id"] for course in json.loads(body)] == [0, 1, 2]
+    assert ChunkEncoder(CourseRead, StreamFormat.JSON).close() == b"[]"
+
+
+def test_ndjson_across_chunks() -> None:
+    """Test chunks join into newline-delimited JSON."""
+    encoder = ChunkEncoder(CourseRead, StreamFormat.NDJSON)
+    body = encoder.encode(_rows(0, 2)) + encoder.encode(_rows(2, 3)) + encoder.close()
+    assert [json.loads(line)["id"] for line in body.splitlines()] == [0, 1, 2]
+    assert body.endswith(b"}\n")